@@ -14,12 +14,14 @@ load_dotenv()
 config = context.config
 
 # Override sqlalchemy.url from .env
-config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL"))
+if os.getenv("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    # Keep loggers the app already set up when migrations run in-process (tests)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # Import all models so Alembic can detect them for autogenerate
 from app.models.base import Base  # noqa
@@ -64,6 +66,16 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Callers such as the tests can hand over an open connection
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(
+            connection=connection, target_metadata=target_metadata, transaction_per_migration=True
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -72,7 +84,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, transaction_per_migration=True
         )
 
         with context.begin_transaction():
@@ -0,0 +1,78 @@
+"""baseline: users, shipments, tracking_updates, hubs
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 03:33:37.610448
+
+Databases created earlier by Base.metadata.create_all already match this
+revision; mark them with `alembic stamp 0001` instead of upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+user_role = sa.Enum('customer', 'agent', 'admin', name='user_role')
+shipment_status = sa.Enum('created', 'in_transit', 'out_for_delivery', 'delivered', name='shipment_status')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('password_hash', sa.String(), nullable=False),
+    sa.Column('role', user_role, nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_table('hubs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('hub_name', sa.String(), nullable=False),
+    sa.Column('city', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('shipments',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('tracking_number', sa.String(), nullable=False),
+    sa.Column('customer_id', sa.UUID(), nullable=False),
+    sa.Column('agent_id', sa.UUID(), nullable=True),
+    sa.Column('source_address', sa.Text(), nullable=False),
+    sa.Column('destination_address', sa.Text(), nullable=False),
+    sa.Column('status', shipment_status, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['agent_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['customer_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tracking_number')
+    )
+    op.create_index(op.f('ix_shipments_id'), 'shipments', ['id'], unique=False)
+    op.create_table('tracking_updates',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('shipment_id', sa.UUID(), nullable=False),
+    sa.Column('location', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['shipment_id'], ['shipments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('tracking_updates')
+    op.drop_index(op.f('ix_shipments_id'), table_name='shipments')
+    op.drop_table('shipments')
+    op.drop_table('hubs')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_table('users')
+    shipment_status.drop(op.get_bind(), checkfirst=True)
+    user_role.drop(op.get_bind(), checkfirst=True)
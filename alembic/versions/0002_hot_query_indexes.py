@@ -0,0 +1,50 @@
+"""indexes for the hot query shapes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:12:40.118203
+
+- latest tracking event of a shipment: tracking_updates (shipment_id, updated_at), read backwards
+- a customer's shipments: shipments (customer_id, created_at)
+- an agent's shipments by status: shipments (agent_id, status), only assigned rows
+- report counts: shipments (status, created_at) and (created_at)
+
+On PostgreSQL the indexes are built CONCURRENTLY, outside the migration
+transaction, so writes to the tables keep going while they build. A build
+that fails leaves an INVALID index behind; drop it and run the upgrade again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ASSIGNED = sa.text("agent_id IS NOT NULL")
+
+INDEXES = [
+    ('ix_tracking_updates_shipment_id_updated_at', 'tracking_updates', ['shipment_id', 'updated_at'], {}),
+    ('ix_shipments_customer_id_created_at', 'shipments', ['customer_id', 'created_at'], {}),
+    ('ix_shipments_agent_id_status', 'shipments', ['agent_id', 'status'], {'postgresql_where': ASSIGNED, 'sqlite_where': ASSIGNED}),
+    ('ix_shipments_status_created_at', 'shipments', ['status', 'created_at'], {}),
+    ('ix_shipments_created_at', 'shipments', ['created_at'], {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True, **options)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,33 @@
+"""shipments.version for optimistic concurrency
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:02:51.640177
+
+Every write to a shipment bumps its version. Status transitions are one
+conditional UPDATE that also checks the status, the agent and (when the
+client sends it) the version. On PostgreSQL 11+ adding a NOT NULL column with
+a constant default only touches the catalog, not the existing rows.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('shipments', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('shipments') as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,39 @@
+"""customer shipment list index covers the keyset
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:41:07.392815
+
+The customer shipment list pages by (created_at, id) after a cursor, so the
+index gets id as its last column: every page is one range scan from the
+cursor, however deep. The new index is built before the old one is dropped,
+both CONCURRENTLY on PostgreSQL.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_shipments_customer_id_created_at_id', 'shipments', ['customer_id', 'created_at', 'id'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_shipments_customer_id_created_at', table_name='shipments',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_shipments_customer_id_created_at', 'shipments', ['customer_id', 'created_at'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_shipments_customer_id_created_at_id', table_name='shipments',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,88 @@
+"""shipments carry their latest tracking event
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 12:14:36.218094
+
+current_location, last_event_status and last_event_at are written by the
+same transaction that inserts each tracking update, so tracking a shipment
+reads one row by tracking number instead of also scanning its history. The
+columns are nullable, so adding them only touches the catalog. Existing
+shipments are backfilled from their newest tracking update in batches of
+BATCH_SIZE ids, each committed on its own, so no long transaction holds row
+locks on shipments while the app keeps writing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+shipments = sa.table(
+    'shipments',
+    sa.column('id'), sa.column('current_location'), sa.column('last_event_status'), sa.column('last_event_at')
+)
+tracking_updates = sa.table(
+    'tracking_updates',
+    sa.column('id'), sa.column('shipment_id'), sa.column('location'), sa.column('status'), sa.column('updated_at')
+)
+
+
+def latest(column):
+    # Same order in all three subqueries, so they read the same row
+    return (
+        sa.select(column)
+        .where(tracking_updates.c.shipment_id == shipments.c.id)
+        .order_by(tracking_updates.c.updated_at.desc(), tracking_updates.c.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def backfill(bind):
+    last = None
+    while True:
+        ids = sa.select(shipments.c.id).order_by(shipments.c.id).limit(BATCH_SIZE)
+        if last is not None:
+            ids = ids.where(shipments.c.id > last)
+        batch = bind.execute(ids).scalars().all()
+        if not batch:
+            return
+        bind.execute(
+            shipments.update()
+            .where(
+                shipments.c.id.between(batch[0], batch[-1]),
+                sa.exists().where(tracking_updates.c.shipment_id == shipments.c.id)
+            )
+            .values(
+                current_location=latest(tracking_updates.c.location),
+                last_event_status=latest(tracking_updates.c.status),
+                last_event_at=latest(tracking_updates.c.updated_at)
+            )
+        )
+        last = batch[-1]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('shipments', sa.Column('current_location', sa.String(), nullable=True))
+    op.add_column('shipments', sa.Column('last_event_status', sa.String(), nullable=True))
+    op.add_column('shipments', sa.Column('last_event_at', sa.TIMESTAMP(), nullable=True))
+    with op.get_context().autocommit_block():
+        backfill(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('shipments') as batch_op:
+        batch_op.drop_column('last_event_at')
+        batch_op.drop_column('last_event_status')
+        batch_op.drop_column('current_location')
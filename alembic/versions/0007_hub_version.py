@@ -0,0 +1,34 @@
+"""hubs.version for list ETags
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 13:02:18.570431
+
+Every update to a hub bumps its version, like shipments.version. GET
+/admin/hubs builds its ETag from the hubs' ids and versions, so a poller
+holding the current tag gets a 304 without the list being serialized.
+Adding a NOT NULL column with a constant default only touches the catalog
+on PostgreSQL 11+.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('hubs', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('hubs') as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,54 @@
+"""shipments.updated_at and the agent worklist index
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 13:41:55.802316
+
+GET /agent/shipments lists an agent's shipments by status, newest first,
+paged by (created_at, id) like the customer list, so the agent index gains
+both as trailing columns and every page is one range scan. It replaces
+ix_shipments_agent_id_status, of which it is a superset; both are built and
+dropped CONCURRENTLY on PostgreSQL.
+
+updated_at is set by every write and backs the ?since= filter. now() is
+evaluated once when the column is added, so on PostgreSQL 11+ this only
+touches the catalog and existing rows read as written at migration time:
+a client syncing from before then gets them all once. SQLite cannot add a
+column with a non-constant default, so the table is rebuilt there.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('shipments') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_shipments_agent_id_status_created_at_id', 'shipments',
+                        ['agent_id', 'status', 'created_at', 'id'], unique=False,
+                        postgresql_where=sa.text('agent_id IS NOT NULL'), sqlite_where=sa.text('agent_id IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_shipments_agent_id_status', table_name='shipments',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_shipments_agent_id_status', 'shipments', ['agent_id', 'status'], unique=False,
+                        postgresql_where=sa.text('agent_id IS NOT NULL'), sqlite_where=sa.text('agent_id IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_shipments_agent_id_status_created_at_id', table_name='shipments',
+                      postgresql_concurrently=True, if_exists=True)
+    with op.batch_alter_table('shipments') as batch_op:
+        batch_op.drop_column('updated_at')
@@ -1,9 +1,10 @@
 from fastapi import APIRouter
-from app.api.routes import auth, shipments, tracking, admin
+from app.api.routes import auth, shipments, tracking, admin, agent
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router)
 api_router.include_router(shipments.router)
 api_router.include_router(tracking.router)
-api_router.include_router(admin.router)
\ No newline at end of file
+api_router.include_router(admin.router)
+api_router.include_router(agent.router)
\ No newline at end of file
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
+from app.core import data_path
 from app.core.database import get_db
+from app.core.replica import get_read_db
 from app.core.dependencies import require_role
+from app.core.profiling import ProfiledRoute, list_profiles, get_profile, artifact_path
+from app.middleware.rate_limiter import rate_limit, ADMIN_QUOTA
+from app.utils.etags import conditional, rows_tag
 from app.schemas.user_schema import UserResponse
 from app.schemas.hub_schema import HubCreate, HubUpdate, HubResponse
 from app.services.hub_service import (
@@ -11,23 +17,32 @@ from app.services.hub_service import (
     update_hub_service,
     delete_hub_service,
     get_all_hubs_service,
+    get_all_hubs_service_async,
     get_all_users_service,
     delete_user_service,
     get_reports_service
 )
 
-router = APIRouter(prefix="/admin", tags=["Admin"])
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=ProfiledRoute)
 
 
+# ETag from the hubs' ids and versions; If-None-Match gets a 304 while no hub
+# was added, changed or deleted
 @router.get("/hubs", response_model=List[HubResponse])
-def list_hubs(
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role("admin"))
+@rate_limit(ADMIN_QUOTA)
+@data_path.endpoint
+async def list_hubs(
+    request: Request,
+    response: Response,
+    db=Depends(data_path.get_read_db),
+    current_user=Depends(data_path.require_role("admin"))
 ):
-    return get_all_hubs_service(db)
+    hubs = await data_path.call(get_all_hubs_service, get_all_hubs_service_async, db)
+    return conditional(request, response, rows_tag(hubs), hubs)
 
 
 @router.post("/hubs", response_model=HubResponse, status_code=201)
+@rate_limit(ADMIN_QUOTA)
 def create_hub(
     data: HubCreate,
     db: Session = Depends(get_db),
@@ -37,6 +52,7 @@ def create_hub(
 
 
 @router.put("/hubs/{hub_id}", response_model=HubResponse)
+@rate_limit(ADMIN_QUOTA)
 def update_hub(
     hub_id: UUID,
     data: HubUpdate,
@@ -47,6 +63,7 @@ def update_hub(
 
 
 @router.delete("/hubs/{hub_id}")
+@rate_limit(ADMIN_QUOTA)
 def delete_hub(
     hub_id: UUID,
     db: Session = Depends(get_db),
@@ -56,6 +73,7 @@ def delete_hub(
 
 
 @router.get("/users", response_model=List[UserResponse])
+@rate_limit(ADMIN_QUOTA, cost=5)
 def get_all_users(
     db: Session = Depends(get_db),
     current_user=Depends(require_role("admin"))
@@ -64,6 +82,7 @@ def get_all_users(
 
 
 @router.delete("/users/{user_id}")
+@rate_limit(ADMIN_QUOTA)
 def delete_user(
     user_id: UUID,
     db: Session = Depends(get_db),
@@ -73,8 +92,31 @@ def delete_user(
 
 
 @router.get("/reports")
+@rate_limit(ADMIN_QUOTA, cost=10)
 def get_reports(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(require_role("admin"))
 ):
-    return get_reports_service(db)
\ No newline at end of file
+    return get_reports_service(db)
+
+
+@router.get("/profiles")
+@rate_limit(ADMIN_QUOTA)
+def get_profiles(current_user=Depends(require_role("admin"))):
+    return list_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+@rate_limit(ADMIN_QUOTA)
+def get_profile_summary(profile_id: str, current_user=Depends(require_role("admin"))):
+    return get_profile(profile_id)
+
+
+@router.get("/profiles/{profile_id}/download")
+@rate_limit(ADMIN_QUOTA)
+def download_profile(profile_id: str, current_user=Depends(require_role("admin"))):
+    return FileResponse(
+        artifact_path(profile_id, "prof"),
+        media_type="application/octet-stream",
+        filename=f"{profile_id}.prof"
+    )
\ No newline at end of file
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from typing import Annotated, List
+from app.core import data_path
+from app.core.profiling import ProfiledRoute
+from app.middleware.rate_limiter import rate_limit
+from app.services.shipment_service import get_agent_shipments, get_agent_shipments_async
+from app.schemas.shipment_schema import AgentShipmentListQuery, ShipmentResponse
+from app.utils.etags import conditional, rows_tag
+
+router = APIRouter(prefix="/agent", tags=["Agent"], route_class=ProfiledRoute)
+
+
+# Agent - Shipments assigned to me, newest first, one page at a time. The
+# next page's cursor goes in the X-Next-Cursor header. A client syncing
+# passes ?since= the time of its last sync to get only what was written after.
+@router.get("/shipments", response_model=List[ShipmentResponse])
+@rate_limit(cost=5)
+@data_path.endpoint
+async def list_assigned_shipments(
+    query: Annotated[AgentShipmentListQuery, Query()],
+    request: Request,
+    response: Response,
+    db=Depends(data_path.get_read_db),
+    current_user=Depends(data_path.require_role("agent"))
+):
+    shipments, next_cursor = await data_path.call(
+        get_agent_shipments, get_agent_shipments_async, db, current_user.id, query.model_dump()
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return conditional(request, response, rows_tag(shipments), shipments)
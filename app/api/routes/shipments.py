@@ -1,26 +1,42 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Annotated, List
 from uuid import UUID
+from app.core import data_path
+from app.core.config import BULK_SHIPMENTS_MAX_BYTES
 from app.core.database import get_db
-from app.core.dependencies import get_current_user, require_role
+from app.core.profiling import ProfiledRoute
+from app.core.dependencies import require_role
+from app.middleware.rate_limiter import rate_limit, TRACKING_QUOTA, AGENT_WRITE_QUOTA, ADMIN_QUOTA
+from app.utils.etags import conditional, rows_tag, version_tag
 from app.services.shipment_service import (
+    create_bulk_shipments,
     create_new_shipment,
     track_shipment,
+    track_shipment_async,
+    track_shipments,
+    track_shipments_async,
     get_my_shipments,
+    get_my_shipments_async,
     update_status_service,
+    update_status_service_async,
     assign_agent_service,
-    cancel_shipment
+    cancel_shipment,
+    parse_manifest
 )
 from app.schemas.shipment_schema import (
+    BulkShipmentResponse,
     ShipmentCreate,
+    ShipmentListQuery,
     ShipmentResponse,
     ShipmentTrackResponse,
+    ShipmentTrackBatchRequest,
+    ShipmentTrackBatchResponse,
     ShipmentStatusUpdate,
     ShipmentAssignAgent
 )
 
-router = APIRouter(prefix="/shipments", tags=["Shipments"])
+router = APIRouter(prefix="/shipments", tags=["Shipments"], route_class=ProfiledRoute)
 
 
 # Customer - Create shipment
@@ -33,38 +49,110 @@ def create_shipment(
     return create_new_shipment(db, data.model_dump(), current_user.id)
 
 
-# Customer - View all my shipments
+def _manifest_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Manifest is over {BULK_SHIPMENTS_MAX_BYTES} bytes; split it into smaller uploads"
+    )
+
+
+async def read_manifest(request: Request) -> list:
+    # Refuse on the declared length, and on the bytes actually received for a
+    # chunked body, before anything is decoded
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > BULK_SHIPMENTS_MAX_BYTES:
+        raise _manifest_too_large()
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > BULK_SHIPMENTS_MAX_BYTES:
+            raise _manifest_too_large()
+    return parse_manifest(bytes(body), request.headers.get("content-type", ""))
+
+
+# Customer - Create shipments from a manifest (JSON array or NDJSON). The
+# customer is resolved before the body is read and parsed.
+@router.post("/bulk", response_model=BulkShipmentResponse)
+@rate_limit(cost=10)
+def create_shipments_bulk(
+    current_user=Depends(require_role("customer")),
+    rows: list = Depends(read_manifest),
+    db: Session = Depends(get_db)
+):
+    return create_bulk_shipments(db, rows, current_user.id)
+
+
+# Hot routes run on the event loop with the async engine when DB_ASYNC is set
+# (see app/core/data_path.py)
+
+# Customer - View my shipments, newest first, one page at a time. The cursor
+# of the next page goes in the X-Next-Cursor header so the body stays a list.
+# The page's ETag comes from its rows' ids and versions; a client sending it
+# back in If-None-Match gets a 304 while the page is unchanged.
 @router.get("/", response_model=List[ShipmentResponse])
-def list_shipments(
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role("customer"))
+@rate_limit(cost=5)
+@data_path.endpoint
+async def list_shipments(
+    query: Annotated[ShipmentListQuery, Query()],
+    request: Request,
+    response: Response,
+    db=Depends(data_path.get_read_db),
+    current_user=Depends(data_path.require_role("customer"))
 ):
-    return get_my_shipments(db, current_user.id)
+    shipments, next_cursor = await data_path.call(
+        get_my_shipments, get_my_shipments_async, db, current_user.id, query.model_dump()
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return conditional(request, response, rows_tag(shipments), shipments)
 
 
-# Any auth user - Track shipment by tracking number
+# Any auth user - Track shipment by tracking number. The ETag is the
+# shipment's version, which every status change and tracking event bumps.
 @router.get("/{tracking_number}", response_model=ShipmentTrackResponse)
-def track(
+@rate_limit(TRACKING_QUOTA)
+@data_path.endpoint
+async def track(
     tracking_number: str,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db=Depends(data_path.get_read_db),
+    current_user=Depends(data_path.get_current_user)
 ):
-    return track_shipment(db, tracking_number)
+    snapshot = await data_path.call(track_shipment, track_shipment_async, db, tracking_number)
+    return conditional(request, response, version_tag(snapshot["version"]), snapshot)
+
+
+# Any auth user - Track many shipments at once; results keep the request order
+@router.post("/track/batch", response_model=ShipmentTrackBatchResponse)
+@rate_limit(TRACKING_QUOTA, cost=10)
+@data_path.endpoint
+async def track_batch(
+    data: ShipmentTrackBatchRequest,
+    db=Depends(data_path.get_read_db),
+    current_user=Depends(data_path.get_current_user)
+):
+    return await data_path.call(track_shipments, track_shipments_async, db, data.tracking_numbers)
 
 
 # Agent - Update shipment status
 @router.put("/{shipment_id}/status", response_model=ShipmentResponse)
-def update_status(
+@rate_limit(AGENT_WRITE_QUOTA)
+@data_path.endpoint
+async def update_status(
     shipment_id: UUID,
     data: ShipmentStatusUpdate,
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role("agent"))
+    db=Depends(data_path.get_db),
+    current_user=Depends(data_path.require_role("agent"))
 ):
-    return update_status_service(db, shipment_id, data.model_dump(), current_user)
+    return await data_path.call(
+        update_status_service, update_status_service_async, db, shipment_id, data.model_dump(), current_user
+    )
 
 
 # Admin - Assign agent to shipment
 @router.put("/{shipment_id}/assign-agent", response_model=ShipmentResponse)
+@rate_limit(ADMIN_QUOTA)
 def assign_agent(
     shipment_id: UUID,
     data: ShipmentAssignAgent,
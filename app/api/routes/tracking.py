@@ -1,20 +1,22 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
 from uuid import UUID
-from app.core.database import get_db
-from app.core.dependencies import require_role
-from app.services.tracking_service import add_tracking_update
+from app.core import data_path
+from app.core.profiling import ProfiledRoute
+from app.middleware.rate_limiter import rate_limit, AGENT_WRITE_QUOTA
+from app.services.tracking_service import add_tracking_update, add_tracking_update_async
 from app.schemas.tracking_schema import TrackingCreate, TrackingResponse
 
-router = APIRouter(prefix="/tracking", tags=["Tracking"])
+router = APIRouter(prefix="/tracking", tags=["Tracking"], route_class=ProfiledRoute)
 
 
 # Agent - Add tracking update to shipment
 @router.post("/{shipment_id}", response_model=TrackingResponse, status_code=201)
-def add_update(
+@rate_limit(AGENT_WRITE_QUOTA)
+@data_path.endpoint
+async def add_update(
     shipment_id: UUID,
     data: TrackingCreate,
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role("agent"))
+    db=Depends(data_path.get_db),
+    current_user=Depends(data_path.require_role("agent"))
 ):
-    return add_tracking_update(db, shipment_id, data.dict(), current_user)
\ No newline at end of file
+    return await data_path.call(add_tracking_update, add_tracking_update_async, db, shipment_id, data.model_dump(), current_user)
\ No newline at end of file
@@ -4,6 +4,132 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Tables are created and changed by Alembic (`alembic upgrade head`), never by
+# the app. At startup each worker only checks that the database is at the
+# revision this build expects; SCHEMA_CHECK=false skips even that.
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "true").lower() in ("1", "true", "yes")
+
+# Connection pool per engine and per worker process. The most connections one
+# worker can hold is DB_POOL_SIZE + DB_MAX_OVERFLOW; see the connection budget
+# in the README. Ignored for sqlite URLs.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 2))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# DB_ASYNC=true serves the hot routes (tracking lookup, shipment listing, status
+# and tracking updates, hub listing) from an async engine on the event loop
+# instead of the thread pool. ASYNC_DATABASE_URL defaults to DATABASE_URL with
+# the async driver (asyncpg, aiosqlite) swapped in.
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
+
+# Optional read replica for read-only endpoints; without DATABASE_REPLICA_URL
+# every read goes to the primary. A user's reads stay on the primary for
+# REPLICA_READ_YOUR_WRITES_SECONDS after their own write. The replica is skipped
+# while its lag (checked every REPLICA_CHECK_INTERVAL_SECONDS) exceeds
+# REPLICA_MAX_LAG_SECONDS, and for REPLICA_RETRY_SECONDS after it fails.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", "")
+ASYNC_DATABASE_REPLICA_URL = os.getenv("ASYNC_DATABASE_REPLICA_URL", "")
+REPLICA_READ_YOUR_WRITES_SECONDS = float(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", 5))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+REPLICA_CHECK_INTERVAL_SECONDS = float(os.getenv("REPLICA_CHECK_INTERVAL_SECONDS", 5))
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", 30))
+
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
\ No newline at end of file
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+
+# Password hashing runs on a dedicated process pool so bcrypt never occupies
+# the request thread pool. Requests beyond workers + max pending get a 503.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 4))
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", 5))
+
+# Verified JWT principals are cached per process; an entry lives at most this
+# long (and never past the token's exp), bounding staleness across workers.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 10000))
+
+# Tracking lookups are cached per process by tracking number. Writes through
+# this worker drop the entry at once; other workers serve it for at most
+# TRACKING_CACHE_TTL_SECONDS. 0 turns the cache off.
+TRACKING_CACHE_TTL_SECONDS = float(os.getenv("TRACKING_CACHE_TTL_SECONDS", 5))
+TRACKING_CACHE_MAX_ENTRIES = int(os.getenv("TRACKING_CACHE_MAX_ENTRIES", 50000))
+
+# Sliding-window rate limits. Endpoints draw from named quotas with a per-call
+# cost; every role/client pair has its own bucket. Idle clients are swept and
+# the in-process backend tracks at most RATE_LIMIT_MAX_KEYS clients (least
+# recently seen evicted). The sqlite backend shares counters between every
+# worker that points at the same RATE_LIMIT_SQLITE_PATH; a lease size above 1
+# batches its writes by claiming that many tokens per write. Its calls run off
+# the event loop and wait at most RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS for the
+# store; past that the request is let through and counted in
+# rate_limit_backend_errors_total.
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", 60))
+RATE_LIMIT_TRACKING_REQUESTS = int(os.getenv("RATE_LIMIT_TRACKING_REQUESTS", 300))
+RATE_LIMIT_AGENT_WRITE_REQUESTS = int(os.getenv("RATE_LIMIT_AGENT_WRITE_REQUESTS", 120))
+RATE_LIMIT_ADMIN_REQUESTS = int(os.getenv("RATE_LIMIT_ADMIN_REQUESTS", 60))
+RATE_LIMIT_WINDOW_SECONDS = float(os.getenv("RATE_LIMIT_WINDOW_SECONDS", 60))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+RATE_LIMIT_SWEEP_INTERVAL_SECONDS = float(os.getenv("RATE_LIMIT_SWEEP_INTERVAL_SECONDS", 30))
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "rate_limits.db")
+RATE_LIMIT_LEASE_SIZE = int(os.getenv("RATE_LIMIT_LEASE_SIZE", 1))
+RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS = float(os.getenv("RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS", 50))
+
+# Access log: one JSON line per request, written by a background listener.
+# Errors and requests slower than ACCESS_LOG_SLOW_MS are always logged; other
+# requests are sampled at ACCESS_LOG_SAMPLE_RATE (0..1). When the queue is
+# full, records are dropped rather than stalling requests.
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", 0.1))
+ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", 500))
+ACCESS_LOG_QUEUE_SIZE = int(os.getenv("ACCESS_LOG_QUEUE_SIZE", 10000))
+
+# Metrics served at /metrics. With several uvicorn workers, point
+# METRICS_MULTIPROC_DIR at a directory shared by them (empty it on deploy):
+# each worker writes its snapshot there and a scrape sums them all.
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+METRICS_FLUSH_INTERVAL_SECONDS = float(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", 5))
+
+# Every statement is counted and timed per request (Server-Timing header and
+# access log). Statements slower than DB_SLOW_QUERY_MS are logged with
+# normalized SQL; DB_DEBUG_QUERIES flags statements repeated within a request.
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 200))
+DB_DEBUG_QUERIES = os.getenv("DB_DEBUG_QUERIES", "false").lower() in ("1", "true", "yes")
+
+# Admins can profile a single request by sending "X-Profile: 1". The cProfile
+# dump and a JSON summary are kept in PROFILE_DIR (newest PROFILE_MAX_ARTIFACTS)
+# and served under /admin/profiles.
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_ARTIFACTS = int(os.getenv("PROFILE_MAX_ARTIFACTS", 50))
+
+# GET /shipments/ returns one page at a time, newest first; the X-Next-Cursor
+# response header carries the cursor for the next page. Clients pick a page
+# size with ?limit=, up to SHIPMENTS_MAX_PAGE_SIZE.
+SHIPMENTS_PAGE_SIZE = int(os.getenv("SHIPMENTS_PAGE_SIZE", 50))
+SHIPMENTS_MAX_PAGE_SIZE = int(os.getenv("SHIPMENTS_MAX_PAGE_SIZE", 500))
+
+# POST /shipments/bulk takes a manifest (JSON array or NDJSON) of at most
+# BULK_SHIPMENTS_MAX_ROWS rows and inserts it BULK_SHIPMENTS_CHUNK_SIZE rows
+# per multi-row INSERT statement, all in one transaction. A body over
+# BULK_SHIPMENTS_MAX_BYTES is turned away before any of it is decoded.
+BULK_SHIPMENTS_MAX_ROWS = int(os.getenv("BULK_SHIPMENTS_MAX_ROWS", 50000))
+BULK_SHIPMENTS_MAX_BYTES = int(os.getenv("BULK_SHIPMENTS_MAX_BYTES", 16 * 1024 * 1024))
+BULK_SHIPMENTS_CHUNK_SIZE = int(os.getenv("BULK_SHIPMENTS_CHUNK_SIZE", 1000))
+
+# Tracking numbers embed a node id (0-1023) that must differ between workers
+# issuing them at the same time. By default each worker leases one from the
+# tracking_node_ids sequence at startup; set TRACKING_NODE_ID to pin it.
+# Each deployable issuing numbers keeps to its own TRACKING_NODE_RANGE
+# (first-last): the monolith 0-511, the shipment service 512-1023. Their
+# sequences live in different databases, so only the ranges keep them apart.
+TRACKING_NODE_ID = int(os.environ["TRACKING_NODE_ID"]) if os.getenv("TRACKING_NODE_ID") else None
+_first_node, _last_node = (int(part) for part in os.getenv("TRACKING_NODE_RANGE", "0-511").split("-"))
+TRACKING_NODES = range(_first_node, _last_node + 1)
+
+# POST /shipments/track/batch resolves up to TRACK_BATCH_MAX_SIZE tracking
+# numbers per request with a single query (cached snapshots aside).
+TRACK_BATCH_MAX_SIZE = int(os.getenv("TRACK_BATCH_MAX_SIZE", 500))
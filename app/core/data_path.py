@@ -0,0 +1,55 @@
+import inspect
+from functools import wraps
+from app.core.config import DB_ASYNC
+from app.core import database, dependencies, replica
+
+# Hot routes are written once, as coroutines, against the names below; the
+# mode picks the data path they run on:
+#   DB_ASYNC   the endpoint runs on the event loop with the async engine
+#   otherwise  the endpoint runs in the thread pool with the sync engine,
+#              like every other route
+# so one definition serves both modes and the two cannot drift apart.
+if DB_ASYNC:
+    get_db = database.get_async_db
+    get_read_db = replica.get_async_read_db
+    get_current_user = dependencies.get_current_user_async
+    require_role = dependencies.require_role_async
+else:
+    get_db = database.get_db
+    get_read_db = replica.get_read_db
+    get_current_user = dependencies.get_current_user
+    require_role = dependencies.require_role
+
+
+async def call(service, service_async, *args):
+    """Run the mode's version of a service function, e.g. call(track_shipment, track_shipment_async, db, number)."""
+    if DB_ASYNC:
+        return await service_async(*args)
+    return service(*args)
+
+
+def endpoint(route):
+    """Serve a coroutine endpoint from the mode's data path.
+
+    On the sync path nothing the endpoint awaits suspends (call() runs the sync
+    service straight away), so the coroutine is run to completion inside a
+    plain function, which FastAPI sends to the thread pool.
+    """
+    if DB_ASYNC:
+        return route
+
+    @wraps(route)
+    def run_in_thread(*args, **kwargs):
+        coroutine = route(*args, **kwargs)
+        try:
+            coroutine.send(None)
+        except StopIteration as done:
+            return done.value
+        coroutine.close()
+        raise RuntimeError(f"{route.__name__} awaited something other than call() on the sync data path")
+
+    # FastAPI follows __wrapped__ to tell coroutine endpoints apart; keep the
+    # parameters but not the link back to the coroutine
+    run_in_thread.__signature__ = inspect.signature(route)
+    del run_in_thread.__wrapped__
+    return run_in_thread
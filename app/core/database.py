@@ -1,16 +1,185 @@
-from sqlalchemy import create_engine
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from app.core.config import DATABASE_URL
+from app.core.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DATABASE_REPLICA_URL,
+    ASYNC_DATABASE_REPLICA_URL,
+    DB_ASYNC,
+    DB_SLOW_QUERY_MS,
+    DB_DEBUG_QUERIES
+)
+from app.core.pool import pool_options
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL, "primary"))
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay loaded after commit, so returning a just-written row does not
+# cost a SELECT. Server-generated columns come back through RETURNING instead
+# (eager_defaults on the models).
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
+query_logger = logging.getLogger("logistics_logger.db")
+
+
+@dataclass
+class QueryStats:
+    """Statements run and time spent in the database while handling one request."""
+    count: int = 0
+    seconds: float = 0.0
+    commits: int = 0
+    statements: Counter | None = field(default=None, repr=False)
+
+    def repeated(self) -> list:
+        """Statements issued more than once, normalized, most frequent first (debug mode only)."""
+        if not self.statements:
+            return []
+        return [(normalize_sql(sql), count) for sql, count in self.statements.most_common() if count > 1]
+
+
+# The request's QueryStats object. Worker threads running sync endpoints get a
+# copy of the context, so they all add to the same instance.
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect_query_stats():
+    stats = QueryStats(statements=Counter() if DB_DEBUG_QUERIES else None)
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+_STRING_LITERALS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+")
+_VALUE_LISTS = re.compile(r"\(\?(?:\s*,\s*\?)+\)")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace and replace literals and bind parameters with ?, so similar queries group together."""
+    sql = " ".join(statement.split())
+    sql = _STRING_LITERALS.sub("?", sql)
+    sql = _PLACEHOLDERS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    return _VALUE_LISTS.sub("(?)", sql)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("query_started")
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        if stats.statements is not None:
+            stats.statements[statement] += 1
+    if elapsed * 1000 >= DB_SLOW_QUERY_MS:
+        query_logger.warning("slow query", extra={"fields": {
+            "sql": normalize_sql(statement),
+            "duration_ms": round(elapsed * 1000, 2)
+        }})
+
+
+def _commit(conn):
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.commits += 1
+
+
+def instrument_engine(target):
+    """Count and time every statement and count the commits run on `target` (idempotent)."""
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+        event.listen(target, "commit", _commit)
+    return target
+
+
+instrument_engine(engine)
+
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_url(url: str) -> str:
+    """`url` with its dialect's async driver, e.g. postgresql://... -> postgresql+asyncpg://..."""
+    scheme, rest = url.split("://", 1)
+    return f"{_ASYNC_DRIVERS.get(scheme.split('+')[0], scheme)}://{rest}"
+
+
+# Only built in DB_ASYNC mode, so the async drivers are needed only there.
+# expire_on_commit=False matters even more here: touching an expired
+# attribute would need implicit IO, which an AsyncSession cannot do.
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    _async_database_url = ASYNC_DATABASE_URL or async_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        _async_database_url, **pool_options(_async_database_url, "primary_async", asyncio=True)
+    )
+    instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Optional read replica; app/core/replica.py decides which reads may use it
+replica_engine = None
+ReplicaSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+if DATABASE_REPLICA_URL:
+    replica_engine = instrument_engine(
+        create_engine(DATABASE_REPLICA_URL, **pool_options(DATABASE_REPLICA_URL, "replica"))
+    )
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=replica_engine)
+    if DB_ASYNC:
+        _async_replica_url = ASYNC_DATABASE_REPLICA_URL or async_url(DATABASE_REPLICA_URL)
+        async_replica_engine = create_async_engine(
+            _async_replica_url, **pool_options(_async_replica_url, "replica_async", asyncio=True)
+        )
+        instrument_engine(async_replica_engine.sync_engine)
+        AsyncReplicaSessionLocal = async_sessionmaker(async_replica_engine, autoflush=False, expire_on_commit=False)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_replica_db():
+    if ReplicaSessionLocal is None:
+        yield None
+        return
+    db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_replica_db():
+    if AsyncReplicaSessionLocal is None:
+        yield None
+        return
+    async with AsyncReplicaSessionLocal() as db:
+        yield db
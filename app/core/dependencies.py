@@ -1,41 +1,130 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
-from app.core.database import get_db
+from app.core.cache import TTLCache
+from app.core.database import get_db, get_async_db
 from app.core.security import oauth2_scheme
-from app.core.config import SECRET_KEY, ALGORITHM
+from app.core.config import (
+    SECRET_KEY,
+    ALGORITHM,
+    PRINCIPAL_CACHE_TTL_SECONDS,
+    PRINCIPAL_CACHE_MAX_ENTRIES
+)
+from app.repositories import async_user_repository
 from app.repositories.user_repository import get_user_by_email
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
-    credentials_exception = HTTPException(
+@dataclass(frozen=True)
+class Principal:
+    id: UUID
+    email: str
+    role: str
+
+
+# Verified principals keyed by token digest, so authorization on the hot path
+# needs no user lookup. Entries never outlive the token's own exp claim.
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_MAX_ENTRIES, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def invalidate_principal(user_id):
+    """Drop cached principals for a user, e.g. after deletion or a role change."""
+    user_id = UUID(str(user_id))
+    principal_cache.discard_where(lambda principal: principal.id == user_id)
+
+
+def peek_identity(token: str) -> tuple[str, str] | None:
+    """Role and subject of a valid token without touching the database."""
+    principal = principal_cache.get(_token_key(token))
+    if principal is not None:
+        return principal.role, principal.email
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("sub") is None or payload.get("role") is None:
+        return None
+    return payload["role"], payload["sub"]
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
 
-    user = get_user_by_email(db, email)
+def _remember_principal(key: bytes, user, payload: dict) -> Principal:
     if user is None:
-        raise credentials_exception
-    return user
+        raise _credentials_exception()
+    principal = Principal(id=user.id, email=user.email, role=user.role)
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        principal_cache.set(key, principal, ttl=expires_at - time.time())
+    return principal
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    key = _token_key(token)
+    principal = principal_cache.get(key)
+    if principal is not None:
+        return principal
+    payload = _decode_token(token)
+    return _remember_principal(key, get_user_by_email(db, payload["sub"]), payload)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """get_current_user for async routes: a cache miss is looked up without leaving the event loop."""
+    key = _token_key(token)
+    principal = principal_cache.get(key)
+    if principal is not None:
+        return principal
+    payload = _decode_token(token)
+    return _remember_principal(key, await async_user_repository.get_user_by_email(db, payload["sub"]), payload)
+
+
+def _check_role(current_user, required_role: str):
+    if current_user.role != required_role:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
 
 
 def require_role(required_role: str):
     def role_checker(current_user=Depends(get_current_user)):
-        if current_user.role != required_role:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied"
-            )
+        _check_role(current_user, required_role)
+        return current_user
+    return role_checker
+
+
+def require_role_async(required_role: str):
+    async def role_checker(current_user=Depends(get_current_user_async)):
+        _check_role(current_user, required_role)
         return current_user
-    return role_checker
\ No newline at end of file
+    return role_checker
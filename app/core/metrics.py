@@ -0,0 +1,259 @@
+import asyncio
+import glob
+import json
+import os
+import threading
+from bisect import bisect_left
+from app.core.config import METRICS_MULTIPROC_DIR, METRICS_FLUSH_INTERVAL_SECONDS
+
+# Each instrument spreads its label sets over a few locks, so concurrent
+# requests on different routes rarely wait on each other.
+_STRIPES = 16
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Registry:
+    def __init__(self):
+        self._instruments = []
+        self._collectors = []
+
+    def register(self, instrument):
+        self._instruments.append(instrument)
+
+    def add_collector(self, collector):
+        """Run `collector()` before every snapshot, to refresh gauges read from elsewhere."""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        for collector in self._collectors:
+            collector()
+        return {instrument.name: instrument.snapshot() for instrument in self._instruments}
+
+    def reset(self):
+        for instrument in self._instruments:
+            instrument.reset()
+
+    def collect(self, directory: str | None = None) -> dict:
+        """Values for every instrument, summed over all worker snapshots in `directory`."""
+        merged = {}
+        for name, data in self.snapshot().items():
+            merged[name] = dict(data, values={tuple(labels): value for labels, value in data["values"]})
+        if not directory:
+            return merged
+        for path in glob.glob(os.path.join(directory, "metrics-*.json")):
+            pid = int(os.path.basename(path)[len("metrics-"):-len(".json")])
+            if pid == os.getpid():
+                continue
+            try:
+                with open(path) as f:
+                    worker = json.load(f)
+            except (OSError, ValueError):
+                continue
+            alive = _pid_alive(pid)
+            for name, data in worker.items():
+                target = merged.get(name)
+                # Counters from exited workers stay so totals never go backwards;
+                # gauges only describe processes that are still running.
+                if target is None or (target["type"] == "gauge" and not alive):
+                    continue
+                values = target["values"]
+                for labels, value in data["values"]:
+                    labels = tuple(labels)
+                    current = values.get(labels)
+                    if current is None:
+                        values[labels] = value
+                    elif isinstance(current, list):
+                        values[labels] = [a + b for a, b in zip(current, value)]
+                    else:
+                        values[labels] = current + value
+        return merged
+
+    def render(self, directory: str | None = None) -> str:
+        lines = []
+        for name, data in self.collect(directory).items():
+            lines.append(f"# HELP {name} {data['help']}")
+            lines.append(f"# TYPE {name} {data['type']}")
+            for labels, value in data["values"].items():
+                pairs = list(zip(data["labelnames"], labels))
+                if data["type"] != "histogram":
+                    lines.append(f"{name}{_labels(pairs)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(data["buckets"] + ["+Inf"], value[:-1]):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _number(bound)
+                    lines.append(f"{name}_bucket{_labels(pairs + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(pairs)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(pairs)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, directory: str):
+        # Written under a temporary name and renamed, so a scrape never reads half a file
+        path = os.path.join(directory, f"metrics-{os.getpid()}.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+
+
+REGISTRY = Registry()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Instrument:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=(), registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict = {}  # label values tuple -> number (or bucket list)
+        self._locks = [threading.Lock() for _ in range(_STRIPES)]
+        registry.register(self)
+
+    def _lock(self, labels: tuple) -> threading.Lock:
+        return self._locks[hash(labels) % _STRIPES]
+
+    def _add(self, labels: tuple, amount: float):
+        with self._lock(labels):
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self) -> dict:
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "values": [(list(labels), value) for labels, value in self._values.copy().items()]
+        }
+
+    def reset(self):
+        self._values.clear()
+
+
+class Counter(_Instrument):
+    type = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        self._add(labels, amount)
+
+
+class Gauge(_Instrument):
+    type = "gauge"
+
+    def inc(self, *labels, amount: float = 1):
+        self._add(labels, amount)
+
+    def dec(self, *labels, amount: float = 1):
+        self._add(labels, -amount)
+
+    def set(self, value: float, *labels):
+        with self._lock(labels):
+            self._values[labels] = value
+
+
+class Histogram(_Instrument):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS,
+                 registry: Registry = REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, *labels):
+        # One slot per bucket plus +Inf, then the running sum; cumulated on render
+        index = bisect_left(self.buckets, value)
+        with self._lock(labels):
+            slots = self._values.get(labels)
+            if slots is None:
+                slots = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            slots[index] += 1
+            slots[-1] += value
+
+    def snapshot(self) -> dict:
+        data = super().snapshot()
+        data["buckets"] = list(self.buckets)
+        data["values"] = [(labels, list(value)) for labels, value in data["values"]]
+        return data
+
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status")
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total", "Requests rejected with 429 by the rate limiter.", ("quota",)
+)
+RATE_LIMIT_BACKEND_ERRORS = Counter(
+    "rate_limit_backend_errors_total", "Rate-limit checks and sweeps skipped because the backend was unavailable.",
+    ("quota",)
+)
+TRACKING_CACHE_LOOKUPS = Counter(
+    "tracking_cache_lookups_total", "Tracking lookups by whether the snapshot cache had them.", ("result",)
+)
+TRACKING_LOOKUP_DURATION = Histogram(
+    "tracking_lookup_seconds", "Time to produce a tracking snapshot, from the cache or the database.", ("source",),
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1)
+)
+
+
+def observe_request(method: str, route: str, status_code: int, seconds: float):
+    status = f"{status_code // 100}xx"
+    HTTP_REQUESTS.inc(method, route, status)
+    HTTP_REQUEST_DURATION.observe(seconds, method, route, status)
+
+
+def render_metrics() -> str:
+    if METRICS_MULTIPROC_DIR:
+        REGISTRY.write_snapshot(METRICS_MULTIPROC_DIR)
+    return REGISTRY.render(METRICS_MULTIPROC_DIR)
+
+
+async def flush_metrics(interval: float = METRICS_FLUSH_INTERVAL_SECONDS):
+    # Keeps this worker's snapshot fresh for scrapes served by its siblings
+    while True:
+        await asyncio.sleep(interval)
+        REGISTRY.write_snapshot(METRICS_MULTIPROC_DIR)
+
+
+def start_metrics():
+    if not METRICS_MULTIPROC_DIR:
+        return None
+    os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+    REGISTRY.write_snapshot(METRICS_MULTIPROC_DIR)
+    return asyncio.create_task(flush_metrics())
+
+
+def stop_metrics(task):
+    if task is not None:
+        task.cancel()
+    if METRICS_MULTIPROC_DIR:
+        REGISTRY.write_snapshot(METRICS_MULTIPROC_DIR)
@@ -0,0 +1,120 @@
+import threading
+import time
+import weakref
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+from app.core.metrics import REGISTRY, Counter, Gauge, Histogram
+
+POOL_CONNECTIONS = Gauge("db_pool_connections", "Pool connections by state.", ("pool", "state"))
+POOL_WAITING = Gauge("db_pool_waiting", "Threads waiting for a connection to come back to a full pool.", ("pool",))
+POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds", "Time to check out a connection, pre-ping included; timeouts are counted apart.", ("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+)
+POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT.", ("pool",))
+
+_pools = weakref.WeakSet()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that times every checkout and counts the threads waiting for one.
+
+    Only a checkout that finds every connection in use (pool_size plus
+    max_overflow) counts as waiting. Checkouts and their times cover the
+    ones that got a connection; those that gave up are only counted as
+    timeouts.
+
+    The pool is named after the engine's pool_logging_name, which SQLAlchemy
+    carries over when the pool is recreated.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.name = self._orig_logging_name or "default"
+        self._stats_lock = threading.Lock()
+        self._waiting = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        _pools.add(self)
+
+    def _full(self) -> bool:
+        return self._max_overflow > -1 and self.checkedout() >= self.size() + self._max_overflow
+
+    def connect(self):
+        start = time.perf_counter()
+        with self._stats_lock:
+            waiting = self._full()
+            if waiting:
+                self._waiting += 1
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            POOL_TIMEOUTS.inc(self.name)
+            raise
+        finally:
+            if waiting:
+                with self._stats_lock:
+                    self._waiting -= 1
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        POOL_CHECKOUT.observe(waited, self.name)
+        return connection
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "pool": self.name,
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "idle": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_checkout_ms": round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "max_checkout_ms": round(self._wait_max * 1000, 3)
+            }
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """The same pool for async engines, which require an asyncio-compatible queue."""
+
+
+def pool_stats() -> list:
+    return [pool.stats() for pool in list(_pools)]
+
+
+def _collect_pool_stats():
+    for stats in pool_stats():
+        POOL_CONNECTIONS.set(stats["checked_out"], stats["pool"], "checked_out")
+        POOL_CONNECTIONS.set(stats["idle"], stats["pool"], "idle")
+        POOL_CONNECTIONS.set(stats["overflow"], stats["pool"], "overflow")
+        POOL_WAITING.set(stats["waiting"], stats["pool"])
+
+
+REGISTRY.add_collector(_collect_pool_stats)
+
+
+def pool_options(url: str, name: str, asyncio: bool = False) -> dict:
+    """create_engine() (or create_async_engine() with asyncio=True) keyword arguments for the configured pool."""
+    if url.startswith("sqlite"):
+        # SQLite has no server-side connection limit; keep SQLAlchemy's default pool
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if asyncio else InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING
+    }
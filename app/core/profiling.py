@@ -0,0 +1,173 @@
+import cProfile
+import inspect
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from functools import wraps
+from fastapi import HTTPException, Request
+from fastapi.routing import APIRoute
+from app.core.config import PROFILE_DIR, PROFILE_MAX_ARTIFACTS
+from app.core.dependencies import peek_identity
+
+PROFILE_HEADER = "x-profile"
+
+# SQLAlchemy hands every statement to the DBAPI through one of these
+_DB_CALLS = {"do_execute", "do_executemany", "do_execute_no_params"}
+_PROFILE_ID = re.compile(r"[0-9a-f]{32}")
+
+_active: ContextVar = ContextVar("active_profile", default=None)
+# cProfile allows one active profiler per thread; profiling one request at a
+# time keeps two profiles from claiming the same worker thread.
+_one_at_a_time = threading.Lock()
+
+
+class RequestProfile:
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.profiler = cProfile.Profile()
+        self.started = time.perf_counter()
+        self.token = None
+
+
+def _profiled(call, is_coroutine: bool):
+    # Endpoints run either on the event loop or in a worker thread; enabling
+    # the profiler inside the call covers both.
+    if is_coroutine:
+        @wraps(call)
+        async def wrapper(**kwargs):
+            profile = _active.get()
+            if profile is None:
+                return await call(**kwargs)
+            profile.profiler.enable()
+            try:
+                return await call(**kwargs)
+            finally:
+                profile.profiler.disable()
+    else:
+        @wraps(call)
+        def wrapper(**kwargs):
+            profile = _active.get()
+            if profile is None:
+                return call(**kwargs)
+            profile.profiler.enable()
+            try:
+                return call(**kwargs)
+            finally:
+                profile.profiler.disable()
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route class that wraps its endpoint so a flagged request can be profiled where it runs."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if not getattr(endpoint, "profiled", False):
+            endpoint = _profiled(endpoint, inspect.iscoroutinefunction(endpoint))
+            endpoint.profiled = True
+        super().__init__(path, endpoint, **kwargs)
+
+
+def start_profile(request: Request) -> RequestProfile | None:
+    """Start a profile when the request is flagged and carries an admin token; otherwise None."""
+    authorization = request.headers.get("authorization") or ""
+    identity = peek_identity(authorization[7:]) if authorization[:7].lower() == "bearer " else None
+    if identity is None or identity[0] != "admin":
+        return None
+    if not _one_at_a_time.acquire(blocking=False):
+        return None
+    profile = RequestProfile()
+    profile.token = _active.set(profile)
+    return profile
+
+
+def finish_profile(profile: RequestProfile, request: Request, status_code: int, queries) -> str | None:
+    """Store the profile as a .prof file plus a JSON summary and return its id (None if the endpoint never ran)."""
+    wall = time.perf_counter() - profile.started
+    _active.reset(profile.token)
+    _one_at_a_time.release()
+    if not profile.profiler.getstats():
+        return None
+
+    stats = pstats.Stats(profile.profiler)
+    db_seconds = sum(
+        cumulative for (filename, _, name), (_, _, _, cumulative, _) in stats.stats.items()
+        if name in _DB_CALLS and "sqlalchemy" in filename
+    )
+    top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:30]
+    route = request.scope.get("route")
+    summary = {
+        "id": profile.id,
+        "created_at": time.time(),
+        "method": request.method,
+        "path": request.url.path,
+        "route": getattr(route, "path", None),
+        "status": status_code,
+        "wall_ms": round(wall * 1000, 2),
+        "endpoint_ms": round(stats.total_tt * 1000, 2),
+        "db_ms": round(db_seconds * 1000, 2),
+        "python_ms": round(max(stats.total_tt - db_seconds, 0) * 1000, 2),
+        "request_db_queries": queries.count,
+        "request_db_ms": round(queries.seconds * 1000, 2),
+        "top_functions": [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "tottime_ms": round(own * 1000, 3),
+                "cumtime_ms": round(cumulative * 1000, 3)
+            }
+            for (filename, line, name), (_, calls, own, cumulative, _) in top
+        ]
+    }
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stats.dump_stats(os.path.join(PROFILE_DIR, f"{profile.id}.prof"))
+    with open(os.path.join(PROFILE_DIR, f"{profile.id}.json"), "w") as f:
+        json.dump(summary, f)
+    _prune()
+    return profile.id
+
+
+def _prune():
+    summaries = sorted(
+        (os.path.join(PROFILE_DIR, name) for name in os.listdir(PROFILE_DIR) if name.endswith(".json")),
+        key=os.path.getmtime
+    )
+    for path in summaries[:max(len(summaries) - PROFILE_MAX_ARTIFACTS, 0)]:
+        for stale in (path, path[:-len(".json")] + ".prof"):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+
+def artifact_path(profile_id: str, extension: str) -> str:
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.{extension}")
+    if not _PROFILE_ID.fullmatch(profile_id) or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return path
+
+
+def get_profile(profile_id: str) -> dict:
+    with open(artifact_path(profile_id, "json")) as f:
+        return json.load(f)
+
+
+def list_profiles() -> list:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(PROFILE_DIR):
+        if name.endswith(".json"):
+            try:
+                with open(os.path.join(PROFILE_DIR, name)) as f:
+                    summary = json.load(f)
+            except (OSError, ValueError):
+                continue
+            summary.pop("top_functions", None)
+            profiles.append(summary)
+    return sorted(profiles, key=lambda summary: summary["created_at"], reverse=True)
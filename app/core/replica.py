@@ -0,0 +1,180 @@
+import logging
+import math
+import time
+from fastapi import Depends, Request, Response
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import (
+    DATABASE_REPLICA_URL,
+    REPLICA_READ_YOUR_WRITES_SECONDS,
+    REPLICA_MAX_LAG_SECONDS,
+    REPLICA_CHECK_INTERVAL_SECONDS,
+    REPLICA_RETRY_SECONDS
+)
+from app.core.database import get_db, get_async_db, get_replica_db, get_async_replica_db
+from app.core.dependencies import peek_identity
+from app.core.metrics import Counter
+
+READ_ROUTING = Counter("db_read_routing_total", "Reads of read-only endpoints by database and reason.", ("target", "reason"))
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+# Session.info flag on sessions get_read_db hands out for the replica
+_ON_REPLICA = "on_replica"
+
+logger = logging.getLogger("logistics_logger.db")
+
+# Users who wrote within the read-your-writes window. This is per worker; the
+# cookie set on the write response carries the window to every other worker.
+recent_writers = TTLCache(maxsize=100000, ttl=REPLICA_READ_YOUR_WRITES_SECONDS)
+
+# Seconds the replica is behind. An idle primary leaves the last replay
+# timestamp old, so a replica that has replayed everything it received counts
+# as caught up.
+_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaHealth:
+    """Last known replica state. Concurrent requests may race to refresh it, which only costs an extra check."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.lag = 0.0
+        self.next_check = 0.0
+        self.down_until = 0.0
+
+    def check_due(self) -> bool:
+        return time.monotonic() >= self.next_check
+
+    def observe_lag(self, lag: float):
+        self.lag = lag
+        self.next_check = time.monotonic() + REPLICA_CHECK_INTERVAL_SECONDS
+
+    def mark_down(self, error: Exception):
+        self.down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+        logger.warning("replica unavailable, reading from primary", extra={"fields": {
+            "error": type(error).__name__,
+            "retry_in_s": REPLICA_RETRY_SECONDS
+        }})
+
+
+replica_health = ReplicaHealth()
+
+
+def replica_lag(conn) -> float:
+    if conn.dialect.name != "postgresql":
+        return 0.0
+    return float(conn.execute(_LAG_SQL).scalar() or 0)
+
+
+def _subject(request: Request) -> str | None:
+    authorization = request.headers.get("authorization") or ""
+    identity = peek_identity(authorization[7:]) if authorization[:7].lower() == "bearer " else None
+    return identity[1] if identity else None
+
+
+def note_write(request: Request, response: Response):
+    """Keep the caller's reads on the primary for the read-your-writes window after a request that committed."""
+    if not DATABASE_REPLICA_URL or REPLICA_READ_YOUR_WRITES_SECONDS <= 0:
+        return
+    subject = _subject(request)
+    if subject is not None:
+        recent_writers.set(subject, True)
+    response.set_cookie(
+        READ_PRIMARY_COOKIE,
+        f"{time.time() + REPLICA_READ_YOUR_WRITES_SECONDS:.3f}",
+        max_age=math.ceil(REPLICA_READ_YOUR_WRITES_SECONDS),
+        httponly=True,
+        samesite="lax"
+    )
+
+
+def _pinned_to_primary(request: Request) -> str | None:
+    """Why this request must read from the primary before the replica is even tried, if at all."""
+    pinned_until = request.cookies.get(READ_PRIMARY_COOKIE)
+    if pinned_until:
+        try:
+            if float(pinned_until) > time.time():
+                return "recent_write"
+        except ValueError:
+            pass
+    subject = _subject(request)
+    if subject is not None and recent_writers.get(subject):
+        return "recent_write"
+    if time.monotonic() < replica_health.down_until:
+        return "down"
+    return None
+
+
+def _lagging() -> str | None:
+    return "lag" if replica_health.lag > REPLICA_MAX_LAG_SECONDS else None
+
+
+def get_read_db(
+    request: Request,
+    db: Session = Depends(get_db),
+    replica: Session | None = Depends(get_replica_db)
+) -> Session:
+    """Session for a read-only endpoint: the replica when it is usable for this caller, else the primary."""
+    if replica is None:
+        return db
+    reason = _pinned_to_primary(request)
+    if reason is None:
+        try:
+            # Checking out the connection here is what detects a replica that is
+            # down, or whose pool stayed exhausted for DB_POOL_TIMEOUT
+            conn = replica.connection()
+            if replica_health.check_due():
+                replica_health.observe_lag(replica_lag(conn))
+        except SQLAlchemyError as error:
+            replica_health.mark_down(error)
+            reason = "down"
+        else:
+            reason = _lagging()
+    if reason is not None:
+        replica.close()
+        READ_ROUTING.inc("primary", reason)
+        return db
+    READ_ROUTING.inc("replica", "ok")
+    replica.info[_ON_REPLICA] = True
+    return replica
+
+
+def on_replica(db: Session | AsyncSession) -> bool:
+    """True for a session reading from the replica, whose rows may trail the primary's."""
+    return db.info.get(_ON_REPLICA, False)
+
+
+async def get_async_read_db(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    replica: AsyncSession | None = Depends(get_async_replica_db)
+) -> AsyncSession:
+    """get_read_db for async routes."""
+    if replica is None:
+        return db
+    reason = _pinned_to_primary(request)
+    if reason is None:
+        try:
+            conn = await replica.connection()
+            if replica_health.check_due():
+                replica_health.observe_lag(await conn.run_sync(replica_lag))
+        except SQLAlchemyError as error:
+            replica_health.mark_down(error)
+            reason = "down"
+        else:
+            reason = _lagging()
+    if reason is not None:
+        await replica.close()
+        READ_ROUTING.inc("primary", reason)
+        return db
+    READ_ROUTING.inc("replica", "ok")
+    replica.info[_ON_REPLICA] = True
+    return replica
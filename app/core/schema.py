@@ -0,0 +1,28 @@
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+# The Alembic head this code is written against. Bump it together with every
+# new migration; tests/test_migrations.py fails while the two disagree.
+SCHEMA_REVISION = "0008"
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def current_revision(engine) -> str | None:
+    with engine.connect() as conn:
+        try:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except DBAPIError:
+            return None
+
+
+def check_schema(engine):
+    """Refuse to start against a database that is not migrated to SCHEMA_REVISION. One query, no reflection."""
+    revision = current_revision(engine)
+    if revision != SCHEMA_REVISION:
+        raise SchemaVersionError(
+            f"Database schema is at revision {revision or '(none)'}, this build expects {SCHEMA_REVISION}. "
+            "Run `alembic upgrade head` (or `alembic stamp 0001` for a database created before migrations)."
+        )
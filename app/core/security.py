@@ -1,21 +1,127 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
+from fastapi import HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.config import (
+    SECRET_KEY,
+    ALGORITHM,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_TIMEOUT_SECONDS
+)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def hash_password(password: str) -> str:
+# bcrypt is ~200 ms of CPU per call. It runs in its own process pool so a login
+# storm cannot starve the AnyIO thread pool that serves every other endpoint.
+# Admission is bounded: at most workers + max pending calls are in flight, the
+# rest are rejected immediately with a 503 instead of queuing without limit.
+_hash_executor: ProcessPoolExecutor | None = None
+_hash_executor_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_PENDING)
+
+
+def _hash_in_worker(password: str) -> str:
     return pwd_context.hash(password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+
+def _verify_in_worker(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                # spawn, not fork: forking a process that already runs threads
+                # (uvicorn, the DB pool) can deadlock the child
+                _hash_executor = ProcessPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _hash_executor
+
+
+def _warm_up():
+    return None
+
+
+def start_hash_executor():
+    # Spawning a worker costs about a second; do it at boot rather than on
+    # the first logins of a storm.
+    executor = _get_hash_executor()
+    for _ in range(PASSWORD_HASH_WORKERS):
+        executor.submit(_warm_up)
+
+
+def _reset_hash_executor(broken: ProcessPoolExecutor):
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is broken:
+            _hash_executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_hash_executor():
+    global _hash_executor
+    with _hash_executor_lock:
+        executor, _hash_executor = _hash_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _auth_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Authentication is busy. Please try again shortly.",
+        headers={"Retry-After": "1"}
+    )
+
+
+async def _run_hash_job(fn, *args):
+    if not _hash_slots.acquire(blocking=False):
+        raise _auth_busy()
+
+    executor = _get_hash_executor()
+    try:
+        future = executor.submit(fn, *args)
+    except (BrokenProcessPool, RuntimeError):
+        _hash_slots.release()
+        _reset_hash_executor(executor)
+        raise _auth_busy()
+
+    # The slot is held until the worker is really done with the job, even if
+    # the request gave up on it, so the bound reflects actual pool load.
+    future.add_done_callback(lambda _: _hash_slots.release())
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), PASSWORD_HASH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise _auth_busy()
+    except BrokenProcessPool:
+        _reset_hash_executor(executor)
+        raise _auth_busy()
+
+
+async def hash_password(password: str) -> str:
+    return await _run_hash_job(_hash_in_worker, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash_job(_verify_in_worker, plain_password, hashed_password)
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
\ No newline at end of file
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -1,11 +1,26 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 
-from app.core.database import engine, Base
+from app.core.config import SCHEMA_CHECK, TRACKING_NODE_ID, TRACKING_NODES
+from app.core.database import engine, async_engine
+from app.core.metrics import render_metrics, start_metrics, stop_metrics
+from app.core.profiling import ProfiledRoute
+from app.core.schema import check_schema
+from app.core.security import start_hash_executor, shutdown_hash_executor
 from app.api.router import api_router
 from app.middleware.cors import setup_cors
-from app.middleware.logging_middleware import logging_middleware
-from app.middleware.rate_limiter import rate_limit_middleware
+from app.middleware.logging_middleware import logging_middleware, start_access_log, stop_access_log
+from app.middleware.rate_limiter import (
+    enforce_rate_limit,
+    limit_unrouted_requests,
+    rate_limit_exempt,
+    sweep_idle_clients,
+    close_rate_limits
+)
+from app.utils.tracking_numbers import configure_node, lease_node
 from app.exceptions.custom_exceptions import (
     http_exception_handler,
     validation_exception_handler,
@@ -15,19 +30,41 @@ from app.exceptions.custom_exceptions import (
 # Import models so SQLAlchemy registers them
 from app.models import user, shipment, tracking, hub  # noqa
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if SCHEMA_CHECK:
+        check_schema(engine)
+    configure_node(
+        TRACKING_NODE_ID if TRACKING_NODE_ID is not None else lease_node(engine, TRACKING_NODES), TRACKING_NODES
+    )
+    start_access_log()
+    flusher = start_metrics()
+    start_hash_executor()
+    sweeper = asyncio.create_task(sweep_idle_clients())
+    yield
+    sweeper.cancel()
+    stop_metrics(flusher)
+    close_rate_limits()
+    shutdown_hash_executor()
+    if async_engine is not None:
+        await async_engine.dispose()
+    stop_access_log()
+
+
 app = FastAPI(
     title="Logistics & Shipment Tracking API",
     description="Logistics & Shipment Tracking System | Sprints 1-3 | Hexaware Capstone",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    dependencies=[Depends(enforce_rate_limit)]
 )
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+app.router.route_class = ProfiledRoute
 
 # Middleware
 setup_cors(app)
+app.middleware("http")(limit_unrouted_requests)
 app.middleware("http")(logging_middleware)
-app.middleware("http")(rate_limit_middleware)
 
 # Exception handlers
 app.add_exception_handler(HTTPException, http_exception_handler)
@@ -45,4 +82,10 @@ def root():
 
 @app.get("/health")
 def health():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+@rate_limit_exempt
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -1,15 +1,149 @@
-import time
+import json
 import logging
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from fastapi import Request
+from app.core.config import ACCESS_LOG_SAMPLE_RATE, ACCESS_LOG_SLOW_MS, ACCESS_LOG_QUEUE_SIZE
+from app.core.database import QueryStats, collect_query_stats
+from app.core.metrics import HTTP_IN_FLIGHT, observe_request
+from app.core.profiling import PROFILE_HEADER, start_profile, finish_profile
+from app.core.replica import note_write
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("logistics_logger")
 
 
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message and the record's fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without ever blocking the request.
+
+    Records are queued as-is and formatted by the listener, off the event loop.
+    When the queue is full the record is dropped and counted instead of waiting.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_queue: queue.Queue = queue.Queue(maxsize=ACCESS_LOG_QUEUE_SIZE)
+queue_handler = DroppingQueueHandler(_queue)
+logger.addHandler(queue_handler)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+_listener: QueueListener | None = None
+
+
+def start_access_log(stream=None):
+    global _listener
+    if _listener is not None:
+        return
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter())
+    _listener = QueueListener(_queue, handler)
+    _listener.start()
+
+
+def stop_access_log():
+    # Drains whatever is still queued before the process exits
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _should_log(status_code: int, duration_ms: float) -> bool:
+    if status_code >= 400 or duration_ms >= ACCESS_LOG_SLOW_MS:
+        return True
+    return ACCESS_LOG_SAMPLE_RATE >= 1 or random.random() < ACCESS_LOG_SAMPLE_RATE
+
+
+def _record(request: Request, status_code: int, seconds: float, queries: QueryStats):
+    # Keyed by route template, so every tracking number shares one series
+    route = request.scope.get("route")
+    template = getattr(route, "path", None)
+    observe_request(request.method, template or "unmatched", status_code, seconds)
+
+    duration_ms = seconds * 1000
+    repeated = queries.repeated()
+    if not repeated and not _should_log(status_code, duration_ms):
+        return
+    if status_code >= 500:
+        level = logging.ERROR
+    elif status_code >= 400 or duration_ms >= ACCESS_LOG_SLOW_MS or repeated:
+        level = logging.WARNING
+    else:
+        level = logging.INFO
+    fields = {
+        "method": request.method,
+        "path": request.url.path,
+        "route": template,
+        "status": status_code,
+        "duration_ms": round(duration_ms, 2),
+        "db_queries": queries.count,
+        "db_ms": round(queries.seconds * 1000, 2),
+        "client": request.client.host if request.client else None,
+        "slow": duration_ms >= ACCESS_LOG_SLOW_MS
+    }
+    if repeated:
+        fields["repeated_queries"] = [{"sql": sql, "count": count} for sql, count in repeated]
+    logger.log(level, "request", extra={"fields": fields})
+
+
+def _server_timing(queries: QueryStats, seconds: float) -> str:
+    noun = "query" if queries.count == 1 else "queries"
+    return (f'db;dur={queries.seconds * 1000:.2f};desc="{queries.count} {noun}", '
+            f'app;dur={seconds * 1000:.2f}')
+
+
 async def logging_middleware(request: Request, call_next):
-    start_time = time.time()
-    logger.info(f"Incoming: {request.method} {request.url.path}")
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    logger.info(f"Completed: {request.method} {request.url.path} | Status: {response.status_code} | Time: {process_time:.4f}s")
-    return response
\ No newline at end of file
+    start_time = time.perf_counter()
+    HTTP_IN_FLIGHT.inc()
+    # Unflagged requests pay for this one header lookup and nothing else
+    profile = start_profile(request) if PROFILE_HEADER in request.headers else None
+    status_code = 500
+    with collect_query_stats() as queries:
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        except Exception:
+            _record(request, 500, time.perf_counter() - start_time, queries)
+            raise
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            profile_id = profile and finish_profile(profile, request, status_code, queries)
+    elapsed = time.perf_counter() - start_time
+    response.headers["Server-Timing"] = _server_timing(queries, elapsed)
+    if profile_id:
+        response.headers["X-Profile-Id"] = profile_id
+    if queries.commits:
+        note_write(request, response)
+    _record(request, response.status_code, elapsed, queries)
+    return response
@@ -0,0 +1,252 @@
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class BackendUnavailable(Exception):
+    """The backend could not decide in time, e.g. its store stayed locked; the limiter lets the request through."""
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage and decision engine behind the rate limiter.
+
+    hit() records a request of the given cost against a key and returns 0 when
+    it is allowed, otherwise the number of seconds the client should wait.
+    Backends whose calls do I/O set `blocking`; the limiter then calls them
+    from a worker thread instead of the event loop.
+    """
+
+    blocking = False
+
+    @abstractmethod
+    def hit(self, key, cost: int = 1, now: float | None = None) -> float:
+        ...
+
+    def sweep(self, now: float | None = None) -> int:
+        return 0
+
+    @abstractmethod
+    def reset(self):
+        ...
+
+    def close(self):
+        pass
+
+
+def _retry_after(limit: int, window: float, previous: float, current: float, cost: int, elapsed: float) -> float:
+    remaining = window * (1 - elapsed)
+    if current + cost > limit or previous == 0:
+        # Only the next window can make room for this request
+        return remaining
+    # Wait until the previous window's weight has decayed enough
+    needed = 1 - (limit - current - cost) / previous
+    return max((needed - elapsed) * window, 0.001)
+
+
+class SlidingWindowLimiter(RateLimitBackend):
+    """
+    In-process sliding-window-counter rate limiter.
+
+    Each key keeps three numbers: the index of its current fixed window and the
+    counts for that window and the previous one. The request rate is estimated
+    by weighting the previous window by how much of it still overlaps the
+    sliding window, so a check is O(1) in time and memory whatever the traffic.
+
+    Keys live in an LRU-ordered dict: the least recently seen key is always at
+    the front, which lets the sweeper stop at the first active key and lets the
+    hard key cap evict the coldest client first.
+    """
+
+    def __init__(self, limit: int, window_seconds: float, max_keys: int):
+        self.limit = limit
+        self.window = window_seconds
+        self.max_keys = max_keys
+        self._entries: OrderedDict = OrderedDict()  # key -> [window_index, previous, current]
+        self._lock = threading.Lock()
+
+    def hit(self, key, cost: int = 1, now: float | None = None) -> float:
+        now = time.time() if now is None else now
+        window_index = int(now // self.window)
+        elapsed = (now % self.window) / self.window
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = [window_index, 0, 0]
+                self._entries[key] = entry
+                if len(self._entries) > self.max_keys:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+                if entry[0] != window_index:
+                    entry[1] = entry[2] if entry[0] == window_index - 1 else 0
+                    entry[2] = 0
+                    entry[0] = window_index
+
+            previous, current = entry[1], entry[2]
+            if previous * (1 - elapsed) + current + cost <= self.limit:
+                entry[2] = current + cost
+                return 0.0
+
+        return _retry_after(self.limit, self.window, previous, current, cost, elapsed)
+
+    def sweep(self, now: float | None = None) -> int:
+        """Evict keys idle for two full windows; their estimate has decayed to zero."""
+        now = time.time() if now is None else now
+        oldest_live = int(now // self.window) - 1
+        evicted = 0
+        with self._lock:
+            while self._entries:
+                key, entry = next(iter(self._entries.items()))
+                if entry[0] >= oldest_live:
+                    break
+                del self._entries[key]
+                evicted += 1
+        return evicted
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    Sliding-window counters shared by every process that opens the same file.
+
+    The store is a WAL-mode SQLite database with one row per (key, window), so
+    all uvicorn workers on a host, or containers sharing a volume, enforce one
+    quota without any external service.
+
+    Every write is a single conditional UPSERT. SQLite serializes writers, so
+    the check and the increment are atomic across processes. With
+    lease_size > 1 the increments are batched: a process claims a block of
+    tokens in one UPSERT and spends them locally, so it writes once per
+    lease_size requests instead of once per request. The global quota is
+    never exceeded. Tokens left in an unused lease are only wasted until the
+    window rolls over.
+
+    A call waits at most busy_timeout seconds for this process's connection
+    and again for the database's write lock, then raises BackendUnavailable.
+    """
+
+    blocking = True
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            key TEXT NOT NULL,
+            window INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (key, window)
+        ) WITHOUT ROWID
+    """
+
+    _CHECK_AND_INCREMENT = """
+        INSERT INTO rate_limits (key, window, count)
+        SELECT :key, :window, :cost
+        WHERE COALESCE((SELECT count FROM rate_limits WHERE key = :key AND window = :window - 1), 0) * :weight
+            + COALESCE((SELECT count FROM rate_limits WHERE key = :key AND window = :window), 0)
+            + :cost <= :limit
+        ON CONFLICT (key, window) DO UPDATE SET count = count + excluded.count
+    """
+
+    _READ_WINDOWS = """
+        SELECT window, count FROM rate_limits WHERE key = ? AND window IN (?, ?)
+    """
+
+    def __init__(self, path: str, limit: int, window_seconds: float, lease_size: int = 1, busy_timeout: float = 0.05):
+        self.path = path
+        self.limit = limit
+        self.window = window_seconds
+        self.lease_size = max(lease_size, 1)
+        self.busy_timeout = busy_timeout
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid = None
+        self._leases: dict = {}  # key -> [window_index, tokens left]
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must never cross a fork; reopen in each worker process.
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(self._SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+            self._leases.clear()
+        return self._conn
+
+    def _claim(self, conn, key, window_index: int, cost: int, elapsed: float) -> bool:
+        return conn.execute(self._CHECK_AND_INCREMENT, {
+            "key": key, "window": window_index, "cost": cost,
+            "weight": 1 - elapsed, "limit": self.limit
+        }).rowcount == 1
+
+    @contextmanager
+    def _locked(self):
+        # Threads queue here while another one waits on the database; bound
+        # that wait too, or a locked store would stack up every caller
+        if not self._lock.acquire(timeout=self.busy_timeout):
+            raise BackendUnavailable("rate limit store busy in this process")
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+    def hit(self, key, cost: int = 1, now: float | None = None) -> float:
+        now = time.time() if now is None else now
+        window_index = int(now // self.window)
+        elapsed = (now % self.window) / self.window
+
+        with self._locked():
+            lease = self._leases.get(key)
+            if lease is not None and lease[0] == window_index and lease[1] >= cost:
+                lease[1] -= cost
+                return 0.0
+
+            try:
+                conn = self._connection()
+                block = max(self.lease_size, cost)
+                if self._claim(conn, key, window_index, block, elapsed):
+                    self._leases[key] = [window_index, block - cost]
+                    return 0.0
+                # Not enough room for a whole block; the request alone may still fit
+                if block > cost and self._claim(conn, key, window_index, cost, elapsed):
+                    return 0.0
+
+                counts = dict(conn.execute(self._READ_WINDOWS, (key, window_index - 1, window_index)).fetchall())
+            except sqlite3.OperationalError as error:
+                raise BackendUnavailable(str(error)) from error
+
+        return _retry_after(
+            self.limit, self.window,
+            counts.get(window_index - 1, 0), counts.get(window_index, 0), cost, elapsed
+        )
+
+    def sweep(self, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        oldest_live = int(now // self.window) - 1
+        with self._locked():
+            self._leases = {key: lease for key, lease in self._leases.items() if lease[0] > oldest_live}
+            try:
+                return self._connection().execute("DELETE FROM rate_limits WHERE window < ?", (oldest_live,)).rowcount
+            except sqlite3.OperationalError as error:
+                raise BackendUnavailable(str(error)) from error
+
+    def reset(self):
+        with self._lock:
+            self._connection().execute("DELETE FROM rate_limits")
+            self._leases.clear()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -1,29 +1,177 @@
-import time
-from collections import defaultdict
-from fastapi import Request
+import asyncio
+import math
+from dataclasses import dataclass
+from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
+from app.core.config import (
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_REQUESTS,
+    RATE_LIMIT_TRACKING_REQUESTS,
+    RATE_LIMIT_AGENT_WRITE_REQUESTS,
+    RATE_LIMIT_ADMIN_REQUESTS,
+    RATE_LIMIT_WINDOW_SECONDS,
+    RATE_LIMIT_MAX_KEYS,
+    RATE_LIMIT_SWEEP_INTERVAL_SECONDS,
+    RATE_LIMIT_SQLITE_PATH,
+    RATE_LIMIT_LEASE_SIZE,
+    RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS
+)
+from app.core.dependencies import peek_identity
+from app.core.metrics import RATE_LIMIT_BACKEND_ERRORS, RATE_LIMIT_REJECTIONS
+from app.middleware.rate_limit_backends import BackendUnavailable, RateLimitBackend, SlidingWindowLimiter, SQLiteBackend
 
-# In-memory store: {ip: [timestamp, ...]}
-request_counts: dict = defaultdict(list)
 
-RATE_LIMIT = 60       # max requests
-WINDOW_SECONDS = 60   # per 60 seconds
+def create_backend(limit: int, window_seconds: float, name: str = RATE_LIMIT_BACKEND) -> RateLimitBackend:
+    if name == "memory":
+        return SlidingWindowLimiter(limit=limit, window_seconds=window_seconds, max_keys=RATE_LIMIT_MAX_KEYS)
+    if name == "sqlite":
+        return SQLiteBackend(
+            path=RATE_LIMIT_SQLITE_PATH,
+            limit=limit,
+            window_seconds=window_seconds,
+            lease_size=RATE_LIMIT_LEASE_SIZE,
+            busy_timeout=RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS / 1000
+        )
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{name}'. Choose: memory, sqlite")
+
+
+class Quota:
+    """A named budget of tokens per window. Every role/client pair gets its own bucket in it."""
+
+    def __init__(self, name: str, limit: int, window_seconds: float = RATE_LIMIT_WINDOW_SECONDS):
+        self.name = name
+        self.limit = limit
+        self.backend = create_backend(limit, window_seconds)
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    quota: Quota
+    cost: int = 1
+
+
+DEFAULT_QUOTA = Quota("default", RATE_LIMIT_REQUESTS)
+TRACKING_QUOTA = Quota("tracking", RATE_LIMIT_TRACKING_REQUESTS)
+AGENT_WRITE_QUOTA = Quota("agent_writes", RATE_LIMIT_AGENT_WRITE_REQUESTS)
+ADMIN_QUOTA = Quota("admin", RATE_LIMIT_ADMIN_REQUESTS)
+
+QUOTAS = [DEFAULT_QUOTA, TRACKING_QUOTA, AGENT_WRITE_QUOTA, ADMIN_QUOTA]
+
+DEFAULT_POLICY = RateLimitPolicy(DEFAULT_QUOTA)
+
+
+def rate_limit(quota: Quota = DEFAULT_QUOTA, cost: int = 1):
+    """Declare the quota an endpoint draws from and how many tokens one call costs."""
+    policy = RateLimitPolicy(quota, cost)
+
+    def decorator(endpoint):
+        endpoint.rate_limit_policy = policy
+        return endpoint
+    return decorator
+
+
+def rate_limit_exempt(endpoint):
+    """Keep an endpoint out of rate limiting entirely, e.g. for metric scrapes."""
+    endpoint.rate_limit_policy = None
+    return endpoint
+
+
+# id(route) -> policy, resolved once per route and then a single dict lookup.
+# Routes live as long as the app, so their ids are stable keys.
+_route_policies: dict = {}
+_UNRESOLVED = object()
 
 
-async def rate_limit_middleware(request: Request, call_next):
-    client_ip = request.client.host
-    now = time.time()
+def _policy_for(route) -> RateLimitPolicy | None:
+    policy = _route_policies.get(id(route), _UNRESOLVED)
+    if policy is _UNRESOLVED:
+        endpoint = getattr(route, "endpoint", None)
+        policy = _route_policies[id(route)] = getattr(endpoint, "rate_limit_policy", DEFAULT_POLICY)
+    return policy
 
-    # Keep only timestamps within the current window
-    request_counts[client_ip] = [
-        t for t in request_counts[client_ip] if now - t < WINDOW_SECONDS
-    ]
 
-    if len(request_counts[client_ip]) >= RATE_LIMIT:
+TOO_MANY_REQUESTS = "Too many requests. Please try again later."
+# Set in the request scope once a request has been charged, or exempted
+_CHARGED = "rate_limit_charged"
+
+
+async def _call(backend: RateLimitBackend, method, *args):
+    # Backends doing I/O must not hold up every other request on the loop
+    if backend.blocking:
+        return await asyncio.to_thread(method, *args)
+    return method(*args)
+
+
+async def _charge(request: Request, policy: RateLimitPolicy) -> float:
+    """Draw the policy's cost from the caller's bucket; 0 when allowed, else seconds to wait.
+
+    Fails open: when the backend cannot answer in time the request is allowed
+    and counted in rate_limit_backend_errors_total.
+    """
+    request.scope[_CHARGED] = True
+    identity = None
+    authorization = request.headers.get("authorization")
+    if authorization and authorization[:7].lower() == "bearer ":
+        identity = peek_identity(authorization[7:])
+    role, client = identity or ("anonymous", request.client.host)
+
+    backend = policy.quota.backend
+    try:
+        retry_after = await _call(backend, backend.hit, f"{policy.quota.name}:{role}:{client}", policy.cost)
+    except BackendUnavailable:
+        RATE_LIMIT_BACKEND_ERRORS.inc(policy.quota.name)
+        return 0.0
+    if retry_after:
+        RATE_LIMIT_REJECTIONS.inc(policy.quota.name)
+    return retry_after
+
+
+def _retry_headers(retry_after: float) -> dict:
+    return {"Retry-After": str(math.ceil(retry_after))}
+
+
+async def enforce_rate_limit(request: Request):
+    policy = _policy_for(request.scope.get("route"))
+    if policy is None:
+        request.scope[_CHARGED] = True
+        return
+    retry_after = await _charge(request, policy)
+    if retry_after:
+        raise HTTPException(status_code=429, detail=TOO_MANY_REQUESTS, headers=_retry_headers(retry_after))
+
+
+# The dependency above only runs for requests that reach a route. Unknown
+# paths (404) and wrong methods (405) never do, so they are charged to the
+# default quota here, once their response is known.
+async def limit_unrouted_requests(request: Request, call_next):
+    response = await call_next(request)
+    if request.scope.get(_CHARGED):
+        return response
+    retry_after = await _charge(request, DEFAULT_POLICY)
+    if retry_after:
         return JSONResponse(
             status_code=429,
-            content={"success": False, "error": "Too many requests. Please try again later."}
+            content={"success": False, "error": TOO_MANY_REQUESTS},
+            headers=_retry_headers(retry_after)
         )
+    return response
+
+
+async def sweep_idle_clients(interval: float = RATE_LIMIT_SWEEP_INTERVAL_SECONDS):
+    while True:
+        await asyncio.sleep(interval)
+        for quota in QUOTAS:
+            try:
+                await _call(quota.backend, quota.backend.sweep)
+            except BackendUnavailable:
+                RATE_LIMIT_BACKEND_ERRORS.inc(quota.name)
+
+
+def reset_rate_limits():
+    for quota in QUOTAS:
+        quota.backend.reset()
+
 
-    request_counts[client_ip].append(now)
-    return await call_next(request)
+def close_rate_limits():
+    for quota in QUOTAS:
+        quota.backend.close()
@@ -1,5 +1,5 @@
 # app/models/hub.py
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from app.core.database import Base
@@ -10,4 +10,8 @@ class Hub(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     hub_name = Column(String, nullable=False)
-    city = Column(String, nullable=False)
\ No newline at end of file
+    city = Column(String, nullable=False)
+    # Bumped by every update; GET /admin/hubs derives its ETag from the versions
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
\ No newline at end of file
@@ -1,13 +1,25 @@
-from sqlalchemy import Column, String, Text, Enum, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey, Index, TIMESTAMP
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.sqlite import DATETIME
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import uuid
 from app.core.database import Base
 
 
 class Shipment(Base):
     __tablename__ = "shipments"
+    # Built CONCURRENTLY by alembic/versions/0002_hot_query_indexes.py, 0004 and 0008
+    __table_args__ = (
+        Index("ix_shipments_customer_id_created_at_id", "customer_id", "created_at", "id"),
+        Index(
+            "ix_shipments_agent_id_status_created_at_id", "agent_id", "status", "created_at", "id",
+            postgresql_where=text("agent_id IS NOT NULL"),
+            sqlite_where=text("agent_id IS NOT NULL")
+        ),
+        Index("ix_shipments_status_created_at", "status", "created_at"),
+        Index("ix_shipments_created_at", "created_at")
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     tracking_number = Column(String, unique=True, nullable=False)
@@ -20,6 +32,28 @@ class Shipment(Base):
         default="created",
         nullable=False
     )
-    created_at = Column(TIMESTAMP, server_default=func.now())
+    # SQLite's CURRENT_TIMESTAMP has whole seconds; binding values in the same
+    # format keeps comparisons (list cursors, date filters) exact there
+    created_at = Column(
+        TIMESTAMP().with_variant(DATETIME(truncate_microseconds=True), "sqlite"),
+        server_default=func.now()
+    )
+    # Copy of the newest tracking event, written by the same transaction that
+    # inserts it (alembic/versions/0006 backfilled older rows), so tracking a
+    # shipment reads this row alone. NULL until the first event.
+    current_location = Column(String, nullable=True)
+    last_event_status = Column(String, nullable=True)
+    last_event_at = Column(TIMESTAMP, nullable=True)
+    # Set by every write, ORM or Core UPDATE; GET /agent/shipments?since= filters on it
+    updated_at = Column(
+        TIMESTAMP().with_variant(DATETIME(truncate_microseconds=True), "sqlite"),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+    # Bumped by every write; ORM updates and deletes only match the version they loaded
+    version = Column(Integer, nullable=False, server_default="1")
+
+    # created_at and updated_at come back in RETURNING, not a later SELECT
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
 
     tracking_updates = relationship("TrackingUpdate", back_populates="shipment", cascade="all, delete-orphan")
\ No newline at end of file
@@ -1,5 +1,5 @@
 # app/models/tracking.py
-from sqlalchemy import Column, String, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, String, ForeignKey, Index, TIMESTAMP
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -9,6 +9,12 @@ from app.core.database import Base
 
 class TrackingUpdate(Base):
     __tablename__ = "tracking_updates"
+    # Scanned backwards for the latest event of a shipment
+    __table_args__ = (
+        Index("ix_tracking_updates_shipment_id_updated_at", "shipment_id", "updated_at"),
+    )
+    # updated_at comes back in the INSERT's RETURNING clause, not a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     shipment_id = Column(UUID(as_uuid=True), ForeignKey("shipments.id"), nullable=False)
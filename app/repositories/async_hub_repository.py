@@ -0,0 +1,7 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.hub import Hub
+
+
+async def get_all_hubs(db: AsyncSession):
+    return (await db.scalars(select(Hub))).all()
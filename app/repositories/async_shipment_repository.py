@@ -0,0 +1,41 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.shipment import Shipment
+from app.repositories.shipment_repository import (
+    agent_shipments_statement,
+    customer_shipments_statement,
+    tracking_event_statement,
+    tracking_snapshots_statement,
+    transition_statement
+)
+from app.utils.constants import STATUS_TRANSITIONS
+
+
+async def get_shipment_by_tracking_number(db: AsyncSession, tracking_number: str) -> Shipment | None:
+    return await db.scalar(select(Shipment).where(Shipment.tracking_number == tracking_number))
+
+
+async def get_tracking_snapshots(db: AsyncSession, tracking_numbers: list[str]) -> list:
+    return (await db.execute(tracking_snapshots_statement(tracking_numbers))).all()
+
+
+async def get_shipment_by_id(db: AsyncSession, shipment_id) -> Shipment | None:
+    return await db.scalar(select(Shipment).where(Shipment.id == shipment_id))
+
+
+async def get_shipments_by_customer(db: AsyncSession, customer_id, limit: int, **filters) -> list[Shipment]:
+    return (await db.scalars(customer_shipments_statement(customer_id, limit, **filters))).all()
+
+
+async def get_shipments_by_agent(db: AsyncSession, agent_id, limit: int, **filters) -> list[Shipment]:
+    return (await db.scalars(agent_shipments_statement(agent_id, limit, **filters))).all()
+
+
+async def transition_shipment_status(db: AsyncSession, shipment_id, agent_id, status: str, location: str, version: int | None = None) -> Shipment | None:
+    if status not in STATUS_TRANSITIONS:
+        return None
+    return (await db.scalars(transition_statement(shipment_id, agent_id, status, location, version))).one_or_none()
+
+
+async def record_tracking_event(db: AsyncSession, shipment_id, agent_id, location: str, status: str):
+    return (await db.execute(tracking_event_statement(shipment_id, agent_id, location, status))).one_or_none()
@@ -0,0 +1,8 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.tracking import TrackingUpdate
+
+
+async def create_tracking_update(db: AsyncSession, tracking_data: dict) -> TrackingUpdate:
+    update = TrackingUpdate(**tracking_data)
+    db.add(update)
+    return update
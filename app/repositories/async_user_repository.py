@@ -0,0 +1,7 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> User:
+    return await db.scalar(select(User).where(User.email == email))
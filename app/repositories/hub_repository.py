@@ -6,8 +6,6 @@ from uuid import UUID
 def create_hub(db: Session, data: dict) -> Hub:
     hub = Hub(**data)
     db.add(hub)
-    db.commit()
-    db.refresh(hub)
     return hub
 
 
@@ -25,11 +23,8 @@ def update_hub(db: Session, hub: Hub, data: dict) -> Hub:
     for key, value in data.items():
         if value is not None:
             setattr(hub, key, value)
-    db.commit()
-    db.refresh(hub)
     return hub
 
 
 def delete_hub(db: Session, hub: Hub):
-    db.delete(hub)
-    db.commit()
\ No newline at end of file
+    db.delete(hub)
\ No newline at end of file
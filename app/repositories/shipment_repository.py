@@ -1,41 +1,140 @@
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from app.models.shipment import Shipment
+from app.utils.constants import STATUS_TRANSITIONS
 
 
 def create_shipment(db: Session, shipment_data: dict) -> Shipment:
     shipment = Shipment(**shipment_data)
     db.add(shipment)
-    db.commit()
-    db.refresh(shipment)
     return shipment
 
 
+# Core INSERT run with a list of rows: compiled once (and cached), then sent as
+# multi-row VALUES batches. Rows whose tracking number is taken are skipped.
+_INSERT_SHIPMENTS = {
+    name: dialect.insert(Shipment.__table__)
+    .on_conflict_do_nothing(index_elements=["tracking_number"])
+    .returning(Shipment.__table__.c.tracking_number)
+    for name, dialect in (("postgresql", postgresql), ("sqlite", sqlite))
+}
+
+
+def insert_shipments(db: Session, rows: list[dict]) -> list[str]:
+    """Insert many shipments; returns the tracking numbers that went in."""
+    return db.scalars(_INSERT_SHIPMENTS[db.get_bind().dialect.name], rows).all()
+
+
 def get_shipment_by_tracking_number(db: Session, tracking_number: str) -> Shipment | None:
     return db.query(Shipment).filter(Shipment.tracking_number == tracking_number).first()
 
 
+def tracking_snapshots_statement(tracking_numbers: list[str]):
+    # Only the columns a tracking response shows; no ORM objects to build
+    return select(Shipment.tracking_number, Shipment.status, Shipment.current_location, Shipment.version).where(
+        Shipment.tracking_number.in_(tracking_numbers)
+    )
+
+
+def get_tracking_snapshots(db: Session, tracking_numbers: list[str]) -> list:
+    """(tracking_number, status, current_location, version) rows for the numbers that exist, in no particular order."""
+    return db.execute(tracking_snapshots_statement(tracking_numbers)).all()
+
+
 def get_shipment_by_id(db: Session, shipment_id) -> Shipment | None:
     return db.query(Shipment).filter(Shipment.id == shipment_id).first()
 
 
-def get_all_shipments_by_customer(db: Session, customer_id):
-    return db.query(Shipment).filter(Shipment.customer_id == customer_id).all()
+# Bind the cursor with the column types, so SQLite compares it in the stored format
+KEYSET_TYPES = (Shipment.created_at.type, Shipment.id.type)
 
 
-def update_shipment_status(db: Session, shipment: Shipment, status: str) -> Shipment:
-    shipment.status = status
-    db.commit()
-    db.refresh(shipment)
-    return shipment
+def customer_shipments_statement(customer_id, limit: int, after=None, status=None, created_from=None, created_to=None):
+    """Newest first by (created_at, id); `after` is the (created_at, id) of the last row already seen."""
+    statement = select(Shipment).where(Shipment.customer_id == customer_id)
+    if after is not None:
+        statement = statement.where(tuple_(Shipment.created_at, Shipment.id) < tuple_(*after, types=KEYSET_TYPES))
+    if status is not None:
+        statement = statement.where(Shipment.status == status)
+    if created_from is not None:
+        statement = statement.where(Shipment.created_at >= created_from)
+    if created_to is not None:
+        statement = statement.where(Shipment.created_at < created_to)
+    return statement.order_by(Shipment.created_at.desc(), Shipment.id.desc()).limit(limit)
+
+
+def get_shipments_by_customer(db: Session, customer_id, limit: int, **filters) -> list[Shipment]:
+    return db.scalars(customer_shipments_statement(customer_id, limit, **filters)).all()
+
+
+def last_event_values(location: str, status: str) -> dict:
+    """SET clause copying a new tracking event onto its shipment; the event's updated_at is taken from RETURNING."""
+    return {
+        "current_location": location,
+        "last_event_status": status,
+        "last_event_at": func.now(),
+        "version": Shipment.version + 1
+    }
+
+
+def agent_shipments_statement(agent_id, limit: int, after=None, status=None, since=None):
+    """An agent's shipments, newest first by (created_at, id); `since` keeps those written at or after it."""
+    statement = select(Shipment).where(Shipment.agent_id == agent_id)
+    if after is not None:
+        statement = statement.where(tuple_(Shipment.created_at, Shipment.id) < tuple_(*after, types=KEYSET_TYPES))
+    if status is not None:
+        statement = statement.where(Shipment.status == status)
+    if since is not None:
+        statement = statement.where(Shipment.updated_at >= since)
+    return statement.order_by(Shipment.created_at.desc(), Shipment.id.desc()).limit(limit)
+
+
+def get_shipments_by_agent(db: Session, agent_id, limit: int, **filters) -> list[Shipment]:
+    return db.scalars(agent_shipments_statement(agent_id, limit, **filters)).all()
+
+
+def transition_statement(shipment_id, agent_id, status: str, location: str, version: int | None):
+    statement = (
+        update(Shipment)
+        .where(
+            Shipment.id == shipment_id,
+            Shipment.agent_id == agent_id,
+            Shipment.status == STATUS_TRANSITIONS[status]
+        )
+        .values(status=status, **last_event_values(location, status))
+        .returning(Shipment)
+    )
+    if version is not None:
+        statement = statement.where(Shipment.version == version)
+    return statement
+
+
+def transition_shipment_status(db: Session, shipment_id, agent_id, status: str, location: str, version: int | None = None) -> Shipment | None:
+    """Move a shipment to `status` in one conditional UPDATE; None if it is not assigned to `agent_id`, not in the preceding status or not at `version`."""
+    if status not in STATUS_TRANSITIONS:
+        return None
+    return db.scalars(transition_statement(shipment_id, agent_id, status, location, version)).one_or_none()
+
+
+def tracking_event_statement(shipment_id, agent_id, location: str, status: str):
+    return (
+        update(Shipment)
+        .where(Shipment.id == shipment_id, Shipment.agent_id == agent_id)
+        .values(**last_event_values(location, status))
+        .returning(Shipment.tracking_number, Shipment.last_event_at)
+    )
+
+
+def record_tracking_event(db: Session, shipment_id, agent_id, location: str, status: str):
+    """Copy an event onto a shipment assigned to `agent_id`; (tracking_number, last_event_at), or None if no such shipment."""
+    return db.execute(tracking_event_statement(shipment_id, agent_id, location, status)).one_or_none()
 
 
 def assign_agent_to_shipment(db: Session, shipment: Shipment, agent_id) -> Shipment:
     shipment.agent_id = agent_id
-    db.commit()
-    db.refresh(shipment)
     return shipment
 
 
 def delete_shipment(db: Session, shipment: Shipment):
-    db.delete(shipment)
-    db.commit()
\ No newline at end of file
+    db.delete(shipment)
\ No newline at end of file
@@ -5,8 +5,6 @@ from app.models.tracking import TrackingUpdate
 def create_tracking_update(db: Session, tracking_data: dict) -> TrackingUpdate:
     update = TrackingUpdate(**tracking_data)
     db.add(update)
-    db.commit()
-    db.refresh(update)
     return update
 
 
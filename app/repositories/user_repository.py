@@ -5,8 +5,6 @@ from app.models.user import User
 def create_user(db: Session, user_data: dict) -> User:
     user = User(**user_data)
     db.add(user)
-    db.commit()
-    db.refresh(user)
     return user
 
 
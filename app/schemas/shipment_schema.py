@@ -1,7 +1,8 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
+from app.core.config import SHIPMENTS_PAGE_SIZE, SHIPMENTS_MAX_PAGE_SIZE, TRACK_BATCH_MAX_SIZE
 
 
 class ShipmentCreate(BaseModel):
@@ -12,12 +13,28 @@ class ShipmentCreate(BaseModel):
 class ShipmentStatusUpdate(BaseModel):
     status: str
     location: str
+    version: Optional[int] = None  # when set, the update only applies at this shipment version
 
 
 class ShipmentAssignAgent(BaseModel):
     agent_id: UUID
 
 
+class ShipmentListQuery(BaseModel):
+    limit: int = Field(SHIPMENTS_PAGE_SIZE, ge=1, le=SHIPMENTS_MAX_PAGE_SIZE)
+    cursor: Optional[str] = None  # X-Next-Cursor of the previous page
+    status: Optional[str] = None
+    created_from: Optional[datetime] = None  # inclusive
+    created_to: Optional[datetime] = None  # exclusive
+
+
+class AgentShipmentListQuery(BaseModel):
+    limit: int = Field(SHIPMENTS_PAGE_SIZE, ge=1, le=SHIPMENTS_MAX_PAGE_SIZE)
+    cursor: Optional[str] = None  # X-Next-Cursor of the previous page
+    status: Optional[str] = None
+    since: Optional[datetime] = None  # inclusive; only shipments written at or after it
+
+
 class ShipmentResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: UUID
@@ -27,10 +44,39 @@ class ShipmentResponse(BaseModel):
     status: str
     agent_id: Optional[UUID] = None
     created_at: Optional[datetime]
+    updated_at: Optional[datetime] = None
+    version: int
+
+
+class BulkShipmentResult(BaseModel):
+    row: int  # position in the manifest, from 0
+    tracking_number: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkShipmentResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkShipmentResult]
 
 
 class ShipmentTrackResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     tracking_number: str
     status: str
-    current_location: Optional[str] = None
\ No newline at end of file
+    current_location: Optional[str] = None
+
+
+class ShipmentTrackBatchRequest(BaseModel):
+    tracking_numbers: List[str] = Field(min_length=1, max_length=TRACK_BATCH_MAX_SIZE)
+
+
+class ShipmentTrackBatchItem(BaseModel):
+    tracking_number: str
+    found: bool  # false for numbers that match no shipment; status and location are then null
+    status: Optional[str] = None
+    current_location: Optional[str] = None
+
+
+class ShipmentTrackBatchResponse(BaseModel):
+    results: List[ShipmentTrackBatchItem]  # in request order, one per requested number
\ No newline at end of file
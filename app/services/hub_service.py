@@ -1,35 +1,45 @@
-from datetime import date
+from datetime import date, datetime, time, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import cast, Date
 from fastapi import HTTPException
 from app.repositories.hub_repository import (
     create_hub, get_hub_by_id, update_hub, delete_hub, get_all_hubs
 )
+from app.repositories import async_hub_repository
 from app.repositories.user_repository import get_user_by_id
+from app.core.dependencies import invalidate_principal
+from app.services.unit_of_work import unit_of_work
 from app.models.user import User
 from app.models.shipment import Shipment
 
 
 def create_hub_service(db: Session, data: dict):
-    return create_hub(db, data)
+    with unit_of_work(db):
+        return create_hub(db, data)
 
 
 def get_all_hubs_service(db: Session):
     return get_all_hubs(db)
 
 
+async def get_all_hubs_service_async(db: AsyncSession):
+    return await async_hub_repository.get_all_hubs(db)
+
+
 def update_hub_service(db: Session, hub_id, data: dict):
     hub = get_hub_by_id(db, hub_id)
     if not hub:
         raise HTTPException(status_code=404, detail="Hub not found")
-    return update_hub(db, hub, data)
+    with unit_of_work(db):
+        return update_hub(db, hub, data)
 
 
 def delete_hub_service(db: Session, hub_id):
     hub = get_hub_by_id(db, hub_id)
     if not hub:
         raise HTTPException(status_code=404, detail="Hub not found")
-    delete_hub(db, hub)
+    with unit_of_work(db):
+        delete_hub(db, hub)
     return {"message": "Hub deleted successfully"}
 
 
@@ -41,15 +51,18 @@ def delete_user_service(db: Session, user_id):
     user = get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    db.delete(user)
-    db.commit()
+    with unit_of_work(db):
+        db.delete(user)
+    invalidate_principal(user_id)
     return {"message": "User deleted successfully"}
 
 
 def get_reports_service(db: Session):
-    today = date.today()
+    # A range on created_at rather than a cast, so the created_at index applies
+    today = datetime.combine(date.today(), time.min)
     total_today = db.query(Shipment).filter(
-        cast(Shipment.created_at, Date) == today
+        Shipment.created_at >= today,
+        Shipment.created_at < today + timedelta(days=1)
     ).count()
     delivered = db.query(Shipment).filter(
         Shipment.status == "delivered"
@@ -1,77 +1,346 @@
 # app/services/shipment_service.py
-import uuid
+import json
+import time
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.core.config import BULK_SHIPMENTS_MAX_ROWS, BULK_SHIPMENTS_CHUNK_SIZE
+from app.core.replica import on_replica
 from app.repositories.shipment_repository import (
     create_shipment,
+    insert_shipments,
     get_shipment_by_tracking_number,
+    get_tracking_snapshots,
     get_shipment_by_id,
-    get_all_shipments_by_customer,
-    update_shipment_status,
+    get_shipments_by_customer,
+    get_shipments_by_agent,
+    transition_shipment_status,
     assign_agent_to_shipment,
     delete_shipment
 )
-from app.repositories.tracking_repository import get_latest_tracking, create_tracking_update
+from app.repositories.tracking_repository import create_tracking_update
+from app.repositories import async_shipment_repository, async_tracking_repository
 from app.repositories.user_repository import get_user_by_id
+from app.schemas.shipment_schema import ShipmentCreate
+from app.services import tracking_cache
+from app.services.unit_of_work import unit_of_work, async_unit_of_work
 from app.utils.constants import SHIPMENT_STATUSES
+from app.utils import tracking_numbers
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+TRACKING_NUMBER_ATTEMPTS = 3
+_NOT_JSON = object()
+
+
+def _new_tracking_number() -> str:
+    return tracking_numbers.generator.generate()
+
+
+def _tracking_numbers(count: int) -> list[str]:
+    return tracking_numbers.generator.generate_batch(count)
 
 
 def create_new_shipment(db: Session, data: dict, customer_id):
-    tracking_number = "TRK" + uuid.uuid4().hex[:8].upper()
     shipment_data = {
-        "tracking_number": tracking_number,
+        "tracking_number": _new_tracking_number(),
         "customer_id": customer_id,
         "source_address": data["source_address"],
         "destination_address": data["destination_address"],
         "status": "created"
     }
-    return create_shipment(db, shipment_data)
+    with unit_of_work(db):
+        return create_shipment(db, shipment_data)
 
 
-def track_shipment(db: Session, tracking_number: str):
-    shipment = get_shipment_by_tracking_number(db, tracking_number)
+def parse_manifest(body: bytes, content_type: str) -> list:
+    """Rows of a bulk upload: a JSON array, or NDJSON (one object per line) when the content type says so."""
+    if content_type.split(";")[0].strip().lower() in NDJSON_TYPES:
+        rows = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(_NOT_JSON)  # reported against its row, the other lines still go in
+    else:
+        try:
+            rows = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Manifest is not valid JSON")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Manifest must be a JSON array of shipments")
+
+    if len(rows) > BULK_SHIPMENTS_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Manifest has {len(rows)} rows; split it into uploads of at most {BULK_SHIPMENTS_MAX_ROWS}"
+        )
+    return rows
+
+
+def _manifest_row(row, customer_id) -> dict | str:
+    """INSERT values for a manifest row, or why it was rejected."""
+    if row is _NOT_JSON:
+        return "Line is not valid JSON"
+    try:
+        data = ShipmentCreate.model_validate(row)
+    except ValidationError as error:
+        first = error.errors()[0]
+        return f"{'.'.join(str(part) for part in first['loc']) or 'row'}: {first['msg']}"
+    return {
+        "customer_id": customer_id,
+        "source_address": data.source_address,
+        "destination_address": data.destination_address,
+        "status": "created"
+    }
+
+
+def _insert_chunk(db: Session, chunk: list[tuple[int, dict]], results: list[dict]):
+    # Numbers are only unique per node. A row that drew one already in use
+    # (two workers pinned to the same TRACKING_NODE_ID) is skipped by the
+    # INSERT and goes again with a fresh number
+    for _ in range(TRACKING_NUMBER_ATTEMPTS):
+        for (_, values), number in zip(chunk, _tracking_numbers(len(chunk))):
+            values["tracking_number"] = number
+        inserted = set(insert_shipments(db, [values for _, values in chunk]))
+        for index, values in chunk:
+            if values["tracking_number"] in inserted:
+                results[index]["tracking_number"] = values["tracking_number"]
+        chunk = [(index, values) for index, values in chunk if values["tracking_number"] not in inserted]
+        if not chunk:
+            return
+    for index, _ in chunk:
+        results[index]["error"] = "Could not allocate a unique tracking number"
+
+
+def create_bulk_shipments(db: Session, rows: list, customer_id) -> dict:
+    """Validate every row first, then insert the valid ones in chunks, all in one transaction."""
+    results = [{"row": index} for index in range(len(rows))]
+    valid = []
+    for index, row in enumerate(rows):
+        values = _manifest_row(row, customer_id)
+        if isinstance(values, str):
+            results[index]["error"] = values
+        else:
+            valid.append((index, values))
+
+    with unit_of_work(db):
+        for start in range(0, len(valid), BULK_SHIPMENTS_CHUNK_SIZE):
+            _insert_chunk(db, valid[start:start + BULK_SHIPMENTS_CHUNK_SIZE], results)
+
+    created = sum(1 for result in results if "tracking_number" in result)
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+
+def _track_response(shipment) -> dict:
     if not shipment:
         raise HTTPException(status_code=404, detail="Shipment not found")
-
-    latest = get_latest_tracking(db, shipment.id)
     return {
         "tracking_number": shipment.tracking_number,
         "status": shipment.status,
-        "current_location": latest.location if latest else None
+        "current_location": shipment.current_location,
+        "version": shipment.version  # for the ETag; not part of the response body
     }
 
 
-def get_my_shipments(db: Session, customer_id):
-    return get_all_shipments_by_customer(db, customer_id)
+def _check_tracking_number(tracking_number: str):
+    # A typo in a current-format number is caught by its check character,
+    # without a lookup
+    if tracking_numbers.is_mistyped(tracking_number):
+        raise HTTPException(status_code=400, detail="Invalid tracking number: check character does not match")
 
 
-def update_status_service(db: Session, shipment_id, data: dict, current_user):
-    shipment = get_shipment_by_id(db, shipment_id)
-    if not shipment:
-        raise HTTPException(status_code=404, detail="Shipment not found")
+# Read-through: a cached snapshot costs no query; a miss is one point read by
+# tracking number (the shipment row carries its latest location). Only reads
+# from the primary fill the cache: a replica that has not replayed a write yet
+# would put back the snapshot the write just invalidated, for a whole TTL.
+def track_shipment(db: Session, tracking_number: str):
+    _check_tracking_number(tracking_number)
+    started = time.perf_counter()
+    snapshot, epoch = tracking_cache.lookup(tracking_number)
+    if snapshot is None:
+        snapshot = _track_response(get_shipment_by_tracking_number(db, tracking_number))
+        tracking_cache.store(tracking_number, snapshot, epoch, started, fill=not on_replica(db))
+    return snapshot
+
+
+async def track_shipment_async(db: AsyncSession, tracking_number: str):
+    _check_tracking_number(tracking_number)
+    started = time.perf_counter()
+    snapshot, epoch = tracking_cache.lookup(tracking_number)
+    if snapshot is None:
+        shipment = await async_shipment_repository.get_shipment_by_tracking_number(db, tracking_number)
+        snapshot = _track_response(shipment)
+        tracking_cache.store(tracking_number, snapshot, epoch, started, fill=not on_replica(db))
+    return snapshot
+
+
+def _batch_lookup(numbers: list[str]) -> tuple[dict, list, int]:
+    """Cached snapshots, the distinct numbers still to query, and the epoch to store them under.
+
+    Numbers failing their check character cannot match a shipment, so they
+    are neither looked up nor queried.
+    """
+    distinct = [number for number in dict.fromkeys(numbers) if not tracking_numbers.is_mistyped(number)]
+    snapshots, epoch = tracking_cache.lookup_many(distinct)
+    return snapshots, [number for number in distinct if number not in snapshots], epoch
 
-    if str(shipment.agent_id) != str(current_user.id):
-        raise HTTPException(status_code=403, detail="You are not assigned to this shipment")
 
+def _batch_response(numbers: list[str], snapshots: dict) -> dict:
+    return {"results": [
+        {**snapshots[number], "found": True} if number in snapshots else {"tracking_number": number, "found": False}
+        for number in numbers
+    ]}
+
+
+# Every number the cache cannot answer is resolved by one IN query; the
+# shipment row carries its current location, so no event lookup follows
+def track_shipments(db: Session, numbers: list[str]) -> dict:
+    snapshots, missing, epoch = _batch_lookup(numbers)
+    if missing:
+        found = {row.tracking_number: _track_response(row) for row in get_tracking_snapshots(db, missing)}
+        if not on_replica(db):
+            tracking_cache.store_many(found, epoch)
+        snapshots.update(found)
+    return _batch_response(numbers, snapshots)
+
+
+async def track_shipments_async(db: AsyncSession, numbers: list[str]) -> dict:
+    snapshots, missing, epoch = _batch_lookup(numbers)
+    if missing:
+        rows = await async_shipment_repository.get_tracking_snapshots(db, missing)
+        found = {row.tracking_number: _track_response(row) for row in rows}
+        if not on_replica(db):
+            tracking_cache.store_many(found, epoch)
+        snapshots.update(found)
+    return _batch_response(numbers, snapshots)
+
+
+def _page_filters(query: dict, *fields: str) -> dict:
+    """Repository filters for a list query: status, cursor, and `fields` passed through as they are."""
+    if query["status"] is not None and query["status"] not in SHIPMENT_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Choose from: {SHIPMENT_STATUSES}")
+    filters = {"status": query["status"], **{field: query[field] for field in fields}}
+    if query["cursor"]:
+        try:
+            filters["after"] = decode_cursor(query["cursor"])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return filters
+
+
+def _page(shipments: list, limit: int) -> tuple[list, str | None]:
+    """The page and the cursor of the next one. One row past the page is fetched to know whether there is a next page."""
+    if len(shipments) <= limit:
+        return shipments, None
+    last = shipments[limit - 1]
+    return shipments[:limit], encode_cursor(last.created_at, last.id)
+
+
+def get_my_shipments(db: Session, customer_id, query: dict):
+    filters = _page_filters(query, "created_from", "created_to")
+    shipments = get_shipments_by_customer(db, customer_id, query["limit"] + 1, **filters)
+    return _page(shipments, query["limit"])
+
+
+async def get_my_shipments_async(db: AsyncSession, customer_id, query: dict):
+    filters = _page_filters(query, "created_from", "created_to")
+    shipments = await async_shipment_repository.get_shipments_by_customer(db, customer_id, query["limit"] + 1, **filters)
+    return _page(shipments, query["limit"])
+
+
+def get_agent_shipments(db: Session, agent_id, query: dict):
+    shipments = get_shipments_by_agent(db, agent_id, query["limit"] + 1, **_page_filters(query, "since"))
+    return _page(shipments, query["limit"])
+
+
+async def get_agent_shipments_async(db: AsyncSession, agent_id, query: dict):
+    filters = _page_filters(query, "since")
+    shipments = await async_shipment_repository.get_shipments_by_agent(db, agent_id, query["limit"] + 1, **filters)
+    return _page(shipments, query["limit"])
+
+
+def _check_status(data: dict):
     if data["status"] not in SHIPMENT_STATUSES:
         raise HTTPException(status_code=400, detail=f"Invalid status. Choose from: {SHIPMENT_STATUSES}")
 
+
+def _transition_error(shipment, data: dict, current_user) -> HTTPException:
+    """Why a conditional status update matched no row."""
+    if not shipment:
+        return HTTPException(status_code=404, detail="Shipment not found")
+
+    if str(shipment.agent_id) != str(current_user.id):
+        return HTTPException(status_code=403, detail="You are not assigned to this shipment")
+
+    if data.get("version") is not None and data["version"] != shipment.version:
+        return HTTPException(
+            status_code=409,
+            detail=f"Shipment is at version {shipment.version}, not {data['version']}"
+        )
+    if data["status"] == shipment.status:
+        return HTTPException(
+            status_code=409,
+            detail=f"Shipment is already '{shipment.status}'; another update got there first or this one was already applied"
+        )
     current_index = SHIPMENT_STATUSES.index(shipment.status)
-    new_index = SHIPMENT_STATUSES.index(data["status"])
-    if new_index != current_index + 1:
-        raise HTTPException(
+    if SHIPMENT_STATUSES.index(data["status"]) != current_index + 1:
+        next_allowed = SHIPMENT_STATUSES[current_index + 1:current_index + 2]
+        return HTTPException(
             status_code=400,
-            detail=f"Invalid transition. Current status is '{shipment.status}'. Next allowed: '{SHIPMENT_STATUSES[current_index + 1]}'"
+            detail=f"Invalid transition. Current status is '{shipment.status}'. "
+                   + (f"Next allowed: '{next_allowed[0]}'" if next_allowed else "No further status allowed")
         )
+    # Changed between the UPDATE and this read
+    return HTTPException(status_code=409, detail="Shipment was modified concurrently; retry the update")
 
-    updated = update_shipment_status(db, shipment, data["status"])
 
-    create_tracking_update(db, {
-        "shipment_id": shipment_id,
-        "location": data["location"],
-        "status": data["status"]
-    })
+# The transition is one conditional UPDATE, so concurrent updates cannot both
+# pass the check. The shipment is only read when the UPDATE matched nothing,
+# to report why.
+def update_status_service(db: Session, shipment_id, data: dict, current_user):
+    _check_status(data)
+
+    # The status and its history entry commit together or not at all
+    with unit_of_work(db):
+        updated = transition_shipment_status(
+            db, shipment_id, current_user.id, data["status"], data["location"], data.get("version")
+        )
+        if updated is None:
+            raise _transition_error(get_shipment_by_id(db, shipment_id), data, current_user)
+        create_tracking_update(db, {
+            "shipment_id": shipment_id,
+            "location": data["location"],
+            "status": data["status"],
+            "updated_at": updated.last_event_at
+        })
+
+    tracking_cache.invalidate(updated.tracking_number)
+    return updated
+
+
+async def update_status_service_async(db: AsyncSession, shipment_id, data: dict, current_user):
+    _check_status(data)
+
+    async with async_unit_of_work(db):
+        updated = await async_shipment_repository.transition_shipment_status(
+            db, shipment_id, current_user.id, data["status"], data["location"], data.get("version")
+        )
+        if updated is None:
+            shipment = await async_shipment_repository.get_shipment_by_id(db, shipment_id)
+            raise _transition_error(shipment, data, current_user)
+        await async_tracking_repository.create_tracking_update(db, {
+            "shipment_id": shipment_id,
+            "location": data["location"],
+            "status": data["status"],
+            "updated_at": updated.last_event_at
+        })
 
+    tracking_cache.invalidate(updated.tracking_number)
     return updated
 
 
@@ -84,7 +353,10 @@ def assign_agent_service(db: Session, shipment_id, agent_id, current_user):
     if not agent or agent.role != "agent":
         raise HTTPException(status_code=400, detail="Invalid agent ID or user is not an agent")
 
-    return assign_agent_to_shipment(db, shipment, agent_id)
+    with unit_of_work(db):
+        assigned = assign_agent_to_shipment(db, shipment, agent_id)
+    tracking_cache.invalidate(shipment.tracking_number)
+    return assigned
 
 
 def cancel_shipment(db: Session, shipment_id, customer_id):
@@ -98,5 +370,7 @@ def cancel_shipment(db: Session, shipment_id, customer_id):
     if shipment.status != "created":
         raise HTTPException(status_code=400, detail="Cannot cancel a shipment that is already dispatched")
 
-    delete_shipment(db, shipment)
+    with unit_of_work(db):
+        delete_shipment(db, shipment)
+    tracking_cache.invalidate(shipment.tracking_number)
     return {"message": "Shipment cancelled successfully"}
\ No newline at end of file
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+from app.core.cache import TTLCache
+from app.core.config import TRACKING_CACHE_TTL_SECONDS, TRACKING_CACHE_MAX_ENTRIES
+from app.core.metrics import TRACKING_CACHE_LOOKUPS, TRACKING_LOOKUP_DURATION
+
+# Tracking snapshots ({tracking_number, status, current_location, version}) keyed by
+# tracking number. Every write that can change what a lookup returns calls
+# invalidate() once its transaction has committed. Misses are not cached, so a
+# new shipment is trackable straight away.
+snapshot_cache = TTLCache(maxsize=TRACKING_CACHE_MAX_ENTRIES, ttl=TRACKING_CACHE_TTL_SECONDS)
+
+# A lookup that read the database while a write committed could otherwise put
+# the pre-write snapshot back after the write dropped it. Every invalidation
+# advances _epoch and stamps its tracking number with it; store() skips a
+# number stamped after its lookup() and still fills every other number. Only
+# the latest TRACKING_CACHE_MAX_ENTRIES stamps are kept, and a number whose
+# stamp was dropped counts as invalidated when it was dropped.
+_epoch = 0
+_invalidated: OrderedDict = OrderedDict()  # tracking number -> epoch, oldest first
+_dropped_epoch = 0
+_epoch_lock = threading.Lock()
+
+
+def _invalidated_since(tracking_number: str, epoch: int) -> bool:
+    return _invalidated.get(tracking_number, _dropped_epoch) > epoch
+
+
+def lookup(tracking_number: str) -> tuple[dict | None, int]:
+    """The cached snapshot, or None, and the epoch to hand to store() on a miss."""
+    started = time.perf_counter()
+    epoch = _epoch
+    snapshot = snapshot_cache.get(tracking_number)
+    if snapshot is None:
+        TRACKING_CACHE_LOOKUPS.inc("miss")
+    else:
+        TRACKING_CACHE_LOOKUPS.inc("hit")
+        TRACKING_LOOKUP_DURATION.observe(time.perf_counter() - started, "cache")
+    return snapshot, epoch
+
+
+def store(tracking_number: str, snapshot: dict, epoch: int, started: float, fill: bool = True):
+    """Record the database lookup's latency and, when `fill`, cache its snapshot."""
+    TRACKING_LOOKUP_DURATION.observe(time.perf_counter() - started, "database")
+    if not fill:
+        return
+    with _epoch_lock:
+        if not _invalidated_since(tracking_number, epoch):
+            snapshot_cache.set(tracking_number, snapshot)
+
+
+# Batch lookups count hits and misses like single ones; the latency histogram
+# only covers single lookups, where one observation is one request.
+def lookup_many(tracking_numbers) -> tuple[dict, int]:
+    """Cached snapshots of those `tracking_numbers` that have one, and the epoch to hand to store_many()."""
+    epoch = _epoch
+    snapshots = {}
+    for tracking_number in tracking_numbers:
+        snapshot = snapshot_cache.get(tracking_number)
+        if snapshot is None:
+            TRACKING_CACHE_LOOKUPS.inc("miss")
+        else:
+            TRACKING_CACHE_LOOKUPS.inc("hit")
+            snapshots[tracking_number] = snapshot
+    return snapshots, epoch
+
+
+def store_many(snapshots: dict, epoch: int):
+    with _epoch_lock:
+        for tracking_number, snapshot in snapshots.items():
+            if not _invalidated_since(tracking_number, epoch):
+                snapshot_cache.set(tracking_number, snapshot)
+
+
+def invalidate(tracking_number: str):
+    global _epoch, _dropped_epoch
+    with _epoch_lock:
+        _epoch += 1
+        _invalidated[tracking_number] = _epoch
+        _invalidated.move_to_end(tracking_number)
+        while len(_invalidated) > TRACKING_CACHE_MAX_ENTRIES:
+            _, _dropped_epoch = _invalidated.popitem(last=False)
+    snapshot_cache.pop(tracking_number)
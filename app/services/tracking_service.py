@@ -1,20 +1,53 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-from app.repositories.shipment_repository import get_shipment_by_id
+from app.repositories.shipment_repository import get_shipment_by_id, record_tracking_event
 from app.repositories.tracking_repository import create_tracking_update
+from app.repositories import async_shipment_repository, async_tracking_repository
+from app.services import tracking_cache
+from app.services.unit_of_work import unit_of_work, async_unit_of_work
 
 
-def add_tracking_update(db: Session, shipment_id, data: dict, current_user):
-    shipment = get_shipment_by_id(db, shipment_id)
+def _event_error(shipment, current_user) -> HTTPException:
+    """Why recording an event matched no shipment."""
     if not shipment:
-        raise HTTPException(status_code=404, detail="Shipment not found")
-
+        return HTTPException(status_code=404, detail="Shipment not found")
     if str(shipment.agent_id) != str(current_user.id):
-        raise HTTPException(status_code=403, detail="You are not assigned to this shipment")
+        return HTTPException(status_code=403, detail="You are not assigned to this shipment")
+    # Reassigned between the UPDATE and this read
+    return HTTPException(status_code=409, detail="Shipment was modified concurrently; retry the update")
 
-    tracking_data = {
+
+def _tracking_data(shipment_id, data: dict, event) -> dict:
+    return {
         "shipment_id": shipment_id,
         "location": data["location"],
-        "status": data["status"]
+        "status": data["status"],
+        "updated_at": event.last_event_at
     }
-    return create_tracking_update(db, tracking_data)
\ No newline at end of file
+
+
+# The shipment's last-event columns and the history row commit together. The
+# UPDATE also checks the assignment, so the shipment is only read when it
+# matched nothing, to report why.
+def add_tracking_update(db: Session, shipment_id, data: dict, current_user):
+    with unit_of_work(db):
+        event = record_tracking_event(db, shipment_id, current_user.id, data["location"], data["status"])
+        if event is None:
+            raise _event_error(get_shipment_by_id(db, shipment_id), current_user)
+        update = create_tracking_update(db, _tracking_data(shipment_id, data, event))
+    tracking_cache.invalidate(event.tracking_number)
+    return update
+
+
+async def add_tracking_update_async(db: AsyncSession, shipment_id, data: dict, current_user):
+    async with async_unit_of_work(db):
+        event = await async_shipment_repository.record_tracking_event(
+            db, shipment_id, current_user.id, data["location"], data["status"]
+        )
+        if event is None:
+            shipment = await async_shipment_repository.get_shipment_by_id(db, shipment_id)
+            raise _event_error(shipment, current_user)
+        update = await async_tracking_repository.create_tracking_update(db, _tracking_data(shipment_id, data, event))
+    tracking_cache.invalidate(event.tracking_number)
+    return update
\ No newline at end of file
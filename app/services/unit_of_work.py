@@ -0,0 +1,40 @@
+from contextlib import asynccontextmanager, contextmanager
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+
+# Flushing a versioned row (shipments) that another request changed since it
+# was loaded raises StaleDataError
+def _conflict() -> HTTPException:
+    return HTTPException(status_code=409, detail="The record was changed by another request; reload it and retry")
+
+
+# Repositories only stage changes on the session. A service wraps all the
+# writes of one request in a unit of work, which commits them together in a
+# single transaction, or rolls all of them back if the block raises.
+@contextmanager
+def unit_of_work(db: Session):
+    try:
+        yield db
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise _conflict()
+    except BaseException:
+        db.rollback()
+        raise
+
+
+@asynccontextmanager
+async def async_unit_of_work(db: AsyncSession):
+    try:
+        yield db
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise _conflict()
+    except BaseException:
+        await db.rollback()
+        raise
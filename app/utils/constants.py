@@ -1,2 +1,4 @@
 SHIPMENT_STATUSES = ["created", "in_transit", "out_for_delivery", "delivered"]
+# Status a shipment must be in to move to each status; "created" is never a target
+STATUS_TRANSITIONS = dict(zip(SHIPMENT_STATUSES[1:], SHIPMENT_STATUSES))
 USER_ROLES = ["customer", "agent", "admin"]
\ No newline at end of file
@@ -0,0 +1,41 @@
+import hashlib
+from fastapi import Request, Response
+
+
+# Weak validators built from row versions, so a tag never needs the response
+# body: a 304 skips serialization as well as the transfer.
+def version_tag(version: int) -> str:
+    return f'W/"{version}"'
+
+
+def rows_tag(rows) -> str:
+    """Tag of a list of versioned rows; changes when a row is added, removed, reordered or bumped."""
+    digest = hashlib.blake2b(digest_size=12)
+    for row in rows:
+        digest.update(f"{row.id}:{row.version};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def matches(if_none_match: str | None, tag: str) -> bool:
+    """Weak comparison of `tag` against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = tag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def conditional(request: Request, response: Response, tag: str, body):
+    """`body` with an ETag header, or an empty 304 when the client already holds `tag`.
+
+    The 304 keeps the headers the endpoint set on `response`, e.g. the next
+    page's X-Next-Cursor.
+    """
+    if matches(request.headers.get("if-none-match"), tag):
+        not_modified = Response(status_code=304)
+        not_modified.raw_headers = list(response.raw_headers)  # repeated headers such as Set-Cookie too
+        not_modified.headers["ETag"] = tag
+        return not_modified
+    response.headers["ETag"] = tag
+    return body
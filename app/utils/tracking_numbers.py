@@ -0,0 +1,126 @@
+import logging
+import random
+import re
+import threading
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger("logistics_logger")
+
+# Tracking numbers are "TRK", 13 base-36 digits and a check character, e.g.
+# TRK00SRFPAXUENEO0. The digits are a 63-bit id, most significant part first:
+#   41 bits  milliseconds since EPOCH_MS (good until 2095)
+#   10 bits  node: one per running worker, so workers never draw the same id
+#   12 bits  sequence within the millisecond on that node
+# Fixed-width digits sort like the ids, so new numbers land at the right edge
+# of the unique index instead of on random pages. Numbers issued before this
+# format (TRK + 8 hex) stay valid; they just do not carry a check character.
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_VALUES = {char: value for value, char in enumerate(ALPHABET)}
+PREFIX = "TRK"
+DIGITS = 13
+EPOCH_MS = 1767225600000  # 2026-01-01T00:00:00Z
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+NODES = 1 << NODE_BITS
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+_CURRENT = re.compile(rf"{PREFIX}[0-9A-Z]{{{DIGITS + 1}}}")
+
+
+def check_character(digits: str) -> str:
+    """ISO 7064 MOD 37,36: catches any single wrong character and most swaps of two neighbours.
+
+    A hybrid scheme like this one misses a swap of two characters with
+    consecutive values now and then (TRKIJ... for TRKJI...), about 1 in 500
+    of random swaps. Only a pure scheme with an extra check symbol catches
+    them all.
+    """
+    product = 36
+    for char in digits:
+        total = (product + _VALUES[char]) % 36 or 36
+        product = total * 2 % 37
+    return ALPHABET[(37 - product) % 36]
+
+
+def encode(value: int) -> str:
+    digits = []
+    for _ in range(DIGITS):
+        value, digit = divmod(value, 36)
+        digits.append(ALPHABET[digit])
+    body = "".join(reversed(digits))
+    return PREFIX + body + check_character(body)
+
+
+def is_mistyped(tracking_number: str) -> bool:
+    """True for a number in the current format whose check character does not match.
+
+    Anything else, including the older TRK + 8 hex numbers, still has to be
+    looked up.
+    """
+    if not _CURRENT.fullmatch(tracking_number):
+        return False
+    body = tracking_number[len(PREFIX):-1]
+    return check_character(body) != tracking_number[-1]
+
+
+class TrackingNumberGenerator:
+    def __init__(self, node: int, clock=time.time):
+        if not 0 <= node < NODES:
+            raise ValueError(f"Tracking node must be in 0..{NODES - 1}, got {node}")
+        self.node = node
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._sequence = 0
+
+    def _next_id(self) -> int:
+        now_ms = int(self._clock() * 1000) - EPOCH_MS
+        if now_ms > self._last_ms:
+            self._last_ms, self._sequence = now_ms, 0
+        elif self._sequence < MAX_SEQUENCE:
+            self._sequence += 1
+        else:
+            # Sequence used up (or the clock went back): borrow the next
+            # millisecond rather than wait for it
+            self._last_ms, self._sequence = self._last_ms + 1, 0
+        return (self._last_ms << (NODE_BITS + SEQUENCE_BITS)) | (self.node << SEQUENCE_BITS) | self._sequence
+
+    def generate(self) -> str:
+        with self._lock:
+            return encode(self._next_id())
+
+    def generate_batch(self, count: int) -> list[str]:
+        with self._lock:
+            ids = [self._next_id() for _ in range(count)]
+        return [encode(value) for value in ids]
+
+
+# Until the worker leases a node at startup it draws a random one
+generator = TrackingNumberGenerator(random.randrange(NODES))
+
+
+def configure_node(node: int, nodes: range = range(NODES)):
+    global generator
+    if node not in nodes:
+        raise ValueError(f"Tracking node {node} is outside this deployment's range {nodes.start}-{nodes.stop - 1}")
+    generator = TrackingNumberGenerator(node)
+
+
+def lease_node(engine, nodes: range = range(NODES)) -> int:
+    """A node in `nodes` for this worker from the tracking_node_ids sequence; random off PostgreSQL.
+
+    Each worker that starts takes the next value, so live workers only share a
+    node after len(nodes) further workers have started while the first still
+    runs. The sequence is per database; deployments issuing numbers from
+    different databases only stay apart through their disjoint ranges.
+    """
+    if engine.dialect.name != "postgresql":
+        return random.choice(nodes)
+    try:
+        with engine.connect() as conn:
+            return nodes[conn.execute(text("SELECT nextval('tracking_node_ids')")).scalar() % len(nodes)]
+    except DBAPIError:
+        logger.warning("tracking_node_ids sequence missing; using a random tracking node")
+        return random.choice(nodes)
@@ -0,0 +1,86 @@
+"""
+Sync vs async data path under many concurrent clients.
+
+Opens N concurrent keep-alive clients that hammer GET /shipments/{tracking_number}
+for a fixed time, for each N in --levels, and reports requests per second,
+latency percentiles and errors. Run it once against a server started normally
+(sync routes on the thread pool) and once with DB_ASYNC=true:
+
+    uvicorn app.main:app --port 8000
+    DB_ASYNC=true uvicorn app.main:app --port 8000
+    python benchmarks/async_concurrency.py --url http://localhost:8000 --levels 50,200,1000 --seconds 10
+
+Raise the RATE_LIMIT_* quotas on the server first, or most requests get 429.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def setup(client, email, password):
+    await client.post("/auth/register", json={"email": email, "password": password, "role": "customer"})
+    login = await client.post("/auth/login", data={"username": email, "password": password})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    shipment = await client.post(
+        "/shipments/",
+        headers=headers,
+        json={"source_address": "Chennai", "destination_address": "Bangalore"}
+    )
+    return headers, shipment.json()["tracking_number"]
+
+
+async def run_level(url, headers, tracking_number, concurrency, seconds):
+    latencies, statuses = [], {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=60, headers=headers, limits=limits) as client:
+        deadline = time.perf_counter() + seconds
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(f"/shipments/{tracking_number}")
+                    code = response.status_code
+                except httpx.HTTPError as exc:
+                    code = type(exc).__name__
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[code] = statuses.get(code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    ok = statuses.get(200, 0)
+    print(f"{concurrency:5d} clients  {ok / wall:8.1f} req/s  p50 {percentile(latencies, 50):7.1f} ms  "
+          f"p99 {percentile(latencies, 99):7.1f} ms  statuses {statuses}")
+
+
+async def main(url, levels, seconds, email, password):
+    async with httpx.AsyncClient(base_url=url, timeout=30) as client:
+        headers, tracking_number = await setup(client, email, password)
+        for _ in range(50):
+            await client.get(f"/shipments/{tracking_number}", headers=headers)
+    for concurrency in levels:
+        await run_level(url, headers, tracking_number, concurrency, seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--levels", default="50,200,1000", help="comma-separated client counts")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--email", default="async-bench@logistics-bench.com")
+    parser.add_argument("--password", default="bench-pass-123")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(",")]
+    asyncio.run(main(args.url, levels, args.seconds, args.email, args.password))
@@ -0,0 +1,64 @@
+"""
+Shipment creation throughput: one POST /shipments/ per parcel versus a
+manifest sent to POST /shipments/bulk, as a JSON array and as NDJSON.
+
+Reports rows per second for each. The per-parcel loop only sends --single
+requests (it is the slow path); the manifests send --rows rows each:
+
+    python benchmarks/bulk_create.py --url http://localhost:8000 --rows 50000
+
+Raise the RATE_LIMIT_* quotas on the server first, or most requests get 429.
+"""
+import argparse
+import json
+import time
+import uuid
+
+import httpx
+
+
+def login(client):
+    email = f"bulk-{uuid.uuid4().hex[:8]}@logistics-bench.com"
+    client.post("/auth/register", json={"email": email, "password": "bench-pass-123", "role": "customer"})
+    token = client.post("/auth/login", data={"username": email, "password": "bench-pass-123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def parcels(count):
+    return [{"source_address": f"Warehouse {n % 40}, Chennai", "destination_address": f"{n} MG Road, Bangalore"} for n in range(count)]
+
+
+def report(name, rows, elapsed):
+    print(f"{name:14s} {rows:6d} rows  {elapsed:7.2f} s  {rows / elapsed:9.0f} rows/s")
+
+
+def run(url, rows, single):
+    with httpx.Client(base_url=url, timeout=600) as client:
+        headers = login(client)
+
+        start = time.perf_counter()
+        for parcel in parcels(single):
+            client.post("/shipments/", headers=headers, json=parcel).raise_for_status()
+        report("one per POST", single, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        response = client.post("/shipments/bulk", headers=headers, json=parcels(rows))
+        response.raise_for_status()
+        assert response.json()["created"] == rows
+        report("bulk JSON", rows, time.perf_counter() - start)
+
+        body = "\n".join(json.dumps(parcel) for parcel in parcels(rows))
+        start = time.perf_counter()
+        response = client.post("/shipments/bulk", headers={**headers, "Content-Type": "application/x-ndjson"}, content=body)
+        response.raise_for_status()
+        assert response.json()["created"] == rows
+        report("bulk NDJSON", rows, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--single", type=int, default=500)
+    args = parser.parse_args()
+    run(args.url, args.rows, args.single)
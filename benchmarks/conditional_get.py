@@ -0,0 +1,57 @@
+"""
+Polling with and without conditional GETs.
+
+Creates --shipments shipments for one customer, then polls GET /shipments/
+(one page of --limit rows) --polls times twice: once re-downloading the page
+every time, once sending the last ETag in If-None-Match so an unchanged page
+comes back as an empty 304. Reports requests per second and bytes received.
+
+    python benchmarks/conditional_get.py --url http://localhost:8000 --shipments 200 --limit 200
+
+Raise the RATE_LIMIT_* quotas on the server first, or most requests get 429.
+"""
+import argparse
+import time
+import uuid
+
+import httpx
+
+
+def login(client):
+    email = f"poll-{uuid.uuid4().hex[:8]}@logistics-bench.com"
+    client.post("/auth/register", json={"email": email, "password": "bench-pass-123", "role": "customer"})
+    token = client.post("/auth/login", data={"username": email, "password": "bench-pass-123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def poll(client, headers, limit, polls, conditional):
+    etag, received, statuses = None, 0, {}
+    start = time.perf_counter()
+    for _ in range(polls):
+        request_headers = {**headers, "If-None-Match": etag} if conditional and etag else headers
+        response = client.get("/shipments/", headers=request_headers, params={"limit": limit})
+        etag = response.headers.get("ETag", etag)
+        received += len(response.content)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    elapsed = time.perf_counter() - start
+    name = "If-None-Match" if conditional else "full GET"
+    print(f"{name:14s} {polls / elapsed:8.1f} req/s  {received / polls:9.0f} body bytes/poll  statuses {statuses}")
+
+
+def run(url, shipments, limit, polls):
+    with httpx.Client(base_url=url, timeout=60) as client:
+        headers = login(client)
+        parcels = [{"source_address": "Chennai", "destination_address": f"{n} MG Road, Bangalore"} for n in range(shipments)]
+        client.post("/shipments/bulk", headers=headers, json=parcels).raise_for_status()
+        for conditional in (False, True):
+            poll(client, headers, limit, polls, conditional)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--shipments", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=500)
+    args = parser.parse_args()
+    run(args.url, args.shipments, args.limit, args.polls)
@@ -0,0 +1,91 @@
+"""
+Login storm benchmark.
+
+Fires concurrent logins at a running API while probing GET /health, then
+reports login latency and how much the unrelated endpoint slowed down.
+
+    uvicorn app.main:app --port 8000
+    python benchmarks/login_storm.py --url http://localhost:8000 --logins 200 --concurrency 50
+"""
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def probe_health(client, stop, samples):
+    while not stop.is_set():
+        start = time.perf_counter()
+        client.get("/health")
+        samples.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.01)
+
+
+def health_baseline(client, seconds):
+    samples = []
+    stop = threading.Event()
+    timer = threading.Timer(seconds, stop.set)
+    timer.start()
+    probe_health(client, stop, samples)
+    return samples
+
+
+def run(url, logins, concurrency, email, password):
+    with httpx.Client(base_url=url, timeout=30) as client:
+        client.post("/auth/register", json={"email": email, "password": password, "role": "agent"})
+        baseline = health_baseline(client, 2)
+
+    login_ms, statuses, health_ms = [], {}, []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def login(_):
+        with httpx.Client(base_url=url, timeout=30) as client:
+            start = time.perf_counter()
+            response = client.post("/auth/login", data={"username": email, "password": password})
+            elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code == 200:
+                login_ms.append(elapsed)
+
+    with httpx.Client(base_url=url, timeout=30) as probe_client:
+        prober = threading.Thread(target=probe_health, args=(probe_client, stop, health_ms))
+        prober.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(login, range(logins)))
+        wall = time.perf_counter() - started
+        stop.set()
+        prober.join()
+
+    print(f"logins: {logins} at concurrency {concurrency} in {wall:.2f}s -> statuses {statuses}")
+    if login_ms:
+        print(f"login ok   p50 {percentile(login_ms, 50):8.1f} ms   p99 {percentile(login_ms, 99):8.1f} ms")
+    print(f"/health    p50 {percentile(baseline, 50):8.1f} ms   p99 {percentile(baseline, 99):8.1f} ms   (idle)")
+    print(f"/health    p50 {percentile(health_ms, 50):8.1f} ms   p99 {percentile(health_ms, 99):8.1f} ms   (during storm)")
+    if baseline and health_ms:
+        slowdown = statistics.median(health_ms) / max(statistics.median(baseline), 1e-9)
+        print(f"/health median slowdown under storm: {slowdown:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--email", default="storm-agent@logistics-bench.com")
+    parser.add_argument("--password", default="bench-pass-123")
+    args = parser.parse_args()
+    run(args.url, args.logins, args.concurrency, args.email, args.password)
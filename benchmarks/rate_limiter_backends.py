@@ -0,0 +1,111 @@
+"""
+Rate limiter backend benchmark.
+
+Reports the added latency per request for each backend, then has several
+processes hammer one shared key to show how closely each backend holds the
+global quota. Checks the sqlite store cannot answer within its busy timeout
+are let through, as in the app, and counted. Finally another connection
+holds the store's write lock and the time a check takes to give up is
+reported: it is bounded by the busy timeout, not by the lock holder.
+
+    python benchmarks/rate_limiter_backends.py --requests 50000 --processes 8
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.middleware.rate_limit_backends import BackendUnavailable, SlidingWindowLimiter, SQLiteBackend  # noqa: E402
+
+
+def make_backend(kind, path, limit):
+    if kind == "memory":
+        return SlidingWindowLimiter(limit=limit, window_seconds=60, max_keys=100_000)
+    if kind == "sqlite":
+        return SQLiteBackend(path, limit=limit, window_seconds=60)
+    return SQLiteBackend(path, limit=limit, window_seconds=60, lease_size=16)
+
+
+def latency(kind, path, requests, clients):
+    backend = make_backend(kind, path, limit=10**9)
+    backend.hit("warm-up")
+    start = time.perf_counter()
+    for i in range(requests):
+        backend.hit(f"client-{i % clients}")
+    elapsed = time.perf_counter() - start
+    backend.close()
+    return elapsed / requests * 1e6
+
+
+def hammer(kind, path, limit, requests, results):
+    backend = make_backend(kind, path, limit)
+    allowed = unavailable = 0
+    for _ in range(requests):
+        try:
+            allowed += backend.hit("shared") == 0.0
+        except BackendUnavailable:
+            allowed += 1
+            unavailable += 1
+    backend.close()
+    results.put((allowed, unavailable))
+
+
+def accuracy(kind, path, processes, limit, requests):
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=hammer, args=(kind, path, limit, requests, results))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    counts = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return sum(allowed for allowed, _ in counts), sum(unavailable for _, unavailable in counts)
+
+
+def stalled(path, checks):
+    backend = make_backend("sqlite", path, limit=10**9)
+    backend.hit("warm-up")
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    samples = []
+    try:
+        for _ in range(checks):
+            start = time.perf_counter()
+            try:
+                backend.hit("client")
+            except BackendUnavailable:
+                pass
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        holder.rollback()
+        holder.close()
+        backend.close()
+    return statistics.median(samples), max(samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--clients", type=int, default=1_000)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in ("memory", "sqlite", "sqlite-leased"):
+            path = os.path.join(tmp, f"{kind}-latency.db")
+            print(f"{kind:>15}: {latency(kind, path, args.requests, args.clients):8.2f} us/request")
+        print(f"\n{args.processes} processes x {args.limit * 2} hits on one key, global limit {args.limit}:")
+        for kind in ("memory", "sqlite", "sqlite-leased"):
+            path = os.path.join(tmp, f"{kind}-accuracy.db")
+            allowed, unavailable = accuracy(kind, path, args.processes, args.limit, args.limit * 2)
+            print(f"{kind:>15}: {allowed:6d} allowed ({allowed / args.limit:.2f}x the quota), "
+                  f"{unavailable} let through unchecked")
+        median, worst = stalled(os.path.join(tmp, "stalled.db"), 20)
+        print(f"\nsqlite with the write lock held elsewhere: a check gives up after {median:.1f} ms (max {worst:.1f} ms)")
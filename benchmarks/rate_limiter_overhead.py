@@ -0,0 +1,82 @@
+"""
+Rate limiter microbenchmark.
+
+Measures the per-request cost of the enforce_rate_limit dependency, including
+the per-route policy lookup, and the memory held by the limiter when traffic
+is spread over 10k, 100k and 1M distinct anonymous clients.
+
+    python benchmarks/rate_limiter_overhead.py
+    python benchmarks/rate_limiter_overhead.py --clients 10000 100000 --requests 200000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.middleware import rate_limiter  # noqa: E402
+from app.middleware.rate_limiter import SlidingWindowLimiter  # noqa: E402
+
+
+ROUTE = SimpleNamespace(endpoint=lambda: None)
+
+
+def fake_requests(count, clients):
+    rng = random.Random(42)
+    return [SimpleNamespace(
+                scope={"route": ROUTE},
+                headers={},
+                client=SimpleNamespace(host=f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"))
+            for i in (rng.randrange(clients) for _ in range(count))]
+
+
+async def drive(requests):
+    enforce = rate_limiter.enforce_rate_limit
+    start = time.perf_counter()
+    for request in requests:
+        await enforce(request)
+    return time.perf_counter() - start
+
+
+def policy_lookup_ns(iterations=1_000_000):
+    lookup = rate_limiter._policy_for
+    start = time.perf_counter()
+    for _ in range(iterations):
+        lookup(ROUTE)
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def run(clients, requests, max_keys):
+    rate_limiter.DEFAULT_QUOTA.backend = SlidingWindowLimiter(
+        limit=10**9,
+        window_seconds=rate_limiter.RATE_LIMIT_WINDOW_SECONDS,
+        max_keys=max_keys
+    )
+    warm = fake_requests(clients, clients)
+    batch = fake_requests(requests, clients)
+
+    tracemalloc.start()
+    asyncio.run(drive(warm))
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    elapsed = asyncio.run(drive(batch))
+    tracked = len(rate_limiter.DEFAULT_QUOTA.backend)
+    print(f"{clients:>9,} clients  {elapsed / requests * 1e6:7.2f} us/request  "
+          f"{tracked:>9,} keys tracked  {held / 2**20:8.1f} MiB held")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--requests", type=int, default=500_000)
+    parser.add_argument("--max-keys", type=int, default=rate_limiter.RATE_LIMIT_MAX_KEYS)
+    args = parser.parse_args()
+    print(f"per-route policy lookup: {policy_lookup_ns():.0f} ns")
+    for count in args.clients:
+        run(count, args.requests, args.max_keys)
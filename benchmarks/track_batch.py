@@ -0,0 +1,72 @@
+"""
+Tracking a screen of shipments: one GET /shipments/{tracking_number} per
+parcel versus a single POST /shipments/track/batch.
+
+Creates --shipments shipments, then for each batch size times --rounds
+screens of random tracking numbers both ways and reports the median time per
+screen. Set TRACKING_CACHE_TTL_SECONDS=0 on the server to measure the
+database path rather than cache hits.
+
+    python benchmarks/track_batch.py --url http://localhost:8000 --shipments 1000 --sizes 50 500
+
+Raise the RATE_LIMIT_* quotas on the server first, or most requests get 429.
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+def login(client):
+    email = f"batch-{uuid.uuid4().hex[:8]}@logistics-bench.com"
+    client.post("/auth/register", json={"email": email, "password": "bench-pass-123", "role": "customer"})
+    token = client.post("/auth/login", data={"username": email, "password": "bench-pass-123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def seed(client, headers, shipments):
+    parcels = [{"source_address": "Chennai", "destination_address": f"{n} MG Road, Bangalore"} for n in range(shipments)]
+    response = client.post("/shipments/bulk", headers=headers, json=parcels)
+    response.raise_for_status()
+    return [result["tracking_number"] for result in response.json()["results"]]
+
+
+def one_by_one(client, headers, numbers):
+    for number in numbers:
+        client.get(f"/shipments/{number}", headers=headers).raise_for_status()
+
+
+def batched(client, headers, numbers):
+    response = client.post("/shipments/track/batch", headers=headers, json={"tracking_numbers": numbers})
+    response.raise_for_status()
+    assert all(result["found"] for result in response.json()["results"])
+
+
+def run(url, shipments, sizes, rounds):
+    with httpx.Client(base_url=url, timeout=120) as client:
+        headers = login(client)
+        numbers = seed(client, headers, shipments)
+        print(f"{'screen':>6s}  {'one GET each':>13s}  {'one batch':>10s}  speedup")
+        for size in sizes:
+            timings = {one_by_one: [], batched: []}
+            for _ in range(rounds):
+                screen = random.sample(numbers, size)
+                for way, samples in timings.items():
+                    start = time.perf_counter()
+                    way(client, headers, screen)
+                    samples.append((time.perf_counter() - start) * 1000)
+            single, batch = (statistics.median(samples) for samples in timings.values())
+            print(f"{size:6d}  {single:10.1f} ms  {batch:7.1f} ms  {single / batch:6.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--shipments", type=int, default=1000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    run(args.url, args.shipments, args.sizes, args.rounds)
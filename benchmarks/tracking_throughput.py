@@ -0,0 +1,106 @@
+"""
+Tracking lookup throughput benchmark.
+
+Creates --shipments shipments, then has concurrent clients hammer
+GET /shipments/{tracking_number} for random ones of them for a fixed time and
+reports requests per second and latency percentiles, plus the tracking cache
+hit ratio when the server exports it. Run it against the server before and
+after a change to compare.
+
+    uvicorn app.main:app --port 8000
+    python benchmarks/tracking_throughput.py --url http://localhost:8000 --seconds 10 --concurrency 16
+"""
+import argparse
+import random
+import re
+import threading
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def setup(client, email, password, shipments):
+    client.post("/auth/register", json={"email": email, "password": password, "role": "customer"})
+    token = client.post("/auth/login", data={"username": email, "password": password}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    numbers = [
+        client.post(
+            "/shipments/",
+            headers=headers,
+            json={"source_address": "Chennai", "destination_address": "Bangalore"}
+        ).json()["tracking_number"]
+        for _ in range(shipments)
+    ]
+    return headers, numbers
+
+
+def cache_lookups(client):
+    body = client.get("/metrics").text
+    return {
+        result: float(value)
+        for result, value in re.findall(r'^tracking_cache_lookups_total\{result="(\w+)"\} (\S+)$', body, re.M)
+    }
+
+
+def run(url, seconds, concurrency, email, password, shipments):
+    with httpx.Client(base_url=url, timeout=30) as client:
+        headers, numbers = setup(client, email, password, shipments)
+        for _ in range(50):
+            client.get(f"/shipments/{random.choice(numbers)}", headers=headers)
+        before = cache_lookups(client)
+
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        local, codes = [], {}
+        with httpx.Client(base_url=url, timeout=30, headers=headers) as client:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = client.get(f"/shipments/{random.choice(numbers)}")
+                local.append((time.perf_counter() - start) * 1000)
+                codes[response.status_code] = codes.get(response.status_code, 0) + 1
+        with lock:
+            latencies.extend(local)
+            for code, count in codes.items():
+                statuses[code] = statuses.get(code, 0) + count
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    print(f"GET /shipments/{{tracking_number}}: {len(latencies)} requests at concurrency {concurrency} "
+          f"in {wall:.1f}s -> statuses {statuses}")
+    print(f"throughput {len(latencies) / wall:8.1f} req/s   p50 {percentile(latencies, 50):6.1f} ms   "
+          f"p99 {percentile(latencies, 99):6.1f} ms")
+
+    with httpx.Client(base_url=url, timeout=30) as client:
+        after = cache_lookups(client)
+    hits, misses = (after.get(r, 0) - before.get(r, 0) for r in ("hit", "miss"))
+    if hits + misses:
+        print(f"tracking cache hit ratio {hits / (hits + misses):.3f} ({hits:.0f} hits, {misses:.0f} misses)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--email", default="track-bench@logistics-bench.com")
+    parser.add_argument("--password", default="bench-pass-123")
+    parser.add_argument("--shipments", type=int, default=1)
+    args = parser.parse_args()
+    run(args.url, args.seconds, args.concurrency, args.email, args.password, args.shipments)
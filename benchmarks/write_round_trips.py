@@ -0,0 +1,73 @@
+"""
+Statements per write request.
+
+Creates shipments and walks each one through its status updates, and reports
+the statements each request ran (from the Server-Timing header) and its
+latency. Run it against a server on each build to compare:
+
+    python benchmarks/write_round_trips.py --url http://localhost:8000 --shipments 200
+
+Raise the RATE_LIMIT_* quotas on the server first, or most requests get 429.
+"""
+import argparse
+import re
+import statistics
+import time
+import uuid
+
+import httpx
+
+QUERIES = re.compile(r'desc="(\d+) quer')
+STATUSES = ["in_transit", "out_for_delivery", "delivered"]
+
+
+def login(client, role):
+    email = f"writes-{role}-{uuid.uuid4().hex[:8]}@logistics-bench.com"
+    client.post("/auth/register", json={"email": email, "password": "bench-pass-123", "role": role})
+    token = client.post("/auth/login", data={"username": email, "password": "bench-pass-123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def measure(samples, send):
+    start = time.perf_counter()
+    response = send()
+    elapsed = (time.perf_counter() - start) * 1000
+    response.raise_for_status()
+    samples.append((int(QUERIES.search(response.headers["Server-Timing"]).group(1)), elapsed))
+    return response.json()
+
+
+def report(name, samples):
+    queries = [q for q, _ in samples]
+    latencies = [ms for _, ms in samples]
+    print(f"{name:14s} {len(samples):5d} requests  {statistics.mean(queries):5.2f} statements/request  "
+          f"p50 {statistics.median(latencies):6.2f} ms")
+
+
+def run(url, shipments):
+    created, updated = [], []
+    with httpx.Client(base_url=url, timeout=30) as client:
+        customer, admin, agent = login(client, "customer"), login(client, "admin"), login(client, "agent")
+        agent_id = next(
+            u["id"] for u in client.get("/admin/users", headers=admin).json()
+            if u["email"].startswith("writes-agent")
+        )
+        for _ in range(shipments):
+            shipment = measure(created, lambda: client.post(
+                "/shipments/", headers=customer, json={"source_address": "Chennai", "destination_address": "Bangalore"}
+            ))
+            client.put(f"/shipments/{shipment['id']}/assign-agent", headers=admin, json={"agent_id": agent_id})
+            for status in STATUSES:
+                measure(updated, lambda: client.put(
+                    f"/shipments/{shipment['id']}/status", headers=agent, json={"status": status, "location": "Hub"}
+                ))
+    report("create", created)
+    report("status update", updated)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--shipments", type=int, default=200)
+    args = parser.parse_args()
+    run(args.url, args.shipments)
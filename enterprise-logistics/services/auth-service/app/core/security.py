@@ -0,0 +1,106 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from app.core.config import (
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_TIMEOUT_SECONDS
+)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# bcrypt runs in a bounded process pool so a login storm cannot starve the
+# request thread pool. Calls beyond workers + max pending get a fast 503.
+_hash_executor: ProcessPoolExecutor | None = None
+_hash_executor_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_PENDING)
+
+
+def _hash_in_worker(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_in_worker(plain: str, hashed: str) -> bool:
+    return pwd_context.verify(plain, hashed)
+
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                _hash_executor = ProcessPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _hash_executor
+
+
+def _warm_up():
+    return None
+
+
+def start_hash_executor():
+    # Spawning a worker costs about a second; do it at boot rather than on
+    # the first logins of a storm.
+    executor = _get_hash_executor()
+    for _ in range(PASSWORD_HASH_WORKERS):
+        executor.submit(_warm_up)
+
+
+def _reset_hash_executor(broken: ProcessPoolExecutor):
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is broken:
+            _hash_executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_hash_executor():
+    global _hash_executor
+    with _hash_executor_lock:
+        executor, _hash_executor = _hash_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _auth_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Authentication is busy. Please try again shortly.",
+        headers={"Retry-After": "1"}
+    )
+
+
+async def _run_hash_job(fn, *args):
+    if not _hash_slots.acquire(blocking=False):
+        raise _auth_busy()
+
+    executor = _get_hash_executor()
+    try:
+        future = executor.submit(fn, *args)
+    except (BrokenProcessPool, RuntimeError):
+        _hash_slots.release()
+        _reset_hash_executor(executor)
+        raise _auth_busy()
+
+    future.add_done_callback(lambda _: _hash_slots.release())
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), PASSWORD_HASH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise _auth_busy()
+    except BrokenProcessPool:
+        _reset_hash_executor(executor)
+        raise _auth_busy()
+
+
+async def hash_password(password: str) -> str:
+    return await _run_hash_job(_hash_in_worker, password)
+
+
+async def verify_password(plain: str, hashed: str) -> bool:
+    return await _run_hash_job(_verify_in_worker, plain, hashed)
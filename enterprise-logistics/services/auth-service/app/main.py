@@ -1,15 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.core.database import engine, Base
+from fastapi.responses import PlainTextResponse
+from app.core.config import SCHEMA_CHECK
+from app.core.database import engine
+from app.core.metrics import metrics_middleware, render_metrics, start_metrics, stop_metrics
+from app.core.schema import check_schema
+from app.core.security import start_hash_executor, shutdown_hash_executor
 from app.models import user  # noqa
 from app.routers.auth import router as auth_router
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Auth Service", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if SCHEMA_CHECK:
+        check_schema(engine)
+    flusher = start_metrics()
+    start_hash_executor()
+    yield
+    shutdown_hash_executor()
+    stop_metrics(flusher)
 
+
+app = FastAPI(title="Auth Service", version="1.0.0", lifespan=lifespan)
+
+app.middleware("http")(metrics_middleware)
 app.include_router(auth_router)
 
 
 @app.get("/health")
 def health():
     return {"service": "auth-service", "status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,26 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
 from app.core.database import get_db
 from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.security import hash_password, verify_password
 from app.models.user import User
 from app.schemas.auth_schema import RegisterRequest
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
-
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
@@ -29,27 +20,37 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def _get_user_by_email(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    return user
+
+
+# register and login are async so they wait on the hashing pool without
+# holding a request thread; the blocking DB calls go to the thread pool.
 @router.post("/register", status_code=201)
-def register(user: RegisterRequest, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.email == user.email).first():
+async def register(user: RegisterRequest, db: Session = Depends(get_db)):
+    if await run_in_threadpool(_get_user_by_email, db, user.email):
         raise HTTPException(status_code=400, detail="Email already registered")
     if user.role not in ["customer", "agent", "admin"]:
         raise HTTPException(status_code=400, detail="Invalid role. Choose: customer, agent, admin")
     new_user = User(
         email=user.email,
-        password_hash=hash_password(user.password),
+        password_hash=await hash_password(user.password),
         role=user.role
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    new_user = await run_in_threadpool(_save_user, db, new_user)
     return {"id": str(new_user.id), "email": new_user.email, "role": new_user.role}
 
 
 @router.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_get_user_by_email, db, form_data.username)
+    if not user or not await verify_password(form_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     token = create_access_token({"sub": user.email, "role": user.role, "uid": str(user.id)})
     return {"access_token": token, "token_type": "bearer"}
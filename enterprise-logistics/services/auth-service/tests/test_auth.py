@@ -22,6 +22,19 @@ def test_health_check_response_body(client):
     assert body["status"] == "healthy"
 
 
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+def test_metrics_endpoint_exposes_request_counts(client):
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/health",status="2xx"}' in response.text
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+
+
 # ---------------------------------------------------------------------------
 # Registration — Happy Path
 # ---------------------------------------------------------------------------
@@ -8,6 +8,26 @@ POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
 POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
 DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:5432/hub_db"
 
+# Connection pool per engine and per worker process. The most connections one
+# worker can hold is DB_POOL_SIZE + DB_MAX_OVERFLOW; see the connection budget
+# in the README. Ignored for sqlite URLs.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 2))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Tables are created and changed by Alembic (`alembic upgrade head`), never by
+# the app. At startup each worker only checks that the database is at the
+# revision this build expects; SCHEMA_CHECK=false skips even that.
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "true").lower() in ("1", "true", "yes")
+
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey_logistics_2026")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+
+# Metrics served at /metrics. With several uvicorn workers, point
+# METRICS_MULTIPROC_DIR at a directory shared by them (empty it on deploy):
+# each worker writes its snapshot there and a scrape sums them all.
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+METRICS_FLUSH_INTERVAL_SECONDS = float(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", 5))
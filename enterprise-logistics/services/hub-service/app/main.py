@@ -1,15 +1,34 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.core.database import engine, Base
+from fastapi.responses import PlainTextResponse
+from app.core.config import SCHEMA_CHECK
+from app.core.database import engine
+from app.core.metrics import metrics_middleware, render_metrics, start_metrics, stop_metrics
+from app.core.schema import check_schema
 from app.models import hub  # noqa
 from app.routers.hubs import router as hub_router
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Hub Service", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if SCHEMA_CHECK:
+        check_schema(engine)
+    flusher = start_metrics()
+    yield
+    stop_metrics(flusher)
 
+
+app = FastAPI(title="Hub Service", version="1.0.0", lifespan=lifespan)
+
+app.middleware("http")(metrics_middleware)
 app.include_router(hub_router)
 
 
 @app.get("/health")
 def health():
     return {"service": "hub-service", "status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -27,7 +27,6 @@ def create_hub(
     hub = Hub(hub_name=data.hub_name, city=data.city)
     db.add(hub)
     db.commit()
-    db.refresh(hub)
     return hub
 
 
@@ -46,7 +45,6 @@ def update_hub(
     if data.city is not None:
         hub.city = data.city
     db.commit()
-    db.refresh(hub)
     return hub
 
 
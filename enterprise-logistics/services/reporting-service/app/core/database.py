@@ -1,9 +1,10 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import SHIPMENT_DB_URL, AUTH_DB_URL
+from app.core.pool import pool_options
 
-shipment_engine = create_engine(SHIPMENT_DB_URL)
-auth_engine = create_engine(AUTH_DB_URL)
+shipment_engine = create_engine(SHIPMENT_DB_URL, **pool_options(SHIPMENT_DB_URL, "shipment"))
+auth_engine = create_engine(AUTH_DB_URL, **pool_options(AUTH_DB_URL, "auth"))
 
 ShipmentSession = sessionmaker(autocommit=False, autoflush=False, bind=shipment_engine)
 AuthSession = sessionmaker(autocommit=False, autoflush=False, bind=auth_engine)
@@ -1,11 +1,28 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import metrics_middleware, render_metrics, start_metrics, stop_metrics
 from app.routers.reports import router as report_router
 
-app = FastAPI(title="Reporting Service", version="1.0.0")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    flusher = start_metrics()
+    yield
+    stop_metrics(flusher)
+
+
+app = FastAPI(title="Reporting Service", version="1.0.0", lifespan=lifespan)
+
+app.middleware("http")(metrics_middleware)
 app.include_router(report_router)
 
 
 @app.get("/health")
 def health():
     return {"service": "reporting-service", "status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
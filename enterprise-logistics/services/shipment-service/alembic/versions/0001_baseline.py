@@ -0,0 +1,46 @@
+"""baseline: shipments
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 03:34:50.801072
+
+Databases created earlier by Base.metadata.create_all already match this
+revision; mark them with `alembic stamp 0001` instead of upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+shipment_status = sa.Enum('created', 'in_transit', 'out_for_delivery', 'delivered', name='shipment_status')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('shipments',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('tracking_number', sa.String(), nullable=False),
+    sa.Column('customer_id', sa.UUID(), nullable=False),
+    sa.Column('agent_id', sa.UUID(), nullable=True),
+    sa.Column('source_address', sa.Text(), nullable=False),
+    sa.Column('destination_address', sa.Text(), nullable=False),
+    sa.Column('status', shipment_status, nullable=False),
+    sa.Column('current_location', sa.String(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tracking_number')
+    )
+    op.create_index(op.f('ix_shipments_id'), 'shipments', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_shipments_id'), table_name='shipments')
+    op.drop_table('shipments')
+    shipment_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,33 @@
+"""tracking_node_ids sequence
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 11:34:12.551078
+
+Tracking numbers carry the id of the worker that issued them (see
+app/core/tracking_numbers.py). Each worker takes the next value of this
+sequence at startup. SQLite has no sequences; there workers pick a random
+node, which is enough for a single development process.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE SEQUENCE IF NOT EXISTS tracking_node_ids")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP SEQUENCE IF EXISTS tracking_node_ids")
@@ -8,6 +8,36 @@ POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
 POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
 DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:5432/shipment_db"
 
+# Connection pool per engine and per worker process. The most connections one
+# worker can hold is DB_POOL_SIZE + DB_MAX_OVERFLOW; see the connection budget
+# in the README. Ignored for sqlite URLs.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 2))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Tables are created and changed by Alembic (`alembic upgrade head`), never by
+# the app. At startup each worker only checks that the database is at the
+# revision this build expects; SCHEMA_CHECK=false skips even that.
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "true").lower() in ("1", "true", "yes")
+
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey_logistics_2026")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+
+# Metrics served at /metrics. With several uvicorn workers, point
+# METRICS_MULTIPROC_DIR at a directory shared by them (empty it on deploy):
+# each worker writes its snapshot there and a scrape sums them all.
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+METRICS_FLUSH_INTERVAL_SECONDS = float(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", 5))
+
+# Tracking numbers embed a node id (0-1023) that must differ between workers
+# issuing them at the same time. By default each worker leases one from the
+# tracking_node_ids sequence at startup; set TRACKING_NODE_ID to pin it.
+# Each deployable issuing numbers keeps to its own TRACKING_NODE_RANGE
+# (first-last): the monolith 0-511, the shipment service 512-1023. Their
+# sequences live in different databases, so only the ranges keep them apart.
+TRACKING_NODE_ID = int(os.environ["TRACKING_NODE_ID"]) if os.getenv("TRACKING_NODE_ID") else None
+_first_node, _last_node = (int(part) for part in os.getenv("TRACKING_NODE_RANGE", "512-1023").split("-"))
+TRACKING_NODES = range(_first_node, _last_node + 1)
@@ -1,15 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.core.database import engine, Base
+from fastapi.responses import PlainTextResponse
+from app.core.config import SCHEMA_CHECK, TRACKING_NODE_ID, TRACKING_NODES
+from app.core.database import engine
+from app.core.metrics import metrics_middleware, render_metrics, start_metrics, stop_metrics
+from app.core.schema import check_schema
+from app.core.tracking_numbers import configure_node, lease_node
 from app.models import shipment  # noqa
 from app.routers.shipments import router as shipment_router
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Shipment Service", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if SCHEMA_CHECK:
+        check_schema(engine)
+    configure_node(
+        TRACKING_NODE_ID if TRACKING_NODE_ID is not None else lease_node(engine, TRACKING_NODES), TRACKING_NODES
+    )
+    flusher = start_metrics()
+    yield
+    stop_metrics(flusher)
 
+
+app = FastAPI(title="Shipment Service", version="1.0.0", lifespan=lifespan)
+
+app.middleware("http")(metrics_middleware)
 app.include_router(shipment_router)
 
 
 @app.get("/health")
 def health():
     return {"service": "shipment-service", "status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -7,6 +7,8 @@ from app.core.database import Base
 
 class Shipment(Base):
     __tablename__ = "shipments"
+    # created_at comes back in the INSERT's RETURNING clause, not a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     tracking_number = Column(String, unique=True, nullable=False)
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
+from app.core import tracking_numbers
 from app.core.database import get_db
 from app.dependencies import get_current_user, require_role
 from app.models.shipment import Shipment
@@ -22,9 +23,8 @@ def create_shipment(
     db: Session = Depends(get_db),
     current_user: dict = Depends(require_role("customer"))
 ):
-    tracking_number = "TRK" + uuid_lib.uuid4().hex[:8].upper()
     shipment = Shipment(
-        tracking_number=tracking_number,
+        tracking_number=tracking_numbers.generator.generate(),
         customer_id=uuid_lib.UUID(current_user["uid"]),
         source_address=data.source_address,
         destination_address=data.destination_address,
@@ -32,7 +32,6 @@ def create_shipment(
     )
     db.add(shipment)
     db.commit()
-    db.refresh(shipment)
     return shipment
 
 
@@ -51,6 +50,8 @@ def track_shipment(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
+    if tracking_numbers.is_mistyped(tracking_number):
+        raise HTTPException(status_code=400, detail="Invalid tracking number: check character does not match")
     shipment = db.query(Shipment).filter(Shipment.tracking_number == tracking_number).first()
     if not shipment:
         raise HTTPException(status_code=404, detail="Shipment not found")
@@ -82,7 +83,6 @@ def update_status(
     shipment.status = data.status
     shipment.current_location = data.location
     db.commit()
-    db.refresh(shipment)
     return shipment
 
 
@@ -98,7 +98,6 @@ def assign_agent(
         raise HTTPException(status_code=404, detail="Shipment not found")
     shipment.agent_id = data.agent_id
     db.commit()
-    db.refresh(shipment)
     return shipment
 
 
@@ -1,4 +1,5 @@
 # tests/conftest.py — shipment-service
+import os
 import uuid as uuid_lib
 from datetime import datetime, timedelta
 
@@ -24,6 +25,9 @@ class _SQLiteUUID(satypes.TypeDecorator):
 
 postgresql.UUID = lambda as_uuid=False: _SQLiteUUID()
 
+# Tables come from create_all below, not from migrations
+os.environ["SCHEMA_CHECK"] = "false"
+
 # --- App imports (after patch) ---
 from app.main import app  # noqa: E402
 from app.core.database import Base, get_db  # noqa: E402
@@ -33,7 +37,7 @@ ALGORITHM = "HS256"
 
 SQLITE_TEST_URL = "sqlite:///./test_shipment_svc.db"
 engine = create_engine(SQLITE_TEST_URL, connect_args={"check_same_thread": False})
-TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSession = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 
 def override_get_db():
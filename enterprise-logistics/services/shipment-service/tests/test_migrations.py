@@ -0,0 +1,40 @@
+# tests/test_migrations.py — shipment-service
+import os
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect
+from app.core.database import Base
+from app.core.schema import SCHEMA_REVISION, SchemaVersionError, check_schema
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "alembic.ini")
+
+
+def run_alembic(engine, action, revision):
+    config = Config(ALEMBIC_INI)
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        action(config, revision)
+
+
+def test_schema_revision_is_alembic_head():
+    assert ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head() == SCHEMA_REVISION
+
+
+def test_migrations_build_the_models_schema(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    with pytest.raises(SchemaVersionError):
+        check_schema(engine)
+
+    run_alembic(engine, command.upgrade, "head")
+    check_schema(engine)
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"compare_type": False})
+        assert compare_metadata(context, Base.metadata) == []
+
+    run_alembic(engine, command.downgrade, "base")
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+    engine.dispose()
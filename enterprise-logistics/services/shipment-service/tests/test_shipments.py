@@ -40,6 +40,19 @@ def test_health_check_response_body(client):
     assert body["status"] == "healthy"
 
 
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+def test_metrics_endpoint_exposes_request_counts(client):
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/health",status="2xx"}' in response.text
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+
+
 # ---------------------------------------------------------------------------
 # Create Shipment — Happy Path
 # ---------------------------------------------------------------------------
@@ -56,9 +69,9 @@ def test_create_shipment_response_has_tracking_number(client, customer_token):
 
 
 def test_create_shipment_tracking_number_length(client, customer_token):
-    """TRK + 8 hex chars = 11 characters total."""
+    """TRK + 13 base-36 digits + 1 check character = 17 characters total."""
     tracking = create_shipment(client, customer_token).json()["tracking_number"]
-    assert len(tracking) == 11
+    assert len(tracking) == 17
 
 
 def test_create_shipment_initial_status_is_created(client, customer_token):
@@ -210,6 +223,16 @@ def test_track_nonexistent_shipment_returns_404(client, customer_token):
     assert response.status_code == 404
 
 
+def test_track_mistyped_tracking_number_returns_400(client, customer_token):
+    tracking = create_shipment(client, customer_token).json()["tracking_number"]
+    typo = tracking[:-1] + ("0" if tracking[-1] != "0" else "1")
+    response = client.get(
+        f"/shipments/{typo}",
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 400
+
+
 def test_track_shipment_without_auth_returns_401(client):
     response = client.get("/shipments/TRK12345678")
     assert response.status_code == 401
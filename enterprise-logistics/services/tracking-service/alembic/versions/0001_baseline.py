@@ -0,0 +1,36 @@
+"""baseline: tracking_updates
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 03:34:52.501745
+
+Databases created earlier by Base.metadata.create_all already match this
+revision; mark them with `alembic stamp 0001` instead of upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tracking_updates',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('shipment_id', sa.UUID(), nullable=False),
+    sa.Column('location', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('tracking_updates')
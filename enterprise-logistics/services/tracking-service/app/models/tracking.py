@@ -7,6 +7,8 @@ from app.core.database import Base
 
 class TrackingUpdate(Base):
     __tablename__ = "tracking_updates"
+    # updated_at comes back in the INSERT's RETURNING clause, not a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     shipment_id = Column(UUID(as_uuid=True), nullable=False)
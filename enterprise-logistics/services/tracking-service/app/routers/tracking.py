@@ -24,7 +24,6 @@ def add_tracking_update(
     )
     db.add(update)
     db.commit()
-    db.refresh(update)
     return update
 
 
@@ -1,15 +1,36 @@
 # tests/conftest.py
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.main import app
-from app.core.database import Base, get_db
-from app.middleware.rate_limiter import request_counts
+from app.core.database import (
+    Base,
+    get_db,
+    get_async_db,
+    get_replica_db,
+    get_async_replica_db,
+    async_url,
+    instrument_engine
+)
+from app.core.replica import recent_writers, replica_health
+from app.core.dependencies import principal_cache
+from app.core.metrics import REGISTRY
+from app.services.tracking_cache import snapshot_cache
+from app.middleware.rate_limiter import reset_rate_limits
 
 SQLALCHEMY_TEST_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_TEST_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = instrument_engine(create_engine(SQLALCHEMY_TEST_URL, connect_args={"check_same_thread": False}))
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Same database through aiosqlite, for the DB_ASYNC routes. TestClient runs
+# each request on a fresh event loop, so connections must not be pooled.
+async_engine = create_async_engine(async_url(SQLALCHEMY_TEST_URL), poolclass=NullPool)
+instrument_engine(async_engine.sync_engine)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
 def override_get_db():
@@ -20,10 +41,20 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 @pytest.fixture(autouse=True)
 def setup_db():
     Base.metadata.create_all(bind=engine)
-    request_counts.clear()
+    reset_rate_limits()
+    principal_cache.clear()
+    snapshot_cache.clear()
+    REGISTRY.reset()
+    recent_writers.clear()
+    replica_health.reset()
     yield
     Base.metadata.drop_all(bind=engine)
 
@@ -31,4 +62,89 @@ def setup_db():
 @pytest.fixture
 def client():
     app.dependency_overrides[get_db] = override_get_db
-    return TestClient(app)
\ No newline at end of file
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return TestClient(app)
+
+
+@pytest.fixture
+def replica_db(monkeypatch):
+    """A second sqlite database standing in for the read replica; yields its session factory."""
+    replica_url = "sqlite:///./test_replica.db"
+    replica_engine = create_engine(replica_url, connect_args={"check_same_thread": False})
+    async_replica_engine = create_async_engine(async_url(replica_url), poolclass=NullPool)
+    ReplicaSession = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=replica_engine)
+    AsyncReplicaSession = async_sessionmaker(async_replica_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_replica_db():
+        db = ReplicaSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_replica_db():
+        async with AsyncReplicaSession() as db:
+            yield db
+
+    Base.metadata.create_all(bind=replica_engine)
+    monkeypatch.setattr("app.core.replica.DATABASE_REPLICA_URL", replica_url)
+    app.dependency_overrides[get_replica_db] = override_get_replica_db
+    app.dependency_overrides[get_async_replica_db] = override_get_async_replica_db
+    yield ReplicaSession
+    app.dependency_overrides.pop(get_replica_db)
+    app.dependency_overrides.pop(get_async_replica_db)
+    Base.metadata.drop_all(bind=replica_engine)
+    replica_engine.dispose()
+
+
+@pytest.fixture
+def sync_session():
+    return TestingSessionLocal
+
+
+@pytest.fixture
+def async_session():
+    return TestingAsyncSessionLocal
+
+
+@pytest.fixture
+def db_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def db_commits():
+    """Number of transactions committed on the test databases while the test runs."""
+    commits = []
+
+    def record(conn):
+        commits.append(conn)
+
+    event.listen(engine, "commit", record)
+    event.listen(async_engine.sync_engine, "commit", record)
+    yield commits
+    event.remove(engine, "commit", record)
+    event.remove(async_engine.sync_engine, "commit", record)
+
+
+@pytest.fixture
+def query_budget(db_statements):
+    """Fail when the wrapped block runs more statements than allowed: `with query_budget(2): ...`"""
+    @contextmanager
+    def budget(max_queries: int):
+        start = len(db_statements)
+        yield
+        executed = db_statements[start:]
+        assert len(executed) <= max_queries, (
+            f"{len(executed)} queries, budget {max_queries}:\n" + "\n".join(executed)
+        )
+    return budget
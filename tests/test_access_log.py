@@ -0,0 +1,73 @@
+# tests/test_access_log.py
+import json
+import logging
+import queue
+import pytest
+from app.middleware import logging_middleware
+from app.middleware.logging_middleware import DroppingQueueHandler, JsonFormatter, logger
+
+
+class Collector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def access_records():
+    collector = Collector()
+    logger.addHandler(collector)
+    yield collector.records
+    logger.removeHandler(collector)
+
+
+def test_successful_fast_requests_are_sampled(client, access_records, monkeypatch):
+    monkeypatch.setattr(logging_middleware, "ACCESS_LOG_SAMPLE_RATE", 0)
+    assert client.get("/health").status_code == 200
+    assert access_records == []
+
+    monkeypatch.setattr(logging_middleware, "ACCESS_LOG_SAMPLE_RATE", 1)
+    client.get("/health")
+    assert len(access_records) == 1
+    assert access_records[0].fields["route"] == "/health"
+    assert access_records[0].levelno == logging.INFO
+
+
+def test_errors_are_always_logged(client, access_records, monkeypatch):
+    monkeypatch.setattr(logging_middleware, "ACCESS_LOG_SAMPLE_RATE", 0)
+    client.get("/shipments/TRK00000000")
+    assert len(access_records) == 1
+    access = access_records[0].fields
+    assert access["status"] == 401
+    assert access["route"] == "/shipments/{tracking_number}"
+    assert access["path"] == "/shipments/TRK00000000"
+    assert access_records[0].levelno == logging.WARNING
+
+
+def test_slow_requests_are_always_logged(client, access_records, monkeypatch):
+    monkeypatch.setattr(logging_middleware, "ACCESS_LOG_SAMPLE_RATE", 0)
+    monkeypatch.setattr(logging_middleware, "ACCESS_LOG_SLOW_MS", 0)
+    client.get("/health")
+    assert len(access_records) == 1
+    assert access_records[0].fields["slow"] is True
+
+
+def test_json_formatter_writes_one_object_per_record():
+    record = logging.LogRecord("logistics_logger", logging.INFO, __file__, 1, "request", None, None)
+    record.fields = {"method": "GET", "path": "/health", "status": 200, "duration_ms": 1.5}
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["level"] == "INFO"
+    assert entry["msg"] == "request"
+    assert entry["status"] == 200
+    assert entry["path"] == "/health"
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("logistics_logger", logging.INFO, __file__, 1, "request", None, None)
+    handler.handle(record)
+    handler.handle(record)
+    assert handler.dropped == 1
@@ -0,0 +1,89 @@
+# tests/test_agent_shipments.py
+from datetime import datetime
+from sqlalchemy import update
+from app.models.shipment import Shipment
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def setup_worklist(client, count):
+    admin = register_and_login(client, "work-admin@test.com", "admin")
+    agent = register_and_login(client, "work-agent@test.com", "agent")
+    register_and_login(client, "work-other@test.com", "agent")
+    customer = register_and_login(client, "work-customer@test.com", "customer")
+    users = client.get("/admin/users", headers=auth(admin)).json()
+    agent_id = next(u["id"] for u in users if u["email"] == "work-agent@test.com")
+    other_id = next(u["id"] for u in users if u["email"] == "work-other@test.com")
+    shipments = []
+    for n in range(count + 1):
+        shipment = client.post(
+            "/shipments/",
+            headers=auth(customer),
+            json={"source_address": "Chennai", "destination_address": f"{n} MG Road, Bangalore"}
+        ).json()
+        # The last one goes to another agent
+        assignee = agent_id if n < count else other_id
+        client.put(f"/shipments/{shipment['id']}/assign-agent", headers=auth(admin), json={"agent_id": assignee})
+        shipments.append(shipment)
+    return agent, shipments[:count]
+
+
+def worklist(client, token, **params):
+    return client.get("/agent/shipments", headers=auth(token), params=params)
+
+
+def test_pages_cover_only_my_shipments(client):
+    agent, shipments = setup_worklist(client, 5)
+    seen, cursor = [], None
+    while True:
+        response = worklist(client, agent, limit=2, **({"cursor": cursor} if cursor else {}))
+        assert response.status_code == 200
+        seen.extend(s["id"] for s in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(s["id"] for s in shipments)
+    assert len(seen) == len(set(seen))
+
+
+def test_status_filter(client):
+    agent, shipments = setup_worklist(client, 3)
+    client.put(
+        f"/shipments/{shipments[1]['id']}/status",
+        headers=auth(agent),
+        json={"status": "in_transit", "location": "Salem Hub"}
+    )
+    in_transit = worklist(client, agent, status="in_transit").json()
+    assert [s["id"] for s in in_transit] == [shipments[1]["id"]]
+    assert len(worklist(client, agent, status="created").json()) == 2
+
+    response = worklist(client, agent, status="lost")
+    assert response.status_code == 400
+    assert response.json()["error"].startswith("Invalid status")
+
+
+def test_since_returns_only_shipments_written_after_it(client, sync_session):
+    agent, shipments = setup_worklist(client, 3)
+    with sync_session() as db:
+        db.execute(update(Shipment).values(updated_at=datetime(2026, 1, 1)))
+        db.commit()
+    assert worklist(client, agent, since="2026-06-01T00:00:00").json() == []
+
+    client.post(f"/tracking/{shipments[0]['id']}", headers=auth(agent), json={"status": "in_transit", "location": "Erode Hub"})
+    changed = worklist(client, agent, since="2026-06-01T00:00:00").json()
+    assert [s["id"] for s in changed] == [shipments[0]["id"]]
+    assert changed[0]["updated_at"] >= "2026-06-01"
+    assert len(worklist(client, agent, since="2025-12-31T00:00:00").json()) == 3
+
+
+def test_only_agents_have_a_worklist(client):
+    customer = register_and_login(client, "work-cust@test.com", "customer")
+    assert worklist(client, customer).status_code == 403
@@ -0,0 +1,112 @@
+# tests/test_async_db.py
+import asyncio
+import inspect
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core import data_path
+from app.core.database import async_url
+from app.core.pool import InstrumentedAsyncQueuePool, pool_options
+from app.repositories import async_hub_repository, async_shipment_repository, async_user_repository
+from app.repositories.hub_repository import create_hub
+from app.repositories.shipment_repository import create_shipment
+from app.repositories.user_repository import create_user
+from app.services.shipment_service import track_shipment_async, update_status_service_async
+from app.services.unit_of_work import unit_of_work
+
+
+def test_async_url_swaps_in_async_driver():
+    assert async_url("postgresql://u:p@db:5432/logistics") == "postgresql+asyncpg://u:p@db:5432/logistics"
+    assert async_url("postgresql+psycopg2://u:p@db/logistics") == "postgresql+asyncpg://u:p@db/logistics"
+    assert async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+
+def test_async_engine_uses_instrumented_pool():
+    url = "postgresql+asyncpg://u:p@localhost/logistics"
+    engine = create_async_engine(url, **pool_options(url, "primary_async", asyncio=True))
+    assert isinstance(engine.pool, InstrumentedAsyncQueuePool)
+    assert engine.pool.stats()["pool"] == "primary_async"
+
+
+def test_hot_endpoint_runs_in_a_thread_on_the_sync_path(monkeypatch):
+    monkeypatch.setattr(data_path, "DB_ASYNC", False)
+
+    def lookup(db, number):
+        return {"db": db, "number": number}
+
+    async def lookup_async(db, number):
+        raise AssertionError("async service called on the sync path")
+
+    @data_path.endpoint
+    async def track(number: str, db=None):
+        return await data_path.call(lookup, lookup_async, db, number)
+
+    # FastAPI unwraps endpoints before deciding whether to run them in a thread
+    assert not asyncio.iscoroutinefunction(inspect.unwrap(track))
+    assert track(number="TRK1", db="session") == {"db": "session", "number": "TRK1"}
+
+
+def test_hot_endpoint_may_not_suspend_on_the_sync_path(monkeypatch):
+    monkeypatch.setattr(data_path, "DB_ASYNC", False)
+
+    @data_path.endpoint
+    async def track():
+        await asyncio.sleep(0)
+
+    with pytest.raises(RuntimeError):
+        track()
+
+
+def test_hot_endpoint_stays_on_the_loop_on_the_async_path(monkeypatch):
+    monkeypatch.setattr(data_path, "DB_ASYNC", True)
+
+    def lookup(db):
+        raise AssertionError("sync service called on the async path")
+
+    async def lookup_async(db):
+        return db
+
+    async def track(db=None):
+        return await data_path.call(lookup, lookup_async, db)
+
+    assert data_path.endpoint(track) is track
+    assert asyncio.run(track(db="session")) == "session"
+
+
+def test_async_repositories_and_services(sync_session, async_session):
+    # Written through the sync repositories, as the routes that create these do
+    with sync_session() as db:
+        with unit_of_work(db):
+            customer = create_user(db, {"email": "async_cust@test.com", "password_hash": "x", "role": "customer"})
+            agent = create_user(db, {"email": "async_agent@test.com", "password_hash": "x", "role": "agent"})
+            create_hub(db, {"hub_name": "Central", "city": "Madurai"})
+        with unit_of_work(db):
+            shipment = create_shipment(db, {
+                "tracking_number": "TRKA5YNC001",
+                "customer_id": customer.id,
+                "agent_id": agent.id,
+                "source_address": "Chennai",
+                "destination_address": "Bangalore",
+                "status": "created"
+            })
+
+    async def scenario():
+        async with async_session() as db:
+            assert (await async_user_repository.get_user_by_email(db, "async_agent@test.com")).id == agent.id
+            updated = await update_status_service_async(
+                db, shipment.id, {"status": "in_transit", "location": "Chennai Hub"}, agent
+            )
+            assert updated.status == "in_transit"
+
+            tracked = await track_shipment_async(db, "TRKA5YNC001")
+            assert tracked == {
+                "tracking_number": "TRKA5YNC001", "status": "in_transit", "current_location": "Chennai Hub", "version": 2
+            }
+            assert [s.id for s in await async_shipment_repository.get_shipments_by_customer(db, customer.id, 10)] == [shipment.id]
+            assert [h.city for h in await async_hub_repository.get_all_hubs(db)] == ["Madurai"]
+
+            with pytest.raises(HTTPException) as missing:
+                await track_shipment_async(db, "TRKMISSING")
+            assert missing.value.status_code == 404
+
+    asyncio.run(scenario())
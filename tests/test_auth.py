@@ -28,4 +28,48 @@ def test_login_invalid_credentials(client):
 
 def test_register_invalid_role(client):
     response = client.post("/auth/register", json={"email": "x@test.com", "password": "pass123", "role": "superuser"})
-    assert response.status_code == 400
\ No newline at end of file
+    assert response.status_code == 400
+
+def test_login_rejected_fast_when_hash_pool_saturated(client, monkeypatch):
+    import threading
+    from app.core import security
+
+    client.post("/auth/register", json={"email": "busy@test.com", "password": "pass123", "role": "customer"})
+    saturated = threading.BoundedSemaphore(1)
+    saturated.acquire()
+    monkeypatch.setattr(security, "_hash_slots", saturated)
+
+    response = client.post("/auth/login", data={"username": "busy@test.com", "password": "pass123"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_authorized_request_skips_user_lookup_once_cached(client, db_statements):
+    client.post("/auth/register", json={"email": "cached@test.com", "password": "pass123", "role": "admin"})
+    token = client.post("/auth/login", data={"username": "cached@test.com", "password": "pass123"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    db_statements.clear()
+
+    client.get("/admin/hubs", headers=headers)
+    first = [s for s in db_statements if "FROM users" in s]
+    db_statements.clear()
+
+    response = client.get("/admin/hubs", headers=headers)
+    assert response.status_code == 200
+    assert len(first) == 1
+    assert [s for s in db_statements if "FROM users" in s] == []
+    assert len(db_statements) == 1
+
+
+def test_deleted_user_token_is_rejected(client):
+    client.post("/auth/register", json={"email": "boss@test.com", "password": "pass123", "role": "admin"})
+    client.post("/auth/register", json={"email": "gone@test.com", "password": "pass123", "role": "admin"})
+    admin = client.post("/auth/login", data={"username": "boss@test.com", "password": "pass123"}).json()["access_token"]
+    gone = client.post("/auth/login", data={"username": "gone@test.com", "password": "pass123"}).json()["access_token"]
+
+    users = client.get("/admin/users", headers={"Authorization": f"Bearer {gone}"}).json()
+    gone_id = next(u["id"] for u in users if u["email"] == "gone@test.com")
+    client.delete(f"/admin/users/{gone_id}", headers={"Authorization": f"Bearer {admin}"})
+
+    response = client.get("/admin/users", headers={"Authorization": f"Bearer {gone}"})
+    assert response.status_code == 401
@@ -0,0 +1,90 @@
+# tests/test_bulk_shipments.py
+import json
+from app.api.routes import shipments
+from app.services import shipment_service
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def parcel(n):
+    return {"source_address": f"Chennai {n}", "destination_address": "Bangalore"}
+
+
+def test_bulk_json_array_creates_every_row(client, monkeypatch):
+    monkeypatch.setattr(shipment_service, "BULK_SHIPMENTS_CHUNK_SIZE", 4)
+    token = register_and_login(client, "bulk-customer@test.com", "customer")
+    response = client.post("/shipments/bulk", headers=auth(token), json=[parcel(n) for n in range(10)])
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (10, 0)
+    assert [result["row"] for result in body["results"]] == list(range(10))
+
+    listed = client.get("/shipments/", headers=auth(token)).json()
+    assert sorted(s["tracking_number"] for s in listed) == sorted(r["tracking_number"] for r in body["results"])
+    assert {s["source_address"] for s in listed} == {f"Chennai {n}" for n in range(10)}
+
+
+def test_bulk_ndjson_reports_bad_rows_and_inserts_the_rest(client):
+    token = register_and_login(client, "bulk-ndjson@test.com", "customer")
+    lines = [json.dumps(parcel(0)), "{not json", json.dumps({"source_address": "Chennai"}), "", json.dumps(parcel(3))]
+    response = client.post(
+        "/shipments/bulk",
+        headers={**auth(token), "Content-Type": "application/x-ndjson"},
+        content="\n".join(lines)
+    )
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 2)
+    results = body["results"]
+    assert results[0]["tracking_number"] and results[3]["tracking_number"]
+    assert results[1]["error"] == "Line is not valid JSON"
+    assert results[2]["error"] == "destination_address: Field required"
+
+
+def test_bulk_retries_taken_tracking_numbers(client, monkeypatch):
+    token = register_and_login(client, "bulk-retry@test.com", "customer")
+    taken = client.post("/shipments/", headers=auth(token), json=parcel(0)).json()["tracking_number"]
+    draws = iter([[taken], ["TRKRETRY01"]])
+    monkeypatch.setattr(shipment_service, "_tracking_numbers", lambda count: next(draws))
+
+    response = client.post("/shipments/bulk", headers=auth(token), json=[parcel(1)])
+    assert response.json()["results"] == [{"row": 0, "tracking_number": "TRKRETRY01", "error": None}]
+
+
+def test_bulk_rejects_bad_manifests(client, monkeypatch):
+    monkeypatch.setattr(shipment_service, "BULK_SHIPMENTS_MAX_ROWS", 2)
+    token = register_and_login(client, "bulk-bad@test.com", "customer")
+    assert client.post("/shipments/bulk", headers=auth(token), json=[parcel(n) for n in range(3)]).status_code == 413
+    assert client.post("/shipments/bulk", headers=auth(token), json=parcel(0)).status_code == 400
+    not_json = client.post("/shipments/bulk", headers={**auth(token), "Content-Type": "application/json"}, content="[{")
+    assert not_json.json()["error"] == "Manifest is not valid JSON"
+
+
+def test_oversized_manifest_is_refused_before_parsing(client, monkeypatch):
+    monkeypatch.setattr(shipments, "BULK_SHIPMENTS_MAX_BYTES", 100)
+    parsed = []
+    monkeypatch.setattr(shipments, "parse_manifest", lambda *args: parsed.append(args) or [])
+    token = register_and_login(client, "bulk-big@test.com", "customer")
+    manifest = json.dumps([parcel(n) for n in range(5)]).encode()
+
+    response = client.post("/shipments/bulk", headers={**auth(token), "Content-Type": "application/json"}, content=manifest)
+    assert response.status_code == 413
+    assert response.json()["error"] == "Manifest is over 100 bytes; split it into smaller uploads"
+
+    # Chunked, so no Content-Length to go by
+    chunks = (manifest[i:i + 40] for i in range(0, len(manifest), 40))
+    response = client.post("/shipments/bulk", headers={**auth(token), "Content-Type": "application/json"}, content=chunks)
+    assert response.status_code == 413
+    assert parsed == []
+
+
+def test_bulk_is_for_customers(client):
+    token = register_and_login(client, "bulk-agent@test.com", "agent")
+    assert client.post("/shipments/bulk", headers=auth(token), json=[parcel(0)]).status_code == 403
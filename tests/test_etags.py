@@ -0,0 +1,95 @@
+# tests/test_etags.py
+from app.utils.etags import matches
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def auth(token, etag=None):
+    headers = {"Authorization": f"Bearer {token}"}
+    if etag:
+        headers["If-None-Match"] = etag
+    return headers
+
+
+def create_shipment(client, token):
+    return client.post(
+        "/shipments/",
+        headers=auth(token),
+        json={"source_address": "Chennai", "destination_address": "Bangalore"}
+    ).json()
+
+
+def test_if_none_match_comparison():
+    assert matches('W/"3"', 'W/"3"')
+    assert matches('"3"', 'W/"3"')
+    assert matches('W/"1", W/"3"', 'W/"3"')
+    assert matches("*", 'W/"3"')
+    assert not matches('W/"2"', 'W/"3"')
+    assert not matches(None, 'W/"3"')
+
+
+def test_tracking_revalidates_until_the_shipment_changes(client):
+    admin = register_and_login(client, "etag-admin@test.com", "admin")
+    agent = register_and_login(client, "etag-agent@test.com", "agent")
+    customer = register_and_login(client, "etag-customer@test.com", "customer")
+    agent_id = next(u["id"] for u in client.get("/admin/users", headers=auth(admin)).json() if u["role"] == "agent")
+    shipment = create_shipment(client, customer)
+    url = f"/shipments/{shipment['tracking_number']}"
+
+    first = client.get(url, headers=auth(customer))
+    etag = first.headers["ETag"]
+    assert "version" not in first.json()
+    unchanged = client.get(url, headers=auth(customer, etag))
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["ETag"] == etag
+
+    client.put(f"/shipments/{shipment['id']}/assign-agent", headers=auth(admin), json={"agent_id": agent_id})
+    client.put(f"/shipments/{shipment['id']}/status", headers=auth(agent), json={"status": "in_transit", "location": "Salem"})
+    changed = client.get(url, headers=auth(customer, etag))
+    assert changed.status_code == 200
+    assert changed.json()["current_location"] == "Salem"
+    assert changed.headers["ETag"] != etag
+
+
+def test_shipment_list_revalidates_until_a_shipment_is_added(client):
+    customer = register_and_login(client, "etag-list@test.com", "customer")
+    create_shipment(client, customer)
+    etag = client.get("/shipments/", headers=auth(customer)).headers["ETag"]
+    assert client.get("/shipments/", headers=auth(customer, etag)).status_code == 304
+
+    create_shipment(client, customer)
+    changed = client.get("/shipments/", headers=auth(customer, etag))
+    assert changed.status_code == 200
+    assert len(changed.json()) == 2
+
+
+def test_revalidated_page_still_links_the_next_one(client):
+    customer = register_and_login(client, "etag-pages@test.com", "customer")
+    for _ in range(3):
+        create_shipment(client, customer)
+    first = client.get("/shipments/", headers=auth(customer), params={"limit": 2})
+    unchanged = client.get("/shipments/", headers=auth(customer, first.headers["ETag"]), params={"limit": 2})
+    assert unchanged.status_code == 304
+    assert unchanged.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    assert unchanged.headers["ETag"] == first.headers["ETag"]
+
+
+def test_hub_list_revalidates_until_a_hub_changes(client):
+    admin = register_and_login(client, "etag-hubs@test.com", "admin")
+    hub = client.post("/admin/hubs", headers=auth(admin), json={"hub_name": "Central", "city": "Chennai"}).json()
+    etag = client.get("/admin/hubs", headers=auth(admin)).headers["ETag"]
+    assert client.get("/admin/hubs", headers=auth(admin, etag)).status_code == 304
+
+    client.put(f"/admin/hubs/{hub['id']}", headers=auth(admin), json={"city": "Madurai"})
+    updated = client.get("/admin/hubs", headers=auth(admin, etag))
+    assert updated.status_code == 200
+    assert updated.json()[0]["city"] == "Madurai"
+
+    etag = updated.headers["ETag"]
+    client.delete(f"/admin/hubs/{hub['id']}", headers=auth(admin))
+    assert client.get("/admin/hubs", headers=auth(admin, etag)).json() == []
@@ -0,0 +1,78 @@
+# tests/test_metrics.py
+import json
+import os
+from app.core.metrics import Counter, Gauge, Histogram, Registry
+from app.middleware.rate_limiter import DEFAULT_QUOTA
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def sample(body, line_prefix):
+    for line in body.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_metrics_are_keyed_by_route_template(client):
+    token = register_and_login(client, "metrics1@test.com", "customer")
+    headers = {"Authorization": f"Bearer {token}"}
+    for number in ("TRK00000001", "TRK00000002", "TRK00000003"):
+        client.get(f"/shipments/{number}", headers=headers)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    labels = 'method="GET",route="/shipments/{tracking_number}",status="4xx"'
+    assert sample(body, f"http_requests_total{{{labels}}}") == 3
+    assert sample(body, f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}') == 3
+    assert sample(body, f"http_request_duration_seconds_count{{{labels}}}") == 3
+    assert "TRK00000001" not in body
+    # The scrape itself is in flight while it renders
+    assert sample(body, "http_requests_in_flight") == 1
+
+
+def test_rate_limit_rejections_are_counted(client):
+    for _ in range(DEFAULT_QUOTA.limit + 2):
+        client.get("/health")
+    body = client.get("/metrics").text
+    assert body.count("rate_limit_rejections_total{") == 1
+    assert sample(body, 'rate_limit_rejections_total{quota="default"}') >= 2
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0), registry=registry)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/x")
+    body = registry.render()
+    assert sample(body, 'latency_seconds_bucket{route="/x",le="0.1"}') == 2
+    assert sample(body, 'latency_seconds_bucket{route="/x",le="1"}') == 3
+    assert sample(body, 'latency_seconds_bucket{route="/x",le="+Inf"}') == 4
+    assert sample(body, 'latency_seconds_sum{route="/x"}') == 3.65
+
+
+def test_worker_snapshots_are_merged_at_scrape(tmp_path):
+    registry = Registry()
+    counter = Counter("jobs_total", "Jobs.", ("kind",), registry=registry)
+    gauge = Gauge("busy", "Busy workers.", registry=registry)
+    counter.inc("a")
+    gauge.inc()
+
+    # Another live worker (our parent) and one that has exited
+    live, dead = os.getppid(), 2 ** 22 + 1
+    for pid in (live, dead):
+        snapshot = {
+            "jobs_total": {"type": "counter", "help": "Jobs.", "labelnames": ["kind"], "values": [[["a"], 2]]},
+            "busy": {"type": "gauge", "help": "Busy workers.", "labelnames": [], "values": [[[], 5]]}
+        }
+        (tmp_path / f"metrics-{pid}.json").write_text(json.dumps(snapshot))
+
+    body = registry.render(str(tmp_path))
+    assert sample(body, 'jobs_total{kind="a"}') == 5
+    assert sample(body, "busy") == 6
@@ -0,0 +1,84 @@
+# tests/test_pool.py
+import sqlite3
+import threading
+import time
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.core.metrics import REGISTRY
+from app.core.pool import InstrumentedQueuePool, pool_options
+
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="test",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.2
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_options_follow_config():
+    assert pool_options("sqlite:///./test.db", "primary") == {}
+    options = pool_options("postgresql://u:p@localhost/db", "primary")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_logging_name"] == "primary"
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"} <= options.keys()
+
+
+def test_stats_track_checkouts_and_timeouts(pooled_engine):
+    with pooled_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        stats = pooled_engine.pool.stats()
+        assert stats["pool"] == "test"
+        assert stats["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            pooled_engine.connect()
+
+    stats = pooled_engine.pool.stats()
+    assert stats["checked_out"] == 0
+    # The attempt that timed out is not a checkout and does not skew their times
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["max_checkout_ms"] < 200
+
+
+def test_waiting_threads_are_counted(pooled_engine):
+    pooled_engine.pool._timeout = 2
+    held = pooled_engine.connect()
+    waiter = threading.Thread(target=lambda: pooled_engine.connect().close())
+    waiter.start()
+    deadline = time.time() + 2
+    while pooled_engine.pool.stats()["waiting"] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert pooled_engine.pool.stats()["waiting"] == 1
+    held.close()
+    waiter.join()
+    assert pooled_engine.pool.stats()["waiting"] == 0
+
+
+def test_checkouts_from_a_pool_with_room_do_not_wait(tmp_path):
+    def slow_connect():
+        time.sleep(0.3)
+        return sqlite3.connect(str(tmp_path / "slow.db"), check_same_thread=False)
+
+    engine = create_engine("sqlite://", creator=slow_connect, poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0)
+    opener = threading.Thread(target=lambda: engine.connect().close())
+    opener.start()
+    time.sleep(0.1)
+    # Opening a new connection is a slow checkout, not a wait for a full pool
+    assert engine.pool.stats()["waiting"] == 0
+    opener.join()
+    assert engine.pool.stats()["checkouts"] == 1
+    engine.dispose()
+
+
+def test_pool_metrics_are_exported(pooled_engine):
+    pooled_engine.connect().close()
+    body = REGISTRY.render()
+    assert 'db_pool_connections{pool="test",state="checked_out"} 0' in body
+    assert 'db_pool_checkout_seconds_count{pool="test"} 1' in body
@@ -0,0 +1,68 @@
+# tests/test_profiling.py
+import pstats
+import pytest
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.profiling.PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_admin_can_profile_a_request(client, tmp_path):
+    token = register_and_login(client, "prof_admin@test.com", "admin")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/admin/hubs", headers=headers)
+    response = client.get("/admin/reports", headers={**headers, "X-Profile": "1"})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    summary = client.get(f"/admin/profiles/{profile_id}", headers=headers).json()
+    assert summary["route"] == "/admin/reports"
+    assert summary["request_db_queries"] == 3
+    assert summary["db_ms"] > 0
+    assert summary["python_ms"] >= 0
+    assert summary["top_functions"]
+
+    listed = client.get("/admin/profiles", headers=headers).json()
+    assert [p["id"] for p in listed] == [profile_id]
+
+    download = client.get(f"/admin/profiles/{profile_id}/download", headers=headers)
+    assert download.status_code == 200
+    dump = tmp_path / "download.prof"
+    dump.write_bytes(download.content)
+    assert pstats.Stats(str(dump)).total_tt > 0
+
+
+def test_profile_flag_ignored_without_admin_token(client, tmp_path):
+    token = register_and_login(client, "prof_cust@test.com", "customer")
+    response = client.get("/shipments/", headers={"Authorization": f"Bearer {token}", "X-Profile": "1"})
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unflagged_admin_request_is_not_profiled(client, tmp_path):
+    token = register_and_login(client, "prof_plain@test.com", "admin")
+    response = client.get("/admin/hubs", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unknown_profile_returns_404(client):
+    token = register_and_login(client, "prof_404@test.com", "admin")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/admin/profiles/" + "0" * 32, headers=headers).status_code == 404
+    assert client.get("/admin/profiles/..%2Fsecrets/download", headers=headers).status_code == 404
+
+
+def test_profiles_require_admin(client):
+    token = register_and_login(client, "prof_agent@test.com", "agent")
+    assert client.get("/admin/profiles", headers={"Authorization": f"Bearer {token}"}).status_code == 403
@@ -0,0 +1,143 @@
+# tests/test_query_instrumentation.py
+import logging
+import re
+import pytest
+from app.core import database
+from app.core.database import normalize_sql
+from app.middleware.logging_middleware import logger
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+class Collector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def log_records():
+    collector = Collector()
+    logger.addHandler(collector)
+    yield collector.records
+    logger.removeHandler(collector)
+
+
+@pytest.fixture
+def shipment_flow(client):
+    admin = register_and_login(client, "qadmin@test.com", "admin")
+    agent = register_and_login(client, "qagent@test.com", "agent")
+    customer = register_and_login(client, "qcust@test.com", "customer")
+    agent_id = next(u["id"] for u in client.get("/admin/users", headers=auth(admin)).json() if u["role"] == "agent")
+    shipment = client.post(
+        "/shipments/",
+        headers=auth(customer),
+        json={"source_address": "Chennai", "destination_address": "Bangalore"}
+    ).json()
+    client.put(f"/shipments/{shipment['id']}/assign-agent", headers=auth(admin), json={"agent_id": agent_id})
+    # Budgets measure the steady state, with every principal already cached
+    client.get(f"/shipments/{shipment['tracking_number']}", headers=auth(agent))
+    return {"admin": admin, "agent": agent, "customer": customer, "shipment": shipment}
+
+
+def test_server_timing_reports_statements_of_the_request(client, shipment_flow, db_statements):
+    db_statements.clear()
+    response = client.get(
+        f"/shipments/{shipment_flow['shipment']['tracking_number']}",
+        headers=auth(shipment_flow["customer"])
+    )
+    timing = response.headers["Server-Timing"]
+    match = re.match(r'db;dur=([\d.]+);desc="(\d+) quer(?:y|ies)", app;dur=([\d.]+)$', timing)
+    assert match
+    assert int(match.group(2)) == len(db_statements)
+    assert float(match.group(1)) <= float(match.group(3))
+
+
+def test_access_log_carries_query_counts(client, log_records, monkeypatch):
+    monkeypatch.setattr("app.middleware.logging_middleware.ACCESS_LOG_SAMPLE_RATE", 1)
+    token = register_and_login(client, "qlog@test.com", "customer")
+    client.get("/shipments/", headers=auth(token))
+    fields = log_records[-1].fields
+    assert fields["route"] == "/shipments/"
+    assert fields["db_queries"] >= 1
+    assert fields["db_ms"] >= 0
+
+
+def test_track_query_budget(client, shipment_flow, query_budget):
+    # One point read; the shipment row carries its latest location
+    with query_budget(1):
+        client.get(
+            f"/shipments/{shipment_flow['shipment']['tracking_number']}",
+            headers=auth(shipment_flow["customer"])
+        )
+
+
+def test_create_shipment_query_budget(client, shipment_flow, query_budget):
+    # One INSERT; created_at comes back through RETURNING
+    with query_budget(1):
+        response = client.post(
+            "/shipments/",
+            headers=auth(shipment_flow["customer"]),
+            json={"source_address": "Madurai", "destination_address": "Mysore"}
+        )
+    assert response.status_code == 201
+    assert response.json()["created_at"]
+
+
+def test_update_status_query_budget(client, shipment_flow, query_budget):
+    # Conditional UPDATE ... RETURNING plus the history INSERT
+    with query_budget(2):
+        response = client.put(
+            f"/shipments/{shipment_flow['shipment']['id']}/status",
+            headers=auth(shipment_flow["agent"]),
+            json={"status": "in_transit", "location": "Chennai Hub"}
+        )
+    assert response.status_code == 200
+
+
+def test_add_tracking_query_budget(client, shipment_flow, query_budget):
+    with query_budget(2):
+        response = client.post(
+            f"/tracking/{shipment_flow['shipment']['id']}",
+            headers=auth(shipment_flow["agent"]),
+            json={"status": "in_transit", "location": "Chennai Hub"}
+        )
+    assert response.status_code == 201
+
+
+def test_repeated_statements_flagged_in_debug_mode(client, log_records, monkeypatch):
+    monkeypatch.setattr(database, "DB_DEBUG_QUERIES", True)
+    token = register_and_login(client, "qrep@test.com", "admin")
+    client.get("/admin/reports", headers=auth(token))
+    record = log_records[-1]
+    assert record.levelno == logging.WARNING
+    repeated = record.fields["repeated_queries"]
+    assert repeated[0]["count"] == 2
+    assert "shipments.status = ?" in repeated[0]["sql"]
+
+
+def test_slow_queries_are_logged_with_normalized_sql(client, log_records, monkeypatch):
+    monkeypatch.setattr(database, "DB_SLOW_QUERY_MS", 0)
+    token = register_and_login(client, "qslow@test.com", "customer")
+    client.get("/shipments/", headers=auth(token))
+    slow = [r for r in log_records if r.name == "logistics_logger.db"]
+    assert slow
+    assert all("duration_ms" in r.fields and "sql" in r.fields for r in slow)
+
+
+def test_normalize_sql():
+    assert normalize_sql("SELECT *\n  FROM t WHERE a = 'x' AND b = 42") == "SELECT * FROM t WHERE a = ? AND b = ?"
+    assert normalize_sql("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s, %(id_3)s)") == "SELECT * FROM t WHERE id IN (?)"
+    assert normalize_sql("SELECT * FROM t WHERE id = $1 AND x = :x") == "SELECT * FROM t WHERE id = ? AND x = ?"
+    assert normalize_sql("SELECT CAST(a AS DATE) FROM param_1") == "SELECT CAST(a AS DATE) FROM param_1"
@@ -0,0 +1,171 @@
+import sqlite3
+import time
+
+import pytest
+
+from app.middleware.rate_limit_backends import BackendUnavailable, RateLimitBackend, SlidingWindowLimiter, SQLiteBackend
+
+
+def test_limiter_blocks_after_limit_within_window():
+    limiter = SlidingWindowLimiter(limit=3, window_seconds=60, max_keys=10)
+    assert [limiter.hit("ip", now=600.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.hit("ip", now=601.0) > 0
+
+
+def test_limiter_weights_previous_window():
+    limiter = SlidingWindowLimiter(limit=4, window_seconds=60, max_keys=10)
+    for _ in range(4):
+        limiter.hit("ip", now=600.0)
+    # Halfway through the next window, half of the previous count still applies
+    assert limiter.hit("ip", now=690.0) == 0.0
+    assert limiter.hit("ip", now=690.0) == 0.0
+    assert limiter.hit("ip", now=690.0) > 0
+
+
+def test_limiter_evicts_least_recently_seen_key_at_cap():
+    limiter = SlidingWindowLimiter(limit=5, window_seconds=60, max_keys=2)
+    limiter.hit("a", now=600.0)
+    limiter.hit("b", now=600.0)
+    limiter.hit("a", now=601.0)
+    limiter.hit("c", now=602.0)
+    assert len(limiter) == 2
+    assert "b" not in limiter._entries
+
+
+def test_sweep_removes_only_idle_keys():
+    limiter = SlidingWindowLimiter(limit=5, window_seconds=60, max_keys=10)
+    limiter.hit("idle", now=600.0)
+    limiter.hit("active", now=700.0)
+    assert limiter.sweep(now=730.0) == 1
+    assert list(limiter._entries) == ["active"]
+
+
+def test_sqlite_backend_enforces_one_quota_across_connections(tmp_path):
+    path = str(tmp_path / "limits.db")
+    worker_a = SQLiteBackend(path, limit=5, window_seconds=60)
+    worker_b = SQLiteBackend(path, limit=5, window_seconds=60)
+    results = [backend.hit("ip", now=600.0) for backend in (worker_a, worker_b) * 4]
+    assert results.count(0.0) == 5
+    assert all(retry > 0 for retry in results[5:])
+
+
+def test_sqlite_backend_leases_never_exceed_global_quota(tmp_path):
+    path = str(tmp_path / "limits.db")
+    worker_a = SQLiteBackend(path, limit=10, window_seconds=60, lease_size=4)
+    worker_b = SQLiteBackend(path, limit=10, window_seconds=60, lease_size=4)
+    allowed = sum(1 for backend in (worker_a, worker_b) * 10 if backend.hit("ip", now=600.0) == 0.0)
+    assert allowed == 10
+
+
+def test_sqlite_backend_sweep_drops_expired_windows(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "limits.db"), limit=5, window_seconds=60)
+    backend.hit("old", now=600.0)
+    backend.hit("new", now=700.0)
+    assert backend.sweep(now=730.0) == 1
+
+
+def test_backend_missing_methods_fails_at_construction():
+    class Incomplete(RateLimitBackend):
+        def reset(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_sqlite_backend_gives_up_quickly_while_write_lock_is_held(tmp_path):
+    path = str(tmp_path / "limits.db")
+    backend = SQLiteBackend(path, limit=5, window_seconds=60, busy_timeout=0.05)
+    backend.hit("ip", now=600.0)
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        start = time.perf_counter()
+        with pytest.raises(BackendUnavailable):
+            backend.hit("ip", now=601.0)
+        with pytest.raises(BackendUnavailable):
+            backend.sweep(now=730.0)
+        assert time.perf_counter() - start < 1
+    finally:
+        holder.rollback()
+        holder.close()
+    assert backend.hit("ip", now=602.0) == 0.0
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def test_anonymous_requests_share_default_quota_per_ip(client, monkeypatch):
+    from app.middleware.rate_limiter import DEFAULT_QUOTA
+    monkeypatch.setattr(DEFAULT_QUOTA, "backend", SlidingWindowLimiter(limit=2, window_seconds=60, max_keys=10))
+    assert client.get("/health").status_code == 200
+    assert client.get("/health").status_code == 200
+    response = client.get("/health")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_expensive_reports_do_not_starve_tracking_lookups(client, monkeypatch):
+    from app.middleware.rate_limiter import ADMIN_QUOTA
+    token = register_and_login(client, "admin@limits.com", "admin")
+    headers = {"Authorization": f"Bearer {token}"}
+    monkeypatch.setattr(ADMIN_QUOTA, "backend", SlidingWindowLimiter(limit=25, window_seconds=60, max_keys=10))
+
+    # /admin/reports costs 10 tokens, so the third call exceeds a quota of 25
+    assert client.get("/admin/reports", headers=headers).status_code == 200
+    assert client.get("/admin/reports", headers=headers).status_code == 200
+    assert client.get("/admin/reports", headers=headers).status_code == 429
+    # A cheap admin call still fits in the 5 tokens left
+    assert client.get("/admin/hubs", headers=headers).status_code == 200
+
+    # Tracking draws from its own quota and is unaffected
+    assert client.get("/shipments/TRKMISSING", headers=headers).status_code == 404
+
+
+def test_each_role_has_its_own_bucket(client, monkeypatch):
+    from app.middleware.rate_limiter import DEFAULT_QUOTA
+    customer = register_and_login(client, "customer@limits.com", "customer")
+    agent = register_and_login(client, "agent@limits.com", "agent")
+    monkeypatch.setattr(DEFAULT_QUOTA, "backend", SlidingWindowLimiter(limit=1, window_seconds=60, max_keys=10))
+
+    assert client.get("/health", headers={"Authorization": f"Bearer {customer}"}).status_code == 200
+    assert client.get("/health", headers={"Authorization": f"Bearer {customer}"}).status_code == 429
+    assert client.get("/health", headers={"Authorization": f"Bearer {agent}"}).status_code == 200
+
+
+def test_unmatched_paths_draw_from_default_quota(client, monkeypatch):
+    from app.middleware.rate_limiter import DEFAULT_QUOTA
+    monkeypatch.setattr(DEFAULT_QUOTA, "backend", SlidingWindowLimiter(limit=3, window_seconds=60, max_keys=10))
+    assert [client.get("/nope").status_code for _ in range(3)] == [404, 404, 404]
+    response = client.get("/nope")
+    assert response.status_code == 429
+    assert response.json()["error"] == "Too many requests. Please try again later."
+    assert int(response.headers["Retry-After"]) >= 1
+    # Same bucket as routed requests
+    assert client.get("/health").status_code == 429
+
+
+def test_wrong_method_draws_from_default_quota(client, monkeypatch):
+    from app.middleware.rate_limiter import DEFAULT_QUOTA
+    monkeypatch.setattr(DEFAULT_QUOTA, "backend", SlidingWindowLimiter(limit=2, window_seconds=60, max_keys=10))
+    assert [client.delete("/health").status_code for _ in range(3)] == [405, 405, 429]
+
+
+def test_locked_store_lets_requests_through_and_counts_them(client, monkeypatch, tmp_path):
+    from app.core.metrics import RATE_LIMIT_BACKEND_ERRORS
+    from app.middleware.rate_limiter import DEFAULT_QUOTA
+    path = str(tmp_path / "limits.db")
+    backend = SQLiteBackend(path, limit=1, window_seconds=60, busy_timeout=0.05)
+    backend.hit("warm-up")
+    monkeypatch.setattr(DEFAULT_QUOTA, "backend", backend)
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        assert [client.get("/health").status_code for _ in range(3)] == [200, 200, 200]
+    finally:
+        holder.rollback()
+        holder.close()
+    assert RATE_LIMIT_BACKEND_ERRORS._values[("default",)] == 3
@@ -0,0 +1,163 @@
+# tests/test_replica.py
+import uuid
+import pytest
+from sqlalchemy import QueuePool, create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from app.main import app
+from app.core import replica
+from app.core.database import async_url, get_replica_db, get_async_replica_db
+from app.core.metrics import REGISTRY
+from app.models.shipment import Shipment
+from app.services.tracking_cache import snapshot_cache
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def replica_only_shipment(ReplicaSession, tracking_number):
+    with ReplicaSession() as db:
+        db.add(Shipment(
+            tracking_number=tracking_number,
+            customer_id=uuid.uuid4(),
+            source_address="Chennai",
+            destination_address="Bangalore",
+            status="created"
+        ))
+        db.commit()
+
+
+def routed(target, reason):
+    values = REGISTRY.snapshot()["db_read_routing_total"]["values"]
+    return sum(count for labels, count in values if labels == [target, reason])
+
+
+@pytest.fixture
+def customer(client, replica_db):
+    token = register_and_login(client, "replica_cust@test.com", "customer")
+    client.cookies.clear()
+    return token
+
+
+def test_reads_go_to_the_replica(client, replica_db, customer):
+    replica_only_shipment(replica_db, "TRKREPLICA01")
+    response = client.get("/shipments/TRKREPLICA01", headers=auth(customer))
+    assert response.status_code == 200
+    assert routed("replica", "ok") == 1
+
+
+def test_replica_reads_do_not_fill_the_tracking_cache(client, replica_db, customer, monkeypatch):
+    replica_only_shipment(replica_db, "TRKREPLICA03")
+    assert client.get("/shipments/TRKREPLICA03", headers=auth(customer)).status_code == 200
+    assert client.post(
+        "/shipments/track/batch", headers=auth(customer), json={"tracking_numbers": ["TRKREPLICA03"]}
+    ).json()["results"][0]["found"]
+    assert snapshot_cache.get("TRKREPLICA03") is None
+
+    # A read that falls back to the primary still fills it
+    created = client.post(
+        "/shipments/", headers=auth(customer), json={"source_address": "Chennai", "destination_address": "Bangalore"}
+    ).json()
+    assert client.get(f"/shipments/{created['tracking_number']}", headers=auth(customer)).status_code == 200
+    assert snapshot_cache.get(created["tracking_number"]) is not None
+
+
+def test_writer_reads_own_writes_from_primary(client, replica_db, customer):
+    created = client.post(
+        "/shipments/",
+        headers=auth(customer),
+        json={"source_address": "Chennai", "destination_address": "Bangalore"}
+    )
+    assert replica.READ_PRIMARY_COOKIE in created.cookies
+
+    # Pinned by the cookie and by the worker's own record of the write
+    assert len(client.get("/shipments/", headers=auth(customer)).json()) == 1
+    client.cookies.clear()
+    assert len(client.get("/shipments/", headers=auth(customer)).json()) == 1
+    assert routed("primary", "recent_write") == 2
+
+    # Once the window is over the list comes from the (empty) replica
+    replica.recent_writers.clear()
+    assert client.get("/shipments/", headers=auth(customer)).json() == []
+
+
+def test_reads_that_commit_nothing_do_not_pin(client, replica_db, customer):
+    response = client.get("/shipments/", headers=auth(customer))
+    assert replica.READ_PRIMARY_COOKIE not in response.cookies
+
+
+def test_lagging_replica_falls_back_to_primary(client, replica_db, customer, monkeypatch):
+    replica_only_shipment(replica_db, "TRKREPLICA02")
+    monkeypatch.setattr(replica, "replica_lag", lambda conn: 60.0)
+    assert client.get("/shipments/TRKREPLICA02", headers=auth(customer)).status_code == 404
+    assert routed("primary", "lag") == 1
+
+    # Lag is only re-measured every REPLICA_CHECK_INTERVAL_SECONDS
+    monkeypatch.setattr(replica, "replica_lag", lambda conn: 0.0)
+    assert client.get("/shipments/TRKREPLICA02", headers=auth(customer)).status_code == 404
+    replica.replica_health.next_check = 0
+    assert client.get("/shipments/TRKREPLICA02", headers=auth(customer)).status_code == 200
+
+
+def test_unreachable_replica_falls_back_to_primary(client, replica_db, customer):
+    missing = "/nonexistent-dir/replica.db"
+
+    def broken_replica():
+        with Session(create_engine(f"sqlite:///{missing}")) as db:
+            yield db
+
+    async def broken_async_replica():
+        async with AsyncSession(create_async_engine(f"sqlite+aiosqlite:///{missing}")) as db:
+            yield db
+
+    # replica_db removes these overrides on teardown
+    app.dependency_overrides[get_replica_db] = broken_replica
+    app.dependency_overrides[get_async_replica_db] = broken_async_replica
+    client.post("/shipments/", headers=auth(customer), json={"source_address": "A", "destination_address": "B"})
+    client.cookies.clear()
+    replica.recent_writers.clear()
+
+    assert len(client.get("/shipments/", headers=auth(customer)).json()) == 1
+    assert len(client.get("/shipments/", headers=auth(customer)).json()) == 1
+    # The second read skipped the replica without trying it again
+    assert routed("primary", "down") == 2
+    assert replica.replica_health.down_until > 0
+
+
+def test_exhausted_replica_pool_falls_back_to_primary(client, replica_db, customer):
+    url = "sqlite:///./test_replica.db"
+
+    def exhausted_replica():
+        engine = create_engine(url, poolclass=QueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01)
+        with engine.connect(), Session(engine) as db:
+            yield db
+        engine.dispose()
+
+    async def exhausted_async_replica():
+        engine = create_async_engine(async_url(url), pool_size=1, max_overflow=0, pool_timeout=0.01)
+        async with engine.connect(), AsyncSession(engine) as db:
+            yield db
+        await engine.dispose()
+
+    # replica_db removes these overrides on teardown
+    app.dependency_overrides[get_replica_db] = exhausted_replica
+    app.dependency_overrides[get_async_replica_db] = exhausted_async_replica
+
+    assert client.get("/shipments/", headers=auth(customer)).status_code == 200
+    assert routed("primary", "down") == 1
+    assert replica.replica_health.down_until > 0
+
+
+def test_without_replica_reads_use_primary(client):
+    token = register_and_login(client, "noreplica@test.com", "customer")
+    response = client.get("/shipments/", headers=auth(token))
+    assert response.status_code == 200
+    assert replica.READ_PRIMARY_COOKIE not in response.cookies
+    assert REGISTRY.snapshot()["db_read_routing_total"]["values"] == []
@@ -0,0 +1,73 @@
+# tests/test_shipment_pagination.py
+from datetime import datetime
+from uuid import uuid4
+import pytest
+from app.utils.pagination import decode_cursor, encode_cursor
+
+SHIPMENTS = 7
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def customer(client):
+    token = register_and_login(client, "page-customer@test.com", "customer")
+    for n in range(SHIPMENTS):
+        client.post(
+            "/shipments/",
+            headers=auth(token),
+            json={"source_address": f"Chennai {n}", "destination_address": "Bangalore"}
+        )
+    return token
+
+
+def all_pages(client, token, **params):
+    pages, cursor = [], None
+    while True:
+        response = client.get("/shipments/", headers=auth(token), params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+
+
+def test_pages_cover_every_shipment_once_newest_first(client, customer):
+    pages = all_pages(client, customer, limit=3)
+    assert [len(page) for page in pages] == [3, 3, 1]
+    rows = [row for page in pages for row in page]
+    assert len({row["id"] for row in rows}) == SHIPMENTS
+    assert rows == sorted(rows, key=lambda row: (row["created_at"], row["id"]), reverse=True)
+
+
+def test_last_page_has_no_cursor(client, customer):
+    response = client.get("/shipments/", headers=auth(customer), params={"limit": SHIPMENTS})
+    assert len(response.json()) == SHIPMENTS
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_status_and_date_filters(client, customer):
+    assert client.get("/shipments/", headers=auth(customer), params={"status": "delivered"}).json() == []
+    assert len(client.get("/shipments/", headers=auth(customer), params={"status": "created"}).json()) == SHIPMENTS
+    later = client.get("/shipments/", headers=auth(customer), params={"created_from": "2999-01-01T00:00:00"})
+    assert later.json() == []
+
+
+def test_bad_list_parameters_are_rejected(client, customer):
+    headers = auth(customer)
+    assert client.get("/shipments/", headers=headers, params={"cursor": "not-a-cursor"}).json()["error"] == "Invalid cursor"
+    assert client.get("/shipments/", headers=headers, params={"status": "lost"}).status_code == 400
+    assert client.get("/shipments/", headers=headers, params={"limit": 0}).status_code == 422
+
+
+def test_cursor_round_trip():
+    key = (datetime(2026, 10, 18, 9, 30, 15), uuid4())
+    assert decode_cursor(encode_cursor(*key)) == key
@@ -0,0 +1,161 @@
+# tests/test_status_transitions.py
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from app.models.tracking import TrackingUpdate
+from app.repositories.shipment_repository import create_shipment
+from app.repositories.user_repository import create_user
+from app.services.shipment_service import update_status_service, update_status_service_async
+from app.services.unit_of_work import unit_of_work
+
+RACERS = 8
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def assigned(client):
+    admin = register_and_login(client, "tr-admin@test.com", "admin")
+    agent = register_and_login(client, "tr-agent@test.com", "agent")
+    customer = register_and_login(client, "tr-customer@test.com", "customer")
+    agent_id = next(u["id"] for u in client.get("/admin/users", headers=auth(admin)).json() if u["role"] == "agent")
+    shipment = client.post(
+        "/shipments/",
+        headers=auth(customer),
+        json={"source_address": "Chennai", "destination_address": "Bangalore"}
+    ).json()
+    client.put(f"/shipments/{shipment['id']}/assign-agent", headers=auth(admin), json={"agent_id": agent_id})
+    return shipment, agent
+
+
+@pytest.fixture
+def seeded(sync_session):
+    with sync_session() as db:
+        with unit_of_work(db):
+            customer = create_user(db, {"email": "race-cust@test.com", "password_hash": "x", "role": "customer"})
+            agent = create_user(db, {"email": "race-agent@test.com", "password_hash": "x", "role": "agent"})
+        with unit_of_work(db):
+            shipment = create_shipment(db, {
+                "tracking_number": "TRKRACE0001",
+                "customer_id": customer.id,
+                "agent_id": agent.id,
+                "source_address": "Chennai",
+                "destination_address": "Bangalore",
+                "status": "created"
+            })
+    return shipment.id, agent
+
+
+def history(sync_session, shipment_id):
+    with sync_session() as db:
+        return db.query(TrackingUpdate).filter(TrackingUpdate.shipment_id == shipment_id).count()
+
+
+def test_transition_bumps_version(client, assigned):
+    shipment, agent = assigned
+    response = client.put(
+        f"/shipments/{shipment['id']}/status",
+        headers=auth(agent),
+        json={"status": "in_transit", "location": "Chennai Hub"}
+    )
+    assert response.status_code == 200
+    assert response.json()["version"] == shipment["version"] + 2  # assignment, then the transition
+
+
+def test_repeated_transition_is_a_conflict(client, assigned):
+    shipment, agent = assigned
+    update = {"status": "in_transit", "location": "Chennai Hub"}
+    assert client.put(f"/shipments/{shipment['id']}/status", headers=auth(agent), json=update).status_code == 200
+    retry = client.put(f"/shipments/{shipment['id']}/status", headers=auth(agent), json=update)
+    assert retry.status_code == 409
+    assert "already 'in_transit'" in retry.json()["error"]
+
+
+def test_stale_version_is_a_conflict(client, assigned):
+    shipment, agent = assigned
+    response = client.put(
+        f"/shipments/{shipment['id']}/status",
+        headers=auth(agent),
+        json={"status": "in_transit", "location": "Chennai Hub", "version": shipment["version"]}
+    )
+    assert response.status_code == 409
+    assert response.json()["error"] == f"Shipment is at version {shipment['version'] + 1}, not {shipment['version']}"
+
+
+def test_skipping_a_status_is_still_invalid(client, assigned):
+    shipment, agent = assigned
+    response = client.put(
+        f"/shipments/{shipment['id']}/status",
+        headers=auth(agent),
+        json={"status": "delivered", "location": "Bangalore"}
+    )
+    assert response.status_code == 400
+
+
+def test_going_back_is_invalid_not_a_conflict(client, assigned):
+    shipment, agent = assigned
+    for status in ("in_transit", "out_for_delivery", "delivered"):
+        client.put(f"/shipments/{shipment['id']}/status", headers=auth(agent), json={"status": status, "location": "Hub"})
+
+    response = client.put(
+        f"/shipments/{shipment['id']}/status",
+        headers=auth(agent),
+        json={"status": "in_transit", "location": "Bangalore"}
+    )
+    assert response.status_code == 400
+    assert response.json()["error"] == "Invalid transition. Current status is 'delivered'. No further status allowed"
+    back_to_created = {"status": "created", "location": "Bangalore"}
+    assert client.put(f"/shipments/{shipment['id']}/status", headers=auth(agent), json=back_to_created).status_code == 400
+
+
+def test_parallel_transitions_apply_once(sync_session, seeded):
+    shipment_id, agent = seeded
+    start = threading.Barrier(RACERS)
+    outcomes = []
+
+    def race():
+        with sync_session() as db:
+            start.wait()
+            try:
+                update_status_service(db, shipment_id, {"status": "in_transit", "location": "Hub", "version": None}, agent)
+                outcomes.append(200)
+            except HTTPException as error:
+                outcomes.append(error.status_code)
+
+    threads = [threading.Thread(target=race) for _ in range(RACERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(outcomes) == [200] + [409] * (RACERS - 1)
+    assert history(sync_session, shipment_id) == 1
+
+
+def test_parallel_async_transitions_apply_once(async_session, sync_session, seeded):
+    shipment_id, agent = seeded
+
+    async def race():
+        async with async_session() as db:
+            try:
+                await update_status_service_async(
+                    db, shipment_id, {"status": "in_transit", "location": "Hub", "version": None}, agent
+                )
+                return 200
+            except HTTPException as error:
+                return error.status_code
+
+    async def scenario():
+        return await asyncio.gather(*(race() for _ in range(RACERS)))
+
+    assert sorted(asyncio.run(scenario())) == [200] + [409] * (RACERS - 1)
+    assert history(sync_session, shipment_id) == 1
@@ -1,3 +1,8 @@
+import uuid
+from app.models.shipment import Shipment
+from app.models.tracking import TrackingUpdate
+
+
 def register_and_login(client, email, role):
     client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
     login = client.post("/auth/login", data={"username": email, "password": "pass123"})
@@ -101,4 +106,68 @@ def test_update_status(client):
         headers={"Authorization": f"Bearer {agent_token}"},
         json={"status": "in_transit", "location": "Salem"}
     )
-    assert response.status_code == 200
\ No newline at end of file
+    assert response.status_code == 200
+
+
+def assigned_shipment(client, prefix):
+    admin_token = register_and_login(client, f"{prefix}-admin@test.com", "admin")
+    customer_token = register_and_login(client, f"{prefix}-customer@test.com", "customer")
+    agent_token = register_and_login(client, f"{prefix}-agent@test.com", "agent")
+    shipment = create_shipment(client, customer_token)
+    users = client.get("/admin/users", headers={"Authorization": f"Bearer {admin_token}"}).json()
+    agent = next(u for u in users if u["email"] == f"{prefix}-agent@test.com")
+    client.put(
+        f"/shipments/{shipment['id']}/assign-agent",
+        headers={"Authorization": f"Bearer {admin_token}"},
+        json={"agent_id": agent["id"]}
+    )
+    return shipment, customer_token, agent_token
+
+
+def last_event(sync_session, shipment):
+    with sync_session() as db:
+        row = db.get(Shipment, uuid.UUID(shipment["id"]))
+        latest = db.query(TrackingUpdate).filter(TrackingUpdate.shipment_id == row.id).order_by(
+            TrackingUpdate.updated_at.desc()
+        ).first()
+        return row, latest
+
+
+def test_events_are_copied_onto_the_shipment(client, sync_session):
+    shipment, customer_token, agent_token = assigned_shipment(client, "last-event")
+    agent = {"Authorization": f"Bearer {agent_token}"}
+
+    client.put(f"/shipments/{shipment['id']}/status", headers=agent, json={"status": "in_transit", "location": "Salem"})
+    row, latest = last_event(sync_session, shipment)
+    assert (row.current_location, row.last_event_status) == ("Salem", "in_transit")
+    assert row.last_event_at == latest.updated_at
+
+    response = client.post(f"/tracking/{shipment['id']}", headers=agent, json={"status": "in_transit", "location": "Erode Hub"})
+    assert response.status_code == 201
+    row, latest = last_event(sync_session, shipment)
+    assert (row.current_location, row.last_event_status) == ("Erode Hub", "in_transit")
+    assert row.last_event_at == latest.updated_at
+    assert row.version == 4  # assignment, transition, tracking event
+
+    tracked = client.get(f"/shipments/{shipment['tracking_number']}", headers={"Authorization": f"Bearer {customer_token}"})
+    assert tracked.json()["current_location"] == "Erode Hub"
+
+
+def test_unassigned_agent_cannot_add_tracking(client, sync_session):
+    shipment, _, _ = assigned_shipment(client, "last-event-403")
+    other = register_and_login(client, "last-event-other@test.com", "agent")
+    response = client.post(
+        f"/tracking/{shipment['id']}",
+        headers={"Authorization": f"Bearer {other}"},
+        json={"status": "in_transit", "location": "Erode Hub"}
+    )
+    assert response.status_code == 403
+    row, latest = last_event(sync_session, shipment)
+    assert row.current_location is None and latest is None
+
+    missing = client.post(
+        f"/tracking/{uuid.uuid4()}",
+        headers={"Authorization": f"Bearer {other}"},
+        json={"status": "in_transit", "location": "Erode Hub"}
+    )
+    assert missing.status_code == 404
@@ -0,0 +1,92 @@
+# tests/test_tracking_batch.py
+import re
+from app.core.config import TRACK_BATCH_MAX_SIZE
+from app.utils.tracking_numbers import ALPHABET
+
+QUERIES = re.compile(r'desc="(\d+) quer')
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def queries(response):
+    return int(QUERIES.search(response.headers["Server-Timing"]).group(1))
+
+
+def create_shipments(client, token, count):
+    return [
+        client.post(
+            "/shipments/",
+            headers=auth(token),
+            json={"source_address": "Chennai", "destination_address": f"{n} MG Road, Bangalore"}
+        ).json()["tracking_number"]
+        for n in range(count)
+    ]
+
+
+def mistype(tracking_number):
+    wrong = ALPHABET[(ALPHABET.index(tracking_number[-1]) + 1) % len(ALPHABET)]
+    return tracking_number[:-1] + wrong
+
+
+def track_batch(client, token, numbers):
+    return client.post("/shipments/track/batch", headers=auth(token), json={"tracking_numbers": numbers})
+
+
+def test_results_follow_request_order(client):
+    token = register_and_login(client, "batch@test.com", "customer")
+    first, second, third = create_shipments(client, token, 3)
+    numbers = [third, "TRKMISSING", first, mistype(second), third]
+
+    response = track_batch(client, token, numbers)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["tracking_number"] for r in results] == numbers
+    assert [r["found"] for r in results] == [True, False, True, False, True]
+    assert results[0] == {"tracking_number": third, "found": True, "status": "created", "current_location": None}
+    assert results[1] == {"tracking_number": "TRKMISSING", "found": False, "status": None, "current_location": None}
+
+
+def test_batch_is_one_query_then_cached(client):
+    token = register_and_login(client, "batch-cache@test.com", "customer")
+    numbers = create_shipments(client, token, 5)
+    client.get("/shipments/", headers=auth(token))  # warm the principal cache
+
+    cold = track_batch(client, token, numbers + ["TRKMISSING"])
+    assert queries(cold) == 1
+    warm = track_batch(client, token, numbers)
+    assert queries(warm) == 0
+    assert [r["found"] for r in warm.json()["results"]] == [True] * 5
+
+
+def test_batch_sees_tracking_updates(client):
+    admin = register_and_login(client, "batch-admin@test.com", "admin")
+    agent = register_and_login(client, "batch-agent@test.com", "agent")
+    customer = register_and_login(client, "batch-customer@test.com", "customer")
+    agent_id = next(u["id"] for u in client.get("/admin/users", headers=auth(admin)).json() if u["role"] == "agent")
+    (number,) = create_shipments(client, customer, 1)
+    shipment_id = client.get("/shipments/", headers=auth(customer)).json()[0]["id"]
+    track_batch(client, customer, [number])
+
+    client.put(f"/shipments/{shipment_id}/assign-agent", headers=auth(admin), json={"agent_id": agent_id})
+    client.put(f"/shipments/{shipment_id}/status", headers=auth(agent), json={"status": "in_transit", "location": "Salem Hub"})
+    (result,) = track_batch(client, customer, [number]).json()["results"]
+    assert (result["status"], result["current_location"]) == ("in_transit", "Salem Hub")
+
+
+def test_batch_size_is_bounded(client):
+    token = register_and_login(client, "batch-limit@test.com", "customer")
+    assert track_batch(client, token, []).status_code == 422
+    assert track_batch(client, token, ["TRKMISSING"] * (TRACK_BATCH_MAX_SIZE + 1)).status_code == 422
+    assert track_batch(client, token, ["TRKMISSING"] * TRACK_BATCH_MAX_SIZE).status_code == 200
+
+
+def test_batch_requires_auth(client):
+    assert client.post("/shipments/track/batch", json={"tracking_numbers": ["TRKMISSING"]}).status_code == 401
@@ -0,0 +1,110 @@
+# tests/test_tracking_cache.py
+import re
+from app.services import tracking_cache
+from app.services.tracking_cache import snapshot_cache
+
+QUERIES = re.compile(r'desc="(\d+) quer')
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def queries(response):
+    return int(QUERIES.search(response.headers["Server-Timing"]).group(1))
+
+
+def setup_shipment(client):
+    admin = register_and_login(client, "cache-admin@test.com", "admin")
+    agent = register_and_login(client, "cache-agent@test.com", "agent")
+    customer = register_and_login(client, "cache-customer@test.com", "customer")
+    agent_id = next(u["id"] for u in client.get("/admin/users", headers=auth(admin)).json() if u["role"] == "agent")
+    shipment = client.post(
+        "/shipments/",
+        headers=auth(customer),
+        json={"source_address": "Chennai", "destination_address": "Bangalore"}
+    ).json()
+    return shipment, admin, agent, customer, agent_id
+
+
+def track(client, shipment, token):
+    return client.get(f"/shipments/{shipment['tracking_number']}", headers=auth(token))
+
+
+def test_repeat_lookup_is_served_from_cache(client):
+    shipment, _, _, customer, _ = setup_shipment(client)
+    first = track(client, shipment, customer)
+    second = track(client, shipment, customer)
+    assert second.json() == first.json()
+    assert queries(first) >= 1
+    assert queries(second) == 0
+
+
+def test_writes_invalidate_the_snapshot(client):
+    shipment, admin, agent, customer, agent_id = setup_shipment(client)
+    track(client, shipment, customer)
+
+    client.put(f"/shipments/{shipment['id']}/assign-agent", headers=auth(admin), json={"agent_id": agent_id})
+    assert snapshot_cache.get(shipment["tracking_number"]) is None
+    track(client, shipment, customer)
+
+    client.put(f"/shipments/{shipment['id']}/status", headers=auth(agent), json={"status": "in_transit", "location": "Chennai Hub"})
+    assert track(client, shipment, customer).json()["status"] == "in_transit"
+
+    client.post(f"/tracking/{shipment['id']}", headers=auth(agent), json={"status": "in_transit", "location": "Vellore"})
+    assert track(client, shipment, customer).json()["current_location"] == "Vellore"
+
+
+def test_cancel_invalidates_the_snapshot(client):
+    shipment, _, _, customer, _ = setup_shipment(client)
+    assert track(client, shipment, customer).status_code == 200
+    client.delete(f"/shipments/{shipment['id']}", headers=auth(customer))
+    assert track(client, shipment, customer).status_code == 404
+
+
+def test_lookup_racing_a_write_does_not_refill_the_old_snapshot():
+    snapshot, epoch = tracking_cache.lookup("TRKRACING01")
+    assert snapshot is None
+    tracking_cache.invalidate("TRKRACING01")
+    tracking_cache.store("TRKRACING01", {"status": "created"}, epoch, 0.0)
+    assert tracking_cache.lookup("TRKRACING01")[0] is None
+
+
+def test_write_to_one_shipment_does_not_block_filling_another():
+    _, epoch = tracking_cache.lookup("TRKFILLING01")
+    tracking_cache.invalidate("TRKWRITTEN01")
+    tracking_cache.store("TRKFILLING01", {"status": "created"}, epoch, 0.0)
+    assert tracking_cache.lookup("TRKFILLING01")[0] == {"status": "created"}
+
+    _, epoch = tracking_cache.lookup_many(["TRKFILLING02", "TRKWRITTEN02"])
+    tracking_cache.invalidate("TRKWRITTEN02")
+    tracking_cache.store_many({"TRKFILLING02": {"status": "created"}, "TRKWRITTEN02": {"status": "created"}}, epoch)
+    assert tracking_cache.lookup("TRKFILLING02")[0] == {"status": "created"}
+    assert tracking_cache.lookup("TRKWRITTEN02")[0] is None
+
+
+def test_dropped_stamps_still_block_older_fills(monkeypatch):
+    monkeypatch.setattr(tracking_cache, "TRACKING_CACHE_MAX_ENTRIES", 2)
+    _, epoch = tracking_cache.lookup("TRKSTAMPED01")
+    for number in ("TRKSTAMPED01", "TRKSTAMPED02", "TRKSTAMPED03"):
+        tracking_cache.invalidate(number)
+    assert "TRKSTAMPED01" not in tracking_cache._invalidated
+    tracking_cache.store("TRKSTAMPED01", {"status": "created"}, epoch, 0.0)
+    assert tracking_cache.lookup("TRKSTAMPED01")[0] is None
+
+
+def test_hit_ratio_and_latency_are_exported(client):
+    shipment, _, _, customer, _ = setup_shipment(client)
+    for _ in range(3):
+        track(client, shipment, customer)
+    body = client.get("/metrics").text
+    assert 'tracking_cache_lookups_total{result="miss"} 1' in body
+    assert 'tracking_cache_lookups_total{result="hit"} 2' in body
+    assert 'tracking_lookup_seconds_count{source="cache"} 2' in body
+    assert 'tracking_lookup_seconds_count{source="database"} 1' in body
@@ -0,0 +1,116 @@
+# tests/test_tracking_numbers.py
+import random
+import re
+import pytest
+from sqlalchemy import create_engine
+from app.utils import tracking_numbers
+from app.utils.tracking_numbers import (
+    ALPHABET,
+    MAX_SEQUENCE,
+    TrackingNumberGenerator,
+    check_character,
+    configure_node,
+    is_mistyped,
+    lease_node
+)
+
+FORMAT = re.compile(r"TRK[0-9A-Z]{14}")
+
+
+def frozen(at=1790000000.0):
+    return lambda: at
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_numbers_are_unique_and_time_ordered_past_the_sequence():
+    generator = TrackingNumberGenerator(7, clock=frozen())
+    numbers = generator.generate_batch(3 * (MAX_SEQUENCE + 1))
+    assert len(set(numbers)) == len(numbers)
+    assert numbers == sorted(numbers)
+    assert all(FORMAT.fullmatch(number) for number in numbers)
+
+
+def test_nodes_never_share_a_number():
+    first = TrackingNumberGenerator(1, clock=frozen()).generate_batch(5000)
+    second = TrackingNumberGenerator(2, clock=frozen()).generate_batch(5000)
+    assert not set(first) & set(second)
+
+
+def test_clock_going_back_keeps_order():
+    now = [1790000000.0]
+    generator = TrackingNumberGenerator(3, clock=lambda: now[0])
+    before = generator.generate()
+    now[0] -= 5
+    assert generator.generate() > before
+
+
+def test_generated_numbers_pass_the_check():
+    number = TrackingNumberGenerator(9, clock=frozen()).generate()
+    assert not is_mistyped(number)
+
+
+def test_check_character_catches_every_typo():
+    rng = random.Random(20)
+    for _ in range(300):
+        body = "".join(rng.choice(ALPHABET) for _ in range(13))
+        check = check_character(body)
+        for position, char in enumerate(body):
+            for replacement in ALPHABET.replace(char, ""):
+                assert check_character(body[:position] + replacement + body[position + 1:]) != check
+
+
+def test_check_character_catches_most_swaps():
+    rng = random.Random(20)
+    swaps = missed = 0
+    for _ in range(5000):
+        body = "".join(rng.choice(ALPHABET) for _ in range(13))
+        check = check_character(body)
+        for position in range(len(body) - 1):
+            swapped = body[:position] + body[position + 1] + body[position] + body[position + 2:]
+            if swapped != body:
+                swaps += 1
+                missed += check_character(swapped) == check
+    # The hybrid scheme misses some swaps of consecutive values, e.g. IJ <-> JI
+    assert check_character("JICRH7605LSRO") == check_character("IJCRH7605LSRO")
+    assert missed / swaps < 0.005
+
+
+def test_nodes_stay_in_the_deployment_range(monkeypatch):
+    monkeypatch.setattr(tracking_numbers, "generator", tracking_numbers.generator)
+    engine = create_engine("sqlite://")
+    nodes = range(512, 1024)
+    assert all(lease_node(engine, nodes) in nodes for _ in range(50))
+    configure_node(600, nodes)
+    assert tracking_numbers.generator.node == 600
+    with pytest.raises(ValueError):
+        configure_node(7, nodes)
+
+
+def test_older_numbers_are_not_checked():
+    assert not is_mistyped("TRK1A2B3C4D")
+
+
+def test_created_shipments_get_checked_numbers(client):
+    token = register_and_login(client, "trk-customer@test.com", "customer")
+    shipment = client.post(
+        "/shipments/",
+        headers=auth(token),
+        json={"source_address": "Chennai", "destination_address": "Bangalore"}
+    ).json()
+    number = shipment["tracking_number"]
+    assert FORMAT.fullmatch(number) and not is_mistyped(number)
+    assert client.get(f"/shipments/{number}", headers=auth(token)).status_code == 200
+
+    typo = number[:-1] + ("0" if number[-1] != "0" else "1")
+    response = client.get(f"/shipments/{typo}", headers=auth(token))
+    assert response.status_code == 400
+    assert response.json()["error"] == "Invalid tracking number: check character does not match"
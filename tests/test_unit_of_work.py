@@ -0,0 +1,62 @@
+# tests/test_unit_of_work.py
+from fastapi.testclient import TestClient
+from app.repositories import async_tracking_repository
+
+
+def register_and_login(client, email, role):
+    client.post("/auth/register", json={"email": email, "password": "pass123", "role": role})
+    login = client.post("/auth/login", data={"username": email, "password": "pass123"})
+    return login.json()["access_token"]
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def assigned_shipment(client):
+    admin = register_and_login(client, "uow-admin@test.com", "admin")
+    agent = register_and_login(client, "uow-agent@test.com", "agent")
+    customer = register_and_login(client, "uow-customer@test.com", "customer")
+    agent_id = next(u["id"] for u in client.get("/admin/users", headers=auth(admin)).json() if u["role"] == "agent")
+    shipment = client.post(
+        "/shipments/",
+        headers=auth(customer),
+        json={"source_address": "Chennai", "destination_address": "Bangalore"}
+    ).json()
+    client.put(f"/shipments/{shipment['id']}/assign-agent", headers=auth(admin), json={"agent_id": agent_id})
+    return shipment, agent, customer
+
+
+def test_status_update_commits_once(client, db_commits):
+    shipment, agent, _ = assigned_shipment(client)
+    db_commits.clear()
+    response = client.put(
+        f"/shipments/{shipment['id']}/status",
+        headers=auth(agent),
+        json={"status": "in_transit", "location": "Chennai Hub"}
+    )
+    assert response.status_code == 200
+    assert len(db_commits) == 1
+
+
+def test_failed_history_insert_rolls_back_status(client, monkeypatch):
+    shipment, agent, customer = assigned_shipment(client)
+
+    def fail(db, tracking_data):
+        raise RuntimeError("insert failed")
+
+    async def fail_async(db, tracking_data):
+        raise RuntimeError("insert failed")
+
+    monkeypatch.setattr("app.services.shipment_service.create_tracking_update", fail)
+    monkeypatch.setattr(async_tracking_repository, "create_tracking_update", fail_async)
+    response = TestClient(client.app, raise_server_exceptions=False).put(
+        f"/shipments/{shipment['id']}/status",
+        headers=auth(agent),
+        json={"status": "in_transit", "location": "Chennai Hub"}
+    )
+    assert response.status_code == 500
+
+    tracked = client.get(f"/shipments/{shipment['tracking_number']}", headers=auth(customer)).json()
+    assert tracked["status"] == "created"
+    assert tracked["current_location"] is None